@@ -0,0 +1,221 @@
+"""Command-line tire pressure calculator.
+
+Imports only the calculation core: no FastAPI, pydantic or environment
+configuration, so it starts fast enough to be called from shell loops.
+
+Examples:
+    python -m app.calc --discipline ROAD --tire-width 28 --rim-width 23 --rider-weight 72 --bike-weight 8
+    python -m app.calc --format csv < requests.jsonl
+    echo '{"bike": {...}, "rider_weight": {...}, "surface": "DRY"}' | python -m app.calc
+
+Without --discipline, stdin is read: one ``/compute`` request body, a JSON
+array of them, or one per line. Results are written one per line, as JSON
+(the ``/compute`` response) or CSV. Weights are used as given, like the API
+does. Invalid items are reported on stderr, produce an empty result, and
+make the exit status 1.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Iterable, List, Tuple
+
+from .enums import (
+    CasingEnum,
+    DiameterEnum,
+    DisciplineEnum,
+    PressureUnitEnum,
+    RimTypeEnum,
+    SurfaceEnum,
+    WidthUnitEnum,
+)
+from .services import PressureCalculatorBuilder
+
+
+class _Tire:
+    """The parts of ``schemas.Tire`` the calculator reads."""
+
+    __slots__ = ("width", "unit", "casing")
+
+    def __init__(self, width: float, unit: WidthUnitEnum, casing: CasingEnum):
+        self.width = width
+        self.unit = unit
+        self.casing = casing
+
+    def get_width_mm(self) -> float:
+        if self.unit == WidthUnitEnum.IN:
+            return self.width * 25.4
+        return self.width
+
+
+class _Wheel:
+    """The parts of ``schemas.Wheel`` the calculator reads."""
+
+    __slots__ = ("rim_width", "rim_type", "diameter")
+
+    def __init__(self, rim_width: float, rim_type: RimTypeEnum, diameter: DiameterEnum):
+        self.rim_width = rim_width
+        self.rim_type = rim_type
+        self.diameter = diameter
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"expected a number, got {value!r}")
+    return float(value)
+
+
+def _parts(bike: dict, position: str) -> Tuple[_Tire, _Wheel]:
+    tire, wheel = bike[f"{position}_tire"], bike[f"{position}_wheel"]
+    return (
+        _Tire(_number(tire["width"]), WidthUnitEnum(tire["unit"]), CasingEnum(tire["casing"])),
+        _Wheel(
+            _number(wheel["rim_width"]),
+            RimTypeEnum(wheel["rim_type"]),
+            DiameterEnum(wheel["diameter"]),
+        ),
+    )
+
+
+def compute(request: dict) -> Tuple[float, float]:
+    """Rounded front and rear pressures (PSI) for a ``/compute`` request body."""
+    bike = request["bike"]
+    front_tire, front_wheel = _parts(bike, "front")
+    rear_tire, rear_wheel = _parts(bike, "rear")
+    calculator = (
+        PressureCalculatorBuilder()
+        .set_discipline(DisciplineEnum(bike["discipline"]))
+        .set_surface(SurfaceEnum(request["surface"]))
+        .set_bike_weight(_number(bike["weight"]["value"]))
+        .set_rider_weight(_number(request["rider_weight"]["value"]))
+        .set_tires(front_tire, rear_tire)
+        .set_wheels(front_wheel, rear_wheel)
+        .build()
+    )
+    front, rear = calculator.calculate_unrounded()
+    return round(front, 1), round(rear, 1)
+
+
+def request_from_args(args: argparse.Namespace) -> dict:
+    """A ``/compute`` request body built from command-line flags."""
+
+    def parts(position: str, width: float, rim_width: float) -> dict:
+        return {
+            f"{position}_tire": {"width": width, "unit": args.unit, "casing": args.casing},
+            f"{position}_wheel": {
+                "rim_width": rim_width, "rim_type": args.rim_type, "diameter": args.diameter,
+            },
+        }
+
+    rear_width = args.rear_tire_width if args.rear_tire_width is not None else args.tire_width
+    rear_rim = args.rear_rim_width if args.rear_rim_width is not None else args.rim_width
+    return {
+        "bike": {
+            "name": "",
+            "discipline": args.discipline,
+            "weight": {"value": args.bike_weight, "unit": "kg"},
+            **parts("front", args.tire_width, args.rim_width),
+            **parts("rear", rear_width, rear_rim),
+        },
+        "rider_weight": {"value": args.rider_weight, "unit": "kg"},
+        "surface": args.surface,
+    }
+
+
+def read_requests(text: str) -> List[dict]:
+    """One request, a JSON array of requests, or one request per line."""
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return document if isinstance(document, list) else [document]
+
+
+def write_results(results: Iterable[Tuple[str, object]], fmt: str, out):
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["name", "front_wheel", "rear_wheel", "unit"])
+        for name, result in results:
+            if result is None:
+                writer.writerow([name, "", "", ""])
+            else:
+                writer.writerow([name, *result, PressureUnitEnum.PSI.value])
+        return
+    for _, result in results:
+        if result is None:
+            out.write("null\n")
+        else:
+            front, rear = result
+            out.write(
+                json.dumps({"front_wheel": front, "rear_wheel": rear, "unit": PressureUnitEnum.PSI.value})
+                + "\n"
+            )
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.calc", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--discipline", choices=[e.value for e in DisciplineEnum])
+    parser.add_argument("--surface", choices=[e.value for e in SurfaceEnum], default="DRY")
+    parser.add_argument("--rider-weight", type=float, help="rider weight (kg)")
+    parser.add_argument("--bike-weight", type=float, help="bike weight (kg)")
+    parser.add_argument("--tire-width", type=float)
+    parser.add_argument("--rear-tire-width", type=float, help="defaults to --tire-width")
+    parser.add_argument("--unit", choices=[e.value for e in WidthUnitEnum], default="MM")
+    parser.add_argument("--casing", choices=[e.value for e in CasingEnum], default="STANDARD")
+    parser.add_argument("--rim-width", type=float, help="inner rim width (mm)")
+    parser.add_argument("--rear-rim-width", type=float, help="defaults to --rim-width")
+    parser.add_argument("--rim-type", choices=[e.value for e in RimTypeEnum], default="HOOKLESS")
+    parser.add_argument("--diameter", choices=[e.value for e in DiameterEnum], default="700C")
+    args = parser.parse_args(argv)
+    if args.discipline is not None:
+        missing = [
+            flag
+            for flag, value in (
+                ("--rider-weight", args.rider_weight),
+                ("--bike-weight", args.bike_weight),
+                ("--tire-width", args.tire_width),
+                ("--rim-width", args.rim_width),
+            )
+            if value is None
+        ]
+        if missing:
+            parser.error(f"--discipline also needs {', '.join(missing)}")
+    return args
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None) -> int:
+    stdin, stdout, stderr = stdin or sys.stdin, stdout or sys.stdout, stderr or sys.stderr
+    args = _parse_args(argv)
+    if args.discipline is not None:
+        requests = [request_from_args(args)]
+    else:
+        try:
+            requests = read_requests(stdin.read())
+        except json.JSONDecodeError as exc:
+            print(f"invalid JSON input: {exc}", file=stderr)
+            return 2
+
+    status = 0
+    results = []
+    for index, request in enumerate(requests):
+        try:
+            name = request["bike"].get("name", "")
+            results.append((name, compute(request)))
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            message = f"missing field {exc}" if isinstance(exc, KeyError) else str(exc)
+            print(f"item {index}: {message}", file=stderr)
+            results.append(("", None))
+            status = 1
+    write_results(results, args.format, stdout)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
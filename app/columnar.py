@@ -0,0 +1,344 @@
+"""Vectorized pressure calculation over struct-of-arrays batch input.
+
+Mirrors ``PressureCalculator._calculate_recommended_pressure`` step by step,
+operating on whole NumPy columns instead of one wheel at a time. NumPy is
+imported on first use so importing this module stays cheap.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+from .schemas import (
+    CasingEnum,
+    ColumnarBatchRequest,
+    DiameterEnum,
+    DisciplineEnum,
+    RimTypeEnum,
+    SurfaceEnum,
+    TirePressureRequest,
+    WidthUnitEnum,
+)
+from .services import PressureCalculator
+
+ENUM_COLUMNS = {
+    "discipline": DisciplineEnum,
+    "surface": SurfaceEnum,
+    "tire_width_unit": WidthUnitEnum,
+    "front_casing": CasingEnum,
+    "rear_casing": CasingEnum,
+    "front_rim_type": RimTypeEnum,
+    "rear_rim_type": RimTypeEnum,
+    "front_diameter": DiameterEnum,
+    "rear_diameter": DiameterEnum,
+}
+
+FLOAT_COLUMNS = (
+    "rider_weight_kg",
+    "bike_weight_kg",
+    "front_tire_width",
+    "rear_tire_width",
+    "front_rim_width",
+    "rear_rim_width",
+)
+
+
+class ColumnError(ValueError):
+    """Column validation failed; ``errors`` uses FastAPI's error format."""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} invalid column value(s)")
+        self.errors = errors
+
+
+def _expected_values(enum) -> str:
+    values = [f"'{member.value}'" for member in enum]
+    return ", ".join(values[:-1]) + f" or {values[-1]}"
+
+
+def _row_count(request: ColumnarBatchRequest, errors: List[dict]) -> int:
+    lengths = {
+        name: len(value)
+        for name, value in request
+        if isinstance(value, list)
+    }
+    if not lengths:
+        return 1
+    # The first list column sets the expected length
+    rows = next(iter(lengths.values()))
+    for name, length in lengths.items():
+        if length != rows:
+            errors.append(
+                {
+                    "type": "column_length",
+                    "loc": ("body", name),
+                    "msg": f"Column has {length} rows, expected {rows}",
+                    "input": length,
+                }
+            )
+    return rows
+
+
+def _float_column(name: str, values, rows: int, errors: List[dict]):
+    """A float64 column, with each invalid cell reported at ``(column, row)``."""
+    import numpy as np
+    from pydantic import TypeAdapter, ValidationError
+
+    if isinstance(values, list):
+        try:
+            array = np.asarray(values)
+        except ValueError:
+            array = None
+        # Plain numbers (the usual case) convert in one step
+        if array is not None and array.ndim == 1 and array.dtype.kind in "biuf":
+            return array.astype(np.float64, copy=False)
+        cells = enumerate(values)
+    else:
+        cells = [(None, values)]
+
+    number = TypeAdapter(float)
+    converted = []
+    for row, value in cells:
+        try:
+            converted.append(number.validate_python(value))
+        except ValidationError as exc:
+            error = exc.errors(include_url=False)[0]
+            loc = ("body", name) if row is None else ("body", name, row)
+            errors.append({"type": error["type"], "loc": loc, "msg": error["msg"], "input": value})
+    if isinstance(values, list):
+        return np.asarray(converted, dtype=np.float64)
+    return np.full(rows, converted[0] if converted else 0.0, dtype=np.float64)
+
+
+def validate_columns(request: ColumnarBatchRequest) -> Dict[str, "object"]:
+    """Turn a columnar request into NumPy arrays of floats and enum codes.
+
+    Enum columns are checked once per distinct value, and the codes are
+    indexes into the enum's member order. Every invalid cell is reported
+    with its row index.
+    """
+    import numpy as np
+
+    errors: List[dict] = []
+    rows = _row_count(request, errors)
+    if errors:
+        raise ColumnError(errors)
+
+    columns = {}
+    for name, enum in ENUM_COLUMNS.items():
+        values = getattr(request, name)
+        codes_by_value = {member.value: code for code, member in enumerate(enum)}
+        if not isinstance(values, list):
+            if not isinstance(values, str) or values not in codes_by_value:
+                errors.append(
+                    {
+                        "type": "enum",
+                        "loc": ("body", name),
+                        "msg": f"Input should be {_expected_values(enum)}",
+                        "input": values,
+                    }
+                )
+                continue
+            columns[name] = np.full(rows, codes_by_value[values], dtype=np.int8)
+            continue
+
+        distinct, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        lookup = np.empty(len(distinct), dtype=np.int8)
+        for position, value in enumerate(distinct.tolist()):
+            code = codes_by_value.get(value)
+            if code is None:
+                for row in np.flatnonzero(inverse == position).tolist():
+                    errors.append(
+                        {
+                            "type": "enum",
+                            "loc": ("body", name, row),
+                            "msg": f"Input should be {_expected_values(enum)}",
+                            "input": values[row],
+                        }
+                    )
+                code = -1
+            lookup[position] = code
+        columns[name] = lookup[inverse.reshape(-1)]
+
+    for name in FLOAT_COLUMNS:
+        columns[name] = _float_column(name, getattr(request, name), rows, errors)
+
+    if errors:
+        errors.sort(key=lambda error: error["loc"][2] if len(error["loc"]) > 2 else -1)
+        raise ColumnError(errors)
+    return columns
+
+
+# --- Lookup tables in enum member order ---
+
+_TABLES = None
+
+
+def _tables():
+    """Factor arrays built once from ``PressureCalculator``'s dictionaries.
+
+    The tables are built completely before being published, so a thread
+    never sees a partly filled mapping (racing threads may both build them).
+    """
+    global _TABLES
+    if _TABLES is None:
+        import numpy as np
+
+        calc = PressureCalculator
+
+        def factors(enum, table, default=1.0):
+            return np.array([table.get(member, default) for member in enum], dtype=np.float64)
+
+        rim_table = calc.RIM_WIDTH_TABLE
+        _TABLES = dict(
+            discipline=factors(DisciplineEnum, calc.DISCIPLINE_FACTORS),
+            rim_type=factors(RimTypeEnum, calc.RIM_TYPE_FACTORS),
+            rim_type_cx=factors(RimTypeEnum, calc.RIM_TYPE_CX_FACTORS),
+            casing=factors(CasingEnum, calc.CASING_FACTORS),
+            surface=factors(SurfaceEnum, calc.SURFACE_FACTORS),
+            diameter=factors(DiameterEnum, calc.WHEEL_DIAMETER_MAP, default=622),
+            rim_min=np.array([entry["min"] for entry in rim_table], dtype=np.float64),
+            rim_max=np.array([entry["max"] for entry in rim_table], dtype=np.float64),
+            rim_compatible=np.array([entry["compatible"] for entry in rim_table], dtype=np.float64),
+            cyclocross=list(DisciplineEnum).index(DisciplineEnum.CYCLOCROSS),
+            inches=list(WidthUnitEnum).index(WidthUnitEnum.IN),
+        )
+    return _TABLES
+
+
+def rim_width_lookup(tire_width_mm):
+    """Vectorized ``PressureCalculator._rim_width_lookup`` (21 mm outside the table)."""
+    import numpy as np
+
+    t = _tables()
+    # First range whose max is above the width; valid only if its min is not above it
+    index = np.searchsorted(t["rim_max"], tire_width_mm, side="right")
+    in_table = index < len(t["rim_max"])
+    index = np.minimum(index, len(t["rim_max"]) - 1)
+    matched = in_table & (t["rim_min"][index] <= tire_width_mm)
+    return np.where(matched, t["rim_compatible"][index], 21.0)
+
+
+def pressure_vector(
+    rider_weight_kg,
+    bike_weight_kg,
+    discipline,
+    rim_type,
+    surface,
+    tire_width_mm,
+    inner_rim_width_mm,
+    tire_casing,
+    wheel_position: str,
+    wheel_diameter,
+):
+    """Vectorized ``PressureCalculator._calculate_recommended_pressure``.
+
+    Enum arguments are code arrays; the arithmetic follows the scalar
+    version operation for operation so results match it.
+    """
+    import numpy as np
+
+    calc = PressureCalculator
+    t = _tables()
+
+    # 1. Get fudge factors
+    ride_factor = t["discipline"][discipline]
+    wheel_factor = calc.WHEEL_POSITION_FACTORS.get(wheel_position, 1.0)
+    casing_factor = t["casing"][tire_casing]
+    surface_factor = t["surface"][surface]
+    rim_factor = np.where(
+        discipline == t["cyclocross"], t["rim_type_cx"][rim_type], t["rim_type"][rim_type]
+    )
+
+    # 2. Calculate effective tire width
+    compatible_rim_width = rim_width_lookup(tire_width_mm)
+    effective_width = tire_width_mm + calc.RIM_WIDTH_ADJUSTMENT * (
+        inner_rim_width_mm - compatible_rim_width
+    )
+
+    # 3. Calculate geometric constant (proportional to tire volume)
+    outer_radius = wheel_diameter / 2.0 + effective_width / 2.0
+    inner_radius = effective_width / 2.0
+    c = 4.0 * math.pi**2 * outer_radius * inner_radius
+
+    # 4. Base pressure from regression model
+    base = (10**calc.BASE_LOG10) * (c**calc.BASE_EXPONENT)
+
+    # 5. Calculate weight factor
+    weight_sum = bike_weight_kg + rider_weight_kg
+    weight_factor = 1.0 + (
+        calc.WEIGHT_LBS_PER_KG * weight_sum - calc.WEIGHT_REFERENCE_LBS
+    ) * calc.WEIGHT_SLOPE
+
+    # 6. Combine everything
+    pressure = base * weight_factor * wheel_factor
+    pressure *= rim_factor * ride_factor * surface_factor * casing_factor
+    return pressure
+
+
+def calculate_columns(columns: Dict[str, "object"]) -> Tuple["object", "object"]:
+    """Front and rear pressures (PSI, rounded to 0.1) for validated columns."""
+    import numpy as np
+
+    front, rear = pressure_columns(columns)
+    return np.round(front, 1), np.round(rear, 1)
+
+
+def pressure_columns(columns: Dict[str, "object"]) -> Tuple["object", "object"]:
+    """Unrounded front and rear pressures (PSI) for validated columns."""
+    import numpy as np
+
+    t = _tables()
+    inches = columns["tire_width_unit"] == t["inches"]
+
+    def wheel(prefix: str, position: str):
+        width = columns[f"{prefix}_tire_width"]
+        width_mm = np.where(inches, width * 25.4, width)
+        return pressure_vector(
+            rider_weight_kg=columns["rider_weight_kg"],
+            bike_weight_kg=columns["bike_weight_kg"],
+            discipline=columns["discipline"],
+            rim_type=columns[f"{prefix}_rim_type"],
+            surface=columns["surface"],
+            tire_width_mm=width_mm,
+            inner_rim_width_mm=columns[f"{prefix}_rim_width"],
+            tire_casing=columns[f"{prefix}_casing"],
+            wheel_position=position,
+            wheel_diameter=t["diameter"][columns[f"{prefix}_diameter"]],
+        )
+
+    return wheel("front", "FRONT"), wheel("rear", "REAR")
+
+
+def request_columns(requests: List[TirePressureRequest]) -> Dict[str, "object"]:
+    """Validated columns for already validated nested requests.
+
+    Widths are converted to millimeters and weights are taken as given,
+    like the scalar calculator does.
+    """
+    import numpy as np
+
+    def codes(enum, values):
+        code_of = {member: code for code, member in enumerate(enum)}
+        return np.fromiter((code_of[value] for value in values), dtype=np.int8, count=len(requests))
+
+    def floats(values):
+        return np.fromiter(values, dtype=np.float64, count=len(requests))
+
+    bikes = [request.bike for request in requests]
+    columns = {
+        "discipline": codes(DisciplineEnum, (bike.discipline for bike in bikes)),
+        "surface": codes(SurfaceEnum, (request.surface for request in requests)),
+        # Widths are already in millimeters
+        "tire_width_unit": codes(WidthUnitEnum, (WidthUnitEnum.MM for _ in requests)),
+        "rider_weight_kg": floats(request.rider_weight.value for request in requests),
+        "bike_weight_kg": floats(bike.weight.value for bike in bikes),
+    }
+    for prefix in ("front", "rear"):
+        tires = [getattr(bike, f"{prefix}_tire") for bike in bikes]
+        wheels = [getattr(bike, f"{prefix}_wheel") for bike in bikes]
+        columns[f"{prefix}_tire_width"] = floats(tire.get_width_mm() for tire in tires)
+        columns[f"{prefix}_casing"] = codes(CasingEnum, (tire.casing for tire in tires))
+        columns[f"{prefix}_rim_width"] = floats(wheel.rim_width for wheel in wheels)
+        columns[f"{prefix}_rim_type"] = codes(RimTypeEnum, (wheel.rim_type for wheel in wheels))
+        columns[f"{prefix}_diameter"] = codes(DiameterEnum, (wheel.diameter for wheel in wheels))
+    return columns
@@ -0,0 +1,138 @@
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .metrics import metrics
+
+
+class Rejected(Exception):
+    """A request was shed; ``status_code`` is 429 or 503."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, with bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def take(self, now: Optional[float] = None) -> float:
+        """Take a token; returns 0 on success, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+
+class AdmissionController:
+    """Rate limits and a bounded wait queue in front of an expensive endpoint.
+
+    Requests first pass a global and a per-client token bucket (429 when
+    empty). At most ``max_concurrency`` then run at once; others wait in a
+    queue of at most ``max_queue`` requests for up to ``max_queue_wait``
+    seconds, after which they are shed with 503. A rate of 0 disables the
+    corresponding bucket.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 40,
+        max_queue: int = 100,
+        max_queue_wait: float = 0.5,
+        rate: float = 0.0,
+        burst: float = 0.0,
+        client_rate: float = 0.0,
+        client_burst: float = 0.0,
+        max_clients: int = 10000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.client_rate = client_rate
+        self.client_burst = client_burst or max(client_rate, 1.0)
+        self.max_clients = max_clients
+        self._global = TokenBucket(rate, burst or max(rate, 1.0)) if rate > 0 else None
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+
+    def _check_rate(self, client: str):
+        with self._lock:
+            if self._global is not None:
+                wait = self._global.take()
+                if wait:
+                    raise Rejected(429, "rate_limited", wait)
+            if self.client_rate > 0:
+                bucket = self._clients.get(client)
+                if bucket is None:
+                    bucket = TokenBucket(self.client_rate, self.client_burst)
+                    self._clients[client] = bucket
+                    # Forget the least recently seen clients
+                    if len(self._clients) > self.max_clients:
+                        self._clients.popitem(last=False)
+                else:
+                    self._clients.move_to_end(client)
+                wait = bucket.take()
+                if wait:
+                    raise Rejected(429, "client_rate_limited", wait)
+
+    def _shed(self, rejection: Rejected):
+        metrics.inc(f"admission.shed.{rejection.reason}")
+        raise rejection
+
+    @asynccontextmanager
+    async def admit(self, client: str):
+        """Hold a concurrency slot for the body of the ``async with`` block.
+
+        Raises ``Rejected`` instead of waiting when the request should be shed.
+        """
+        try:
+            self._check_rate(client)
+        except Rejected as rejection:
+            self._shed(rejection)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._slots.locked():
+            if self.queued >= self.max_queue:
+                self._shed(Rejected(503, "queue_full", self.max_queue_wait))
+            self.queued += 1
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.max_queue_wait)
+            except asyncio.TimeoutError:
+                self._shed(Rejected(503, "queue_timeout", self.max_queue_wait))
+            finally:
+                self.queued -= 1
+                metrics.observe("admission.queue_seconds", time.perf_counter() - started)
+        else:
+            await self._slots.acquire()
+
+        metrics.inc("admission.admitted")
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
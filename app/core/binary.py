@@ -0,0 +1,105 @@
+"""Compact binary encoding for columnar numeric results.
+
+Layout (all little-endian):
+
+    offset  size  field
+    0       4     magic  b"TPCB"
+    4       2     format version (1)
+    6       2     flags (0, reserved)
+    8       4     rows
+    12      2     column count
+    14      1     value type (1 = float32)
+    15      1     reserved (0)
+    16      16*c  column names, ASCII, NUL-padded to 16 bytes each
+    ...     4*r*c column data, column-major: every value of column 0, then column 1, ...
+
+The data section starts on a 4-byte boundary, so clients can view it
+directly as a float32 array (e.g. ``Float32Array`` in the browser).
+"""
+
+import struct
+from typing import Dict
+
+from fastapi import Request, Response
+
+MEDIA_TYPE = "application/vnd.tire-pressure.columns"
+
+MAGIC = b"TPCB"
+FORMAT_VERSION = 1
+FLOAT32 = 1
+_HEADER = struct.Struct("<4sHHIHBB")
+_NAME_SIZE = 16
+
+
+def _accepted(accept: str) -> Dict[str, float]:
+    """Media ranges from an ``Accept`` header mapped to their q-values."""
+    ranges = {}
+    for item in accept.split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges[media_type.lower()] = quality
+    return ranges
+
+
+def wants_binary(request: Request) -> bool:
+    """True when the client prefers the binary format over JSON."""
+    ranges = _accepted(request.headers.get("accept", ""))
+    binary = ranges.get(MEDIA_TYPE, 0.0)
+    json_quality = max(ranges.get("application/json", 0.0), ranges.get("*/*", 0.0))
+    return binary > 0.0 and binary >= json_quality
+
+
+def encode_columns(columns: Dict[str, "object"]) -> memoryview:
+    """Pack equally long numeric columns into one buffer.
+
+    Values are converted straight into the output buffer through a NumPy
+    view, so no per-row Python objects are created.
+    """
+    import numpy as np
+
+    names = list(columns)
+    rows = len(columns[names[0]]) if names else 0
+    data_offset = _HEADER.size + _NAME_SIZE * len(names)
+    buffer = bytearray(data_offset + 4 * rows * len(names))
+    _HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, 0, rows, len(names), FLOAT32, 0)
+    for i, name in enumerate(names):
+        encoded = name.encode("ascii")[:_NAME_SIZE]
+        buffer[_HEADER.size + i * _NAME_SIZE : _HEADER.size + i * _NAME_SIZE + len(encoded)] = encoded
+
+    data = np.frombuffer(buffer, dtype="<f4", offset=data_offset).reshape(len(names), rows)
+    for i, name in enumerate(names):
+        data[i] = columns[name]
+    return memoryview(buffer)
+
+
+def decode_columns(payload: bytes) -> Dict[str, "object"]:
+    """Inverse of ``encode_columns``; returns float32 NumPy views into ``payload``."""
+    import numpy as np
+
+    magic, version, _, rows, count, value_type, _ = _HEADER.unpack_from(payload, 0)
+    if magic != MAGIC or version != FORMAT_VERSION or value_type != FLOAT32:
+        raise ValueError("Not a supported column buffer")
+    names = [
+        bytes(payload[_HEADER.size + i * _NAME_SIZE : _HEADER.size + (i + 1) * _NAME_SIZE])
+        .rstrip(b"\0")
+        .decode("ascii")
+        for i in range(count)
+    ]
+    data_offset = _HEADER.size + _NAME_SIZE * count
+    data = np.frombuffer(payload, dtype="<f4", offset=data_offset, count=rows * count)
+    return {name: data[i * rows : (i + 1) * rows] for i, name in enumerate(names)}
+
+
+def binary_response(columns: Dict[str, "object"]) -> Response:
+    return Response(
+        encode_columns(columns), media_type=MEDIA_TYPE, headers={"Vary": "Accept"}
+    )
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ShardedLRUCache:
+    """``LRUCache`` split into independently locked shards by key hash.
+
+    Threads looking up different keys rarely wait on the same lock, which
+    matters on free-threaded builds where they really run in parallel.
+    Recency is tracked per shard, so eviction is only approximately LRU.
+    """
+
+    def __init__(self, maxsize: int, shards: int):
+        self.maxsize = maxsize
+        per_shard = -(-maxsize // shards)
+        self._shards = [LRUCache(per_shard) for _ in range(shards)]
+
+    def _shard(self, key: Hashable) -> LRUCache:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._shard(key).get(key)
+
+    def put(self, key: Hashable, value: Any):
+        self._shard(key).put(key, value)
+
+    def clear(self):
+        for shard in self._shards:
+            shard.clear()
+
+    def stats(self) -> Dict[str, int]:
+        totals = {"size": 0, "maxsize": self.maxsize, "hits": 0, "misses": 0, "evictions": 0}
+        for shard in self._shards:
+            for name, value in shard.stats().items():
+                if name != "maxsize":
+                    totals[name] += value
+        totals["shards"] = len(self._shards)
+        return totals
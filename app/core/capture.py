@@ -0,0 +1,116 @@
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Records only carry a pre-serialized line; skip QueueHandler's formatting
+        return record
+
+
+class BackgroundJsonlWriter:
+    """Append JSON lines to a size-rotated file from a background thread.
+
+    Callers only pay for a ``put_nowait`` on a bounded queue; serialization to
+    disk and rotation happen on the listener thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backups: int, queue_size: int):
+        self.path = path
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self._listener = logging.handlers.QueueListener(self._handler.queue, file_handler)
+        self._listener.start()
+
+    @property
+    def dropped(self) -> int:
+        return self._handler.dropped
+
+    def write(self, record: dict):
+        line = json.dumps(record, separators=(",", ":"))
+        self._handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO}))
+
+    def close(self):
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+
+def anonymize(payload: dict) -> dict:
+    """Blank free-text fields and coarsen weights before a payload is stored."""
+    bike = dict(payload["bike"])
+    bike["name"] = "captured"
+    bike["weight"] = {**bike["weight"], "value": round(bike["weight"]["value"] * 2) / 2}
+    rider = payload["rider_weight"]
+    return {
+        **payload,
+        "bike": bike,
+        "rider_weight": {**rider, "value": float(round(rider["value"]))},
+    }
+
+
+class TrafficRecorder:
+    """Record a sample of validated request payloads with their timings."""
+
+    def __init__(self, writer: BackgroundJsonlWriter, sample_rate: float):
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    def record(self, endpoint: str, payload: BaseModel, started: float, status: int = 200):
+        """Queue ``payload`` for capture if it is sampled.
+
+        ``started`` is the ``time.perf_counter()`` value taken when the
+        request began.
+        """
+        if random.random() >= self.sample_rate:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        try:
+            self.writer.write(
+                {
+                    "ts": round(time.time(), 6),
+                    "endpoint": endpoint,
+                    "status": status,
+                    "duration_ms": round(duration_ms, 4),
+                    "payload": anonymize(payload.model_dump(mode="json")),
+                }
+            )
+        except Exception:
+            logger.exception("Failed to capture request payload")
+
+    def close(self):
+        self.writer.close()
+
+
+def build_recorder(
+    sample_rate: float, path: str, max_bytes: int, backups: int, queue_size: int
+) -> Optional[TrafficRecorder]:
+    """Create a recorder, or ``None`` when capture is disabled."""
+    if sample_rate <= 0:
+        return None
+    writer = BackgroundJsonlWriter(path, max_bytes, backups, queue_size)
+    return TrafficRecorder(writer, sample_rate)
@@ -0,0 +1,180 @@
+import asyncio
+import gzip
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .metrics import metrics
+
+# Brotli and Zstandard are optional; gzip is always available
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+def _codecs(level_gzip: int, level_brotli: int, level_zstd: int) -> Dict[str, Callable[[bytes], bytes]]:
+    codecs = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level_zstd)
+        codecs["zstd"] = compressor.compress
+    if brotli is not None:
+        codecs["br"] = lambda data: brotli.compress(data, quality=level_brotli)
+    codecs["gzip"] = lambda data: gzip.compress(data, compresslevel=level_gzip, mtime=0)
+    return codecs
+
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Best encoding the client accepts; server preference breaks ties."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _vary_on_encoding(message: dict) -> dict:
+    """Add ``Vary: Accept-Encoding`` to a response start message unless it is already encoded."""
+    headers = MutableHeaders(raw=message["headers"])
+    if "content-encoding" not in headers:
+        headers.add_vary_header("Accept-Encoding")
+    return message
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli/zstd compression for complete response bodies.
+
+    Bodies under ``minimum_size`` (such as single ``/compute`` results) are
+    sent as is. Every response that is not already encoded gets
+    ``Vary: Accept-Encoding``, compressed or not, so shared caches keep the
+    variants apart. Bodies of ``offload_size`` or more are compressed on a small
+    dedicated thread pool, so the event loop and the request threadpool stay
+    free. Bodies are buffered up to ``max_buffer`` bytes; longer streams and
+    server-sent events pass through uncompressed.
+    Compression ratio and CPU time are recorded in ``metrics``.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        offload_size: int = 65536,
+        gzip_level: int = 6,
+        brotli_level: int = 4,
+        zstd_level: int = 3,
+        offload_threads: int = 2,
+        max_buffer: int = 16 * 1024 * 1024,
+    ):
+        self.app = app
+        self.max_buffer = max_buffer
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.codecs = _codecs(gzip_level, brotli_level, zstd_level)
+        self._executor = ThreadPoolExecutor(offload_threads, thread_name_prefix="compress")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if encoding is None:
+
+            async def send_identity(message):
+                if message["type"] == "http.response.start":
+                    _vary_on_encoding(message)
+                await send(message)
+
+            await self.app(scope, receive, send_identity)
+            return
+
+        start_message = None
+        passthrough = False
+        chunks = []
+        buffered = 0
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough, buffered
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    passthrough = True
+                    await send(_vary_on_encoding(message))
+                else:
+                    start_message = _vary_on_encoding(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            # Collect the body; upstream middleware may split it into chunks
+            chunks.append(message.get("body", b""))
+            buffered += len(chunks[-1])
+            more_body = message.get("more_body", False)
+            if more_body and buffered <= self.max_buffer:
+                return
+
+            body = b"".join(chunks)
+            chunks.clear()
+            if more_body or len(body) < self.minimum_size:
+                # Too large to buffer (a real stream) or too small to bother
+                passthrough = True
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            compressed = await self._compress(encoding, body)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        codec = self.codecs[encoding]
+
+        def run():
+            started = time.thread_time()
+            compressed = codec(body)
+            return compressed, time.thread_time() - started
+
+        if len(body) >= self.offload_size:
+            loop = asyncio.get_running_loop()
+            compressed, cpu = await loop.run_in_executor(self._executor, run)
+            metrics.inc("compression.offloaded")
+        else:
+            compressed, cpu = run()
+        metrics.inc(f"compression.responses.{encoding}")
+        metrics.inc("compression.bytes_in", len(body))
+        metrics.inc("compression.bytes_out", len(compressed))
+        metrics.observe("compression.cpu_seconds", cpu)
+        return compressed
@@ -1,48 +1,210 @@
 import os
-from typing import List, Union
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, fields, replace
+from typing import List, Mapping, Optional, Union
 
-# Load environment variables from .env file
-load_dotenv()
 
-
-def get_cors_origins() -> Union[List[str], str]:
+def get_cors_origins(environ: Optional[Mapping[str, str]] = None) -> Union[List[str], str]:
     """Get allowed CORS origins from environment variable or use defaults.
-    
+
     Returns either a list of specific origins or "*" for development.
     In production, always use specific origins for security.
     """
+    environ = os.environ if environ is None else environ
+
     # Check if we're in production mode
-    environment = os.getenv("ENVIRONMENT", "development").lower()
-    
+    environment = environ.get("ENVIRONMENT", "development").lower()
+
     # Get origins from environment variable
-    origins_str = os.getenv("ALLOWED_ORIGINS", "")
-    
+    origins_str = environ.get("ALLOWED_ORIGINS", "")
+
     if origins_str:
         # If specific origins are set, use them (comma-separated)
         return [origin.strip() for origin in origins_str.split(",") if origin.strip()]
-    
+
     # In production, you MUST set ALLOWED_ORIGINS explicitly
     if environment == "production":
         raise ValueError(
             "ALLOWED_ORIGINS must be explicitly set in production. "
             "Example: ALLOWED_ORIGINS=https://yourdomain.com,https://www.yourdomain.com"
         )
-    
+
     # Development mode: allow all origins (*)
     # This allows any localhost/127.0.0.1 port without hardcoding
     return "*"
 
 
-def should_allow_credentials() -> bool:
+def should_allow_credentials(origins: Union[List[str], str, None] = None) -> bool:
     """Whether to allow credentials in CORS.
-    
+
     Note: When allow_origins="*", credentials must be False.
     """
-    origins = get_cors_origins()
+    if origins is None:
+        origins = get_cors_origins()
     return origins != "*"
 
 
-# Configuration
-ALLOWED_ORIGINS = get_cors_origins()
-ALLOW_CREDENTIALS = should_allow_credentials()
+def _default_shared_cache_path() -> str:
+    return "/dev/shm/tire-pressure-cache" if os.path.isdir("/dev/shm") else "tire-pressure-cache"
+
+
+# Settings whose environment values are case-insensitive
+_LOWERCASE = ("trace_exporter", "result_cache_backend", "execution_mode")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Backend configuration, resolved once.
+
+    ``Settings.from_env()`` reads every field from the environment variable
+    of the same name in upper case (after loading ``.env``). Constructing
+    ``Settings`` directly gives the defaults without touching the
+    environment, which is what tests and benchmarks use for minimal apps.
+    """
+
+    # "*" (development) or an explicit list of origins
+    allowed_origins: Union[List[str], str] = "*"
+    # Seconds browsers may reuse a CORS preflight answer
+    cors_max_age: int = 86400
+    # Log every request and response status
+    request_logging: bool = True
+    # Expose GET /metrics
+    metrics_enabled: bool = True
+    # Event-loop lag monitor: samples every loop_monitor_interval seconds and logs
+    # the loop thread's stack when the loop is held longer than loop_block_threshold
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval: float = 0.1
+    loop_block_threshold: float = 0.1
+
+    # Tracing
+    # trace_sample_rate is the fraction of requests traced (0 disables tracing)
+    trace_sample_rate: float = 0.0
+    trace_exporter: str = "memory"
+    trace_file: str = "traces.jsonl"
+    trace_buffer_size: int = 1000
+
+    # Traffic capture
+    # capture_sample_rate is the fraction of /compute payloads recorded (0 disables capture)
+    capture_sample_rate: float = 0.0
+    capture_file: str = "traffic.jsonl"
+    capture_max_bytes: int = 10 * 1024 * 1024
+    capture_backups: int = 5
+    capture_queue_size: int = 10000
+
+    # Caching and warm-up
+    # result_cache_size is the number of /compute results kept per worker (0 disables)
+    result_cache_size: int = 10000
+    warmup_enabled: bool = True
+    # Optional capture file (.jsonl) or saved GET /popular response (.json) to warm from
+    warmup_file: str = ""
+    warmup_limit: int = 5000
+    # "memory" keeps a cache per worker; "shared" uses one table for all workers on the host
+    result_cache_backend: str = "memory"
+    shared_cache_path: str = field(default_factory=_default_shared_cache_path)
+    geometry_cache_size: int = 4096
+    # Independently locked result cache shards; 0 picks one per CPU on free-threaded builds
+    result_cache_shards: int = 0
+
+    # Where computations run: "auto" (inline on the event loop when the
+    # estimated cost, in single calculations, is at most
+    # execution_inline_max_cost; otherwise the threadpool), "inline" or "threadpool"
+    execution_mode: str = "auto"
+    execution_inline_max_cost: float = 32.0
+    # Worker processes for the heaviest batch work (0 disables the pool); batches
+    # costing at least execution_process_min_cost go there in chunks of
+    # process_pool_chunk_rows rows, with at most process_pool_max_pending in flight
+    process_pool_workers: int = 0
+    process_pool_max_pending: int = 4
+    process_pool_chunk_rows: int = 10000
+    execution_process_min_cost: float = 2000.0
+
+    # Threads for offloaded computations (0 keeps the default of 40); on a
+    # free-threaded build one worker can use every core with enough threads
+    threadpool_size: int = 0
+
+    # Batch jobs
+    jobs_enabled: bool = False
+    jobs_dir: str = "jobs"
+    jobs_workers: int = 1
+    jobs_chunk_size: int = 1000
+
+    # Response compression
+    compression_enabled: bool = True
+    # Responses smaller than this many bytes are never compressed
+    compression_min_size: int = 1024
+    # Responses at least this large are compressed off the event loop
+    compression_offload_size: int = 65536
+
+    # Admission control for /compute (a rate of 0 disables that limit)
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 40
+    admission_max_queue: int = 100
+    # Seconds a request may wait for a slot before it is shed with 503
+    admission_max_queue_wait: float = 0.5
+    admission_rate: float = 0.0
+    admission_burst: float = 0.0
+    admission_client_rate: float = 0.0
+    admission_client_burst: float = 0.0
+    admission_max_clients: int = 10000
+
+    # Popular configuration tracking (constant memory, see GET /popular)
+    popularity_enabled: bool = True
+    popularity_top_k: int = 100
+    popularity_sketch_width: int = 2048
+    popularity_sketch_depth: int = 4
+
+    # Memory
+    # Token for the /admin endpoints (sent as X-Admin-Token); empty disables them
+    admin_token: str = ""
+    # tracemalloc frames per allocation (0 leaves tracing off until enabled via /admin)
+    memory_trace_frames: int = 0
+    # Low-memory mode for small instances: caps every in-process cache and buffer
+    low_memory: bool = False
+
+    @property
+    def allow_credentials(self) -> bool:
+        return should_allow_credentials(self.allowed_origins)
+
+    @classmethod
+    def from_env(
+        cls, environ: Optional[Mapping[str, str]] = None, dotenv: bool = True
+    ) -> "Settings":
+        """Settings from ``environ`` (the process environment plus ``.env`` by default)."""
+        if environ is None:
+            if dotenv:
+                from dotenv import load_dotenv
+
+                load_dotenv()
+            environ = os.environ
+
+        values = {}
+        for setting in fields(cls):
+            raw = environ.get(setting.name.upper())
+            if raw is None or setting.name == "allowed_origins":
+                continue
+            if setting.type is bool:
+                values[setting.name] = raw.lower() == "true"
+            elif setting.name in _LOWERCASE:
+                values[setting.name] = raw.lower()
+            else:
+                values[setting.name] = setting.type(raw)
+        settings = cls(allowed_origins=get_cors_origins(environ), **values)
+        return settings.for_low_memory() if settings.low_memory else settings
+
+    def for_low_memory(self) -> "Settings":
+        """These settings with every cache and buffer capped for small hosts."""
+        result_cache_size = min(self.result_cache_size, 1000)
+        return replace(
+            self,
+            low_memory=True,
+            result_cache_size=result_cache_size,
+            geometry_cache_size=min(self.geometry_cache_size, 256),
+            warmup_limit=min(self.warmup_limit, result_cache_size),
+            trace_buffer_size=min(self.trace_buffer_size, 100),
+            capture_queue_size=min(self.capture_queue_size, 500),
+            popularity_top_k=min(self.popularity_top_k, 20),
+            popularity_sketch_width=min(self.popularity_sketch_width, 512),
+            admission_max_clients=min(self.admission_max_clients, 1000),
+            jobs_workers=1,
+            process_pool_workers=min(self.process_pool_workers, 1),
+            jobs_chunk_size=min(self.jobs_chunk_size, 200),
+        )
@@ -0,0 +1,169 @@
+from typing import Dict, List, Sequence, Tuple
+
+from .metrics import metrics
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = ("accept", "accept-language", "content-language", "content-type")
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+def _header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+class CachedCORSMiddleware:
+    """CORS with preflight responses computed once per allowed origin.
+
+    Allowed origins are kept in a set, so matching an origin is a hash
+    lookup. Preflight answers carry a long ``Access-Control-Max-Age`` so
+    browsers reuse them instead of sending OPTIONS before every call.
+    Behaves like Starlette's ``CORSMiddleware`` otherwise ("*" origins
+    never allow credentials; "*" headers are mirrored when credentials
+    are allowed, since browsers only honor the wildcard without them).
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        expose_headers: Sequence[str] = (),
+        max_age: int = 86400,
+    ):
+        if "*" in allow_methods:
+            allow_methods = ALL_METHODS
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_credentials = allow_credentials
+        self.origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.methods = frozenset(method.encode("latin-1") for method in allow_methods)
+        self.headers = frozenset(
+            header.lower() for header in (*SAFELISTED_HEADERS, *allow_headers) if header != "*"
+        )
+
+        simple = []
+        if allow_credentials:
+            simple.append((b"access-control-allow-credentials", b"true"))
+        if expose_headers:
+            simple.append((b"access-control-expose-headers", ", ".join(expose_headers).encode()))
+
+        preflight = [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+        ]
+        if self.allow_all_headers:
+            if not allow_credentials:
+                preflight.append((b"access-control-allow-headers", b"*"))
+        else:
+            preflight.append(
+                (b"access-control-allow-headers", ", ".join(sorted(self.headers)).encode())
+            )
+        if allow_credentials:
+            preflight.append((b"access-control-allow-credentials", b"true"))
+
+        # With "*" and no credentials every origin gets the same answer
+        self._shared_preflight = None
+        self._shared_simple = None
+        if self.allow_all_origins and not allow_credentials:
+            self._shared_preflight = [(b"access-control-allow-origin", b"*"), *preflight]
+            self._shared_simple = [(b"access-control-allow-origin", b"*"), *simple]
+        self._preflight: Dict[bytes, RawHeaders] = {}
+        self._simple: Dict[bytes, RawHeaders] = {}
+        for origin in self.origins - {b"*"}:
+            self._preflight[origin] = self._for_origin(origin, preflight)
+            self._simple[origin] = self._for_origin(origin, simple)
+        self._preflight_template = preflight
+        self._simple_template = simple
+
+    @staticmethod
+    def _for_origin(origin: bytes, headers: RawHeaders) -> RawHeaders:
+        return [(b"access-control-allow-origin", origin), (b"vary", b"Origin"), *headers]
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.origins
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        origin = _header(scope, b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            requested_method = _header(scope, b"access-control-request-method")
+            if requested_method is not None:
+                await self._preflight_response(scope, origin, requested_method, send)
+                return
+
+        extra = self._simple_headers(origin, _header(scope, b"cookie") is not None)
+        if not extra:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _simple_headers(self, origin: bytes, has_cookie: bool) -> RawHeaders:
+        if self._shared_simple is not None:
+            # Requests with cookies must get the specific origin instead of "*"
+            if has_cookie:
+                return self._for_origin(origin, self._simple_template)
+            return self._shared_simple
+        headers = self._simple.get(origin)
+        if headers is None and self.allow_all_origins:
+            headers = self._for_origin(origin, self._simple_template)
+        return headers if headers is not None else self._simple_template
+
+    async def _preflight_response(self, scope, origin: bytes, requested_method: bytes, send):
+        metrics.inc("cors.preflight")
+        failures = []
+        if self._shared_preflight is not None:
+            headers = self._shared_preflight
+        else:
+            headers = self._preflight.get(origin)
+            if headers is None and self.allow_all_origins:
+                headers = self._for_origin(origin, self._preflight_template)
+            if headers is None:
+                failures.append("origin")
+                headers = [(b"vary", b"Origin"), *self._preflight_template]
+        if requested_method not in self.methods:
+            failures.append("method")
+
+        requested_headers = _header(scope, b"access-control-request-headers")
+        if requested_headers is not None:
+            if self.allow_all_headers:
+                if self.allow_credentials:
+                    headers = [*headers, (b"access-control-allow-headers", requested_headers)]
+            elif any(
+                header.strip() not in self.headers
+                for header in requested_headers.decode("latin-1").lower().split(",")
+            ):
+                failures.append("headers")
+
+        if failures:
+            metrics.inc("cors.preflight_rejected")
+            body = ("Disallowed CORS " + ", ".join(failures)).encode()
+            status = 400
+            headers = [
+                *headers,
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+        else:
+            body = b""
+            status = 204
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
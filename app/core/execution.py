@@ -0,0 +1,97 @@
+import time
+from typing import Callable, Dict, TypeVar
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from .admission import Rejected
+from .metrics import metrics
+
+T = TypeVar("T")
+
+MODES = ("auto", "inline", "threadpool")
+
+# Fixed cost of a NumPy-vectorized computation (array setup, and the NumPy
+# import on first use), in the same units as the estimates below
+VECTOR_OVERHEAD = 50.0
+
+
+class ClientDisconnected(Exception):
+    """The client went away while its work was queued; the work was cancelled."""
+
+
+class ExecutionStrategy:
+    """Decide whether a computation runs inline on the event loop or in the threadpool.
+
+    A single ``/compute`` calculation takes microseconds, less than the
+    handoff to a worker thread, so cheap work runs inline. Costs are
+    estimated by each endpoint in units of one scalar calculation. In
+    ``auto`` mode work costing up to ``inline_max_cost`` runs inline;
+    ``inline`` and ``threadpool`` force one path. Every decision is counted
+    in ``metrics`` and inline run times are summarized, since they block
+    the event loop.
+
+    With a ``process_pool`` (see ``app.offload``), column computations
+    costing at least ``process_min_cost`` go to worker processes instead,
+    so they hold neither the event loop nor this process's GIL.
+    """
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        inline_max_cost: float = 32.0,
+        process_min_cost: float = 2000.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown execution mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.inline_max_cost = inline_max_cost
+        self.process_min_cost = process_min_cost
+        # Set by the app lifespan while the pool is running
+        self.process_pool = None
+
+    def runs_inline(self, cost: float) -> bool:
+        if self.mode == "auto":
+            return cost <= self.inline_max_cost
+        return self.mode == "inline"
+
+    def uses_processes(self, cost: float) -> bool:
+        return self.process_pool is not None and cost >= self.process_min_cost
+
+    async def run_in_processes(
+        self, name: str, func: Callable, columns: Dict[str, object], request=None
+    ):
+        """``func(columns)`` on the process pool, in row chunks.
+
+        Answers 503 when the pool's queue is full. When ``request``'s client
+        disconnects, the remaining chunks are cancelled and
+        ``ClientDisconnected`` is raised.
+        """
+        metrics.inc(f"execution.{name}.process")
+        is_disconnected = request.is_disconnected if request is not None else None
+        try:
+            return await self.process_pool.map_rows(func, columns, is_disconnected)
+        except Rejected as rejection:
+            raise HTTPException(
+                status_code=rejection.status_code, detail="Server busy", headers=rejection.headers
+            )
+
+    async def run(self, name: str, cost: float, func: Callable[..., T], *args) -> T:
+        """Run ``func(*args)`` on the path its estimated ``cost`` calls for."""
+        if not self.runs_inline(cost):
+            metrics.inc(f"execution.{name}.threadpool")
+            return await run_in_threadpool(func, *args)
+        metrics.inc(f"execution.{name}.inline")
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            metrics.observe("execution.inline_seconds", time.perf_counter() - started)
+
+
+default_strategy = ExecutionStrategy()
+
+
+def execution_for(request) -> ExecutionStrategy:
+    """The app's strategy (``app.state.execution``), or the default one."""
+    return getattr(request.app.state, "execution", default_strategy)
@@ -0,0 +1,73 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.openapi.utils import get_openapi
+from pydantic import BaseModel, ValidationError
+
+from .tracing import span
+
+# Bodies are read and validated explicitly (instead of through a typed
+# parameter) so each step can be traced; the schemas are still published
+# in the OpenAPI document.
+
+_REQUEST_SCHEMAS = {}
+
+
+def request_body(model: type[BaseModel], content_types=("application/json",)) -> dict:
+    """OpenAPI ``requestBody`` for an endpoint that parses ``model`` itself.
+
+    ``parse_body`` reads JSON whatever the declared content type, so an
+    endpoint may also list ``text/plain``, which browsers send without a
+    CORS preflight.
+    """
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    _REQUEST_SCHEMAS.update(schema.pop("$defs", {}))
+    _REQUEST_SCHEMAS[model.__name__] = schema
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                content_type: {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}}
+                for content_type in content_types
+            },
+        }
+    }
+
+
+def validation_error(exc: ValidationError, body=None) -> RequestValidationError:
+    """Wrap a pydantic error so it is reported like FastAPI's own body errors."""
+    errors = [
+        {**error, "loc": ("body", *error["loc"])}
+        for error in exc.errors(include_url=False)
+    ]
+    return RequestValidationError(errors, body=body)
+
+
+async def parse_body(request: Request, model: type[BaseModel]):
+    """Read and validate a JSON body, reporting errors like FastAPI does."""
+    with span("parse_body"):
+        body = await request.body()
+    with span("validate"):
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as exc:
+            raise validation_error(exc, body)
+
+
+def json_response(model: BaseModel) -> Response:
+    with span("encode"):
+        return Response(model.model_dump_json(), media_type="application/json")
+
+
+def install_openapi(app: FastAPI):
+    """Add the schemas registered through ``request_body`` to ``app``'s OpenAPI document."""
+
+    def custom_openapi():
+        if app.openapi_schema is None:
+            schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+            components = schema.setdefault("components", {}).setdefault("schemas", {})
+            for name, definition in _REQUEST_SCHEMAS.items():
+                components.setdefault(name, definition)
+            app.openapi_schema = schema
+        return app.openapi_schema
+
+    app.openapi = custom_openapi
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Event-loop lag measurement and blocked-loop stack dumps.
+
+    A task on the loop sleeps for ``interval`` and records how late it
+    wakes up: that lag is how long ready callbacks (requests) had to wait.
+    A watchdog thread checks the task's heartbeat; when the loop has been
+    held for more than ``threshold`` seconds it logs the loop thread's
+    stack, which shows the code that is blocking it. Stacks are logged at
+    most once per ``log_every`` seconds, and the cost otherwise is one
+    wake-up per interval on each side, so it can stay on in production.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.1,
+        window: int = 1024,
+        log_every: float = 10.0,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.log_every = log_every
+        self._lags: deque = deque(maxlen=window)
+        self._beat = time.perf_counter()
+        self._last_log = float("-inf")
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def _tick(self):
+        while True:
+            started = time.perf_counter()
+            self._beat = started
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self._lags.append(lag)
+            metrics.observe("event_loop.lag_seconds", lag)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            beat = self._beat
+            blocked = time.perf_counter() - beat - self.interval
+            if blocked < self.threshold or beat == reported:
+                continue
+            # Once per blocked stretch
+            reported = beat
+            metrics.inc("event_loop.blocked")
+            now = time.monotonic()
+            if now - self._last_log < self.log_every:
+                continue
+            self._last_log = now
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning(
+                "Event loop blocked for at least %.0f ms; loop thread stack:\n%s",
+                blocked * 1000,
+                stack,
+            )
+
+    def percentiles(self) -> Dict[str, float]:
+        """Lag percentiles, in seconds, over the most recent samples."""
+        lags = sorted(list(self._lags))
+        if not lags:
+            return {}
+
+        def at(fraction: float) -> float:
+            return round(lags[min(len(lags) - 1, int(fraction * len(lags)))], 6)
+
+        return {"p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": round(lags[-1], 6)}
@@ -0,0 +1,143 @@
+import os
+import re
+import resource
+import threading
+import tracemalloc
+from typing import List, Optional
+
+
+def rss_bytes(pid: Optional[int] = None) -> int:
+    """Resident set size of a process (this one by default), in bytes."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid is None:
+        # Peak rather than current RSS, but the best portable fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return 0
+
+
+SUPERVISORS = ("uvicorn", "gunicorn")
+
+
+def is_supervisor(cmdline: List[str]) -> bool:
+    """Whether a command line runs a server supervisor (``uvicorn``, ``python -m uvicorn``, ...).
+
+    Only the program and its first two arguments are looked at, which is
+    where the server's name is for a script or ``python -m``.
+    """
+    for arg in cmdline[:3]:
+        if os.path.basename(arg).split(".")[0] in SUPERVISORS:
+            return True
+    return False
+
+
+def _cmdline(pid) -> List[str]:
+    with open(f"/proc/{pid}/cmdline", "rb") as fh:
+        return [arg.decode(errors="replace") for arg in fh.read().split(b"\0") if arg]
+
+
+def _command_shape(cmdline: List[str]) -> List[str]:
+    # Workers differ only in numeric arguments, such as inherited descriptors
+    return [re.sub(r"\d+", "", arg) for arg in cmdline]
+
+
+def worker_rss() -> List[dict]:
+    """RSS of every worker started by the same supervisor (uvicorn ``--workers``).
+
+    Siblings are only reported when the parent process is a uvicorn or
+    gunicorn supervisor; otherwise the parent is a shell or an init process
+    and its other children are unrelated. Helpers of the supervisor, like
+    multiprocessing's resource tracker, are left out: a worker's command
+    line is the same as this one's, up to numbers. Falls back to this
+    process alone without a supervisor, or when ``/proc`` is not available.
+    """
+    parent = os.getppid()
+    pids = []
+    try:
+        if is_supervisor(_cmdline(parent)):
+            shape = _command_shape(_cmdline("self"))
+            with open(f"/proc/{parent}/task/{parent}/children", encoding="ascii") as fh:
+                children = [int(pid) for pid in fh.read().split()]
+            for pid in children:
+                try:
+                    if _command_shape(_cmdline(pid)) == shape:
+                        pids.append(pid)
+                except OSError:
+                    continue  # exited meanwhile
+    except OSError:
+        pids = []
+    if os.getpid() not in pids:
+        pids = [os.getpid()]
+    return [{"pid": pid, "rss_bytes": rss_bytes(pid)} for pid in pids]
+
+
+def _site(stat) -> dict:
+    frame = stat.traceback[0]
+    return {"site": f"{frame.filename}:{frame.lineno}", "size_bytes": stat.size, "count": stat.count}
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots and diffs between them.
+
+    Tracing costs CPU and memory of its own, so it only runs after
+    ``start`` (``MEMORY_TRACE_FRAMES`` > 0, or on demand from the admin API).
+    """
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        with self._lock:
+            self._baseline = None
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+
+    def top(self, limit: int = 20) -> List[dict]:
+        """Allocation sites holding the most memory right now."""
+        if not self.tracing:
+            return []
+        stats = self._snapshot().statistics("lineno")
+        return [_site(stat) for stat in stats[:limit]]
+
+    def diff(self, limit: int = 20) -> List[dict]:
+        """Growth per site since the previous ``diff`` call (or since the first one).
+
+        The first call only records the baseline and returns an empty list.
+        """
+        if not self.tracing:
+            return []
+        snapshot = self._snapshot()
+        with self._lock:
+            baseline, self._baseline = self._baseline, snapshot
+        if baseline is None:
+            return []
+        stats = snapshot.compare_to(baseline, "lineno")
+        return [
+            {**_site(stat), "size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in stats[:limit]
+        ]
+
+    def summary(self) -> dict:
+        traced, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {"tracing": self.tracing, "traced_bytes": traced, "peak_traced_bytes": peak}
+
+
+memory_profiler = MemoryProfiler()
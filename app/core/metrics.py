@@ -0,0 +1,56 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    """In-process counters and value summaries, reported by ``GET /metrics``.
+
+    Counters only go up. Summaries track count, sum and max of observed
+    values. Gauges are callables evaluated when a snapshot is taken.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._summaries: Dict[str, list] = {}
+        self._gauges: Dict[str, Callable[[], object]] = {}
+
+    def inc(self, name: str, value: float = 1.0):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value > summary[2]:
+                    summary[2] = value
+
+    def gauge(self, name: str, read: Callable[[], object]):
+        self._gauges[name] = read
+
+    def counter(self, name: str) -> float:
+        return self._counters.get(name, 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {
+                name: {"count": count, "sum": round(total, 6), "max": round(peak, 6)}
+                for name, (count, total, peak) in self._summaries.items()
+            }
+        gauges = {name: read() for name, read in self._gauges.items()}
+        return {"counters": counters, "summaries": summaries, "gauges": gauges}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()
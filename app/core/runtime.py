@@ -0,0 +1,15 @@
+import os
+import sys
+
+
+def gil_enabled() -> bool:
+    """False on a free-threaded CPython build (3.13t+) running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def default_cache_shards() -> int:
+    """Shards for in-process caches: one lock is enough while the GIL serializes threads."""
+    if gil_enabled():
+        return 1
+    return os.cpu_count() or 1
@@ -0,0 +1,183 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Hashable, Optional
+
+from ..schemas import PressureUnitEnum, TirePressure
+
+# File layout: one header followed by ``slots`` fixed-size slots.
+# header: magic, layout version, slot count, coefficient version
+_HEADER = struct.Struct("<8sII16s")
+_MAGIC = b"TPCACHE1"
+_LAYOUT_VERSION = 1
+# slot: sequence counter (odd while being written), coefficient version id,
+# 16-byte key digest, front pressure, rear pressure
+_SLOT = struct.Struct("<II16sdd")
+_SEQ = struct.Struct("<I")
+_EMPTY_DIGEST = bytes(16)
+
+# Slots per bucket; a key can live in any slot of its bucket
+WAYS = 4
+
+
+def _digest(key: Hashable) -> bytes:
+    # repr() is stable across processes, unlike hash() for str keys
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+
+class SharedResultCache:
+    """Fixed-size result cache shared by every worker process on a host.
+
+    Entries live in a memory-mapped file organised as a 4-way set-associative
+    hash table. Reads take no lock: each slot carries a sequence counter and a
+    read that overlaps a write is treated as a miss. Writers lock only the
+    bucket they modify (a byte-range lock across processes plus a thread
+    lock within one). Every slot records the coefficient version it was
+    computed with, so entries written by a different release are ignored
+    and overwritten instead of served.
+    """
+
+    def __init__(self, path: str, slots: int, version: str):
+        self.path = path
+        self.buckets = max(1, slots // WAYS)
+        self.slots = self.buckets * WAYS
+        self.version = version.encode()[:16].ljust(16, b"\0")
+        self._version_id = int.from_bytes(hashlib.blake2b(self.version, digest_size=4).digest(), "little")
+        self._size = _HEADER.size + self.slots * _SLOT.size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            self._initialize()
+            self._mm = mmap.mmap(self._fd, self._size)
+        except BaseException:
+            # Closing the descriptor also releases the lock
+            os.close(self._fd)
+            raise
+        fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _initialize(self):
+        """Format a new, empty file, or check that an existing one holds this layout.
+
+        A file written by another release keeps its slots: they carry that
+        release's coefficient version and are never served, only replaced.
+        A file with another layout or slot count is refused, not reformatted,
+        since other workers may have it mapped.
+        """
+        header = _HEADER.pack(_MAGIC, _LAYOUT_VERSION, self.slots, self.version)
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            os.ftruncate(self._fd, self._size)
+            os.pwrite(self._fd, header, 0)
+            return
+        existing = os.pread(self._fd, _HEADER.size, 0)
+        if size != self._size or existing[:16] != header[:16]:
+            raise ValueError(
+                f"{self.path} holds another cache layout or slot count; "
+                "remove it once no worker uses it, or use another path"
+            )
+        if existing != header:
+            os.pwrite(self._fd, header, 0)
+
+    def _bucket(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.buckets
+
+    def _offset(self, slot: int) -> int:
+        return _HEADER.size + slot * _SLOT.size
+
+    def get(self, key: Hashable) -> Optional[TirePressure]:
+        digest = _digest(key)
+        first = self._bucket(digest) * WAYS
+        mm = self._mm
+        for slot in range(first, first + WAYS):
+            offset = self._offset(slot)
+            seq, version_id, slot_digest, front, rear = _SLOT.unpack_from(mm, offset)
+            if slot_digest != digest or version_id != self._version_id:
+                continue
+            if seq & 1 or _SEQ.unpack_from(mm, offset)[0] != seq:
+                break  # concurrent write; fall through to a recompute
+            self.hits += 1
+            return TirePressure(front_wheel=front, rear_wheel=rear, unit=PressureUnitEnum.PSI)
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: TirePressure):
+        """Store ``value``; skipped if another process is writing the same bucket.
+
+        ``put`` can run on the event loop, so it never waits for another
+        process's lock. Losing a cache entry only costs a recompute.
+        """
+        digest = _digest(key)
+        bucket = self._bucket(digest)
+        first = bucket * WAYS
+        mm = self._mm
+        with self._lock:
+            try:
+                fcntl.lockf(
+                    self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, WAYS * _SLOT.size, self._offset(first)
+                )
+            except (BlockingIOError, PermissionError):
+                # EAGAIN or EACCES, depending on the platform
+                self.skipped += 1
+                return
+            try:
+                target = None
+                for slot in range(first, first + WAYS):
+                    _, version_id, slot_digest, _, _ = _SLOT.unpack_from(mm, self._offset(slot))
+                    if slot_digest == digest:
+                        target = slot
+                        break
+                    if target is None and (
+                        slot_digest == _EMPTY_DIGEST or version_id != self._version_id
+                    ):
+                        target = slot
+                if target is None:
+                    # Bucket full of live entries: evict a slot chosen by the key
+                    target = first + digest[8] % WAYS
+                    self.evictions += 1
+
+                offset = self._offset(target)
+                seq = _SEQ.unpack_from(mm, offset)[0]
+                _SEQ.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF)
+                _SLOT.pack_into(
+                    mm,
+                    offset,
+                    (seq + 1) & 0xFFFFFFFF,
+                    self._version_id,
+                    digest,
+                    value.front_wheel,
+                    value.rear_wheel,
+                )
+                _SEQ.pack_into(mm, offset, (seq + 2) & 0xFFFFFFFF)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, WAYS * _SLOT.size, self._offset(first))
+
+    def clear(self):
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                self._mm[_HEADER.size :] = bytes(self._size - _HEADER.size)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        self._mm.close()
+        os.close(self._fd)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters are per process; the table itself is shared."""
+        return {
+            "maxsize": self.slots,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "skipped": self.skipped,
+        }
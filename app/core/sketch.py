@@ -0,0 +1,85 @@
+import random
+import threading
+from typing import Dict, Hashable, List, Tuple
+
+
+_MASK = (1 << 64) - 1
+_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class CountMinSketch:
+    """Approximate counts for any number of keys in ``width * depth`` counters.
+
+    Estimates never undercount; they overcount by at most about
+    ``2 * total / width`` with high probability.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [[0] * width for _ in range(depth)]
+        # One salt per row; multiplying and keeping the high bits makes the
+        # rows' cell choices independent of each other
+        rng = random.Random(depth * 1_000_003 + width)
+        self._salts = [rng.getrandbits(64) for _ in range(depth)]
+
+    def _cells(self, key: Hashable):
+        h = hash(key) & _MASK
+        for salt, row in zip(self._salts, self._rows):
+            yield row, ((((h ^ salt) * _MULTIPLIER) & _MASK) >> 32) % self.width
+
+    def add(self, key: Hashable, count: int = 1) -> int:
+        """Count ``key`` and return its new estimate."""
+        self.total += count
+        estimate = None
+        for row, index in self._cells(key):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in self._cells(key))
+
+
+class TopK:
+    """Heavy hitters over a stream, in constant memory.
+
+    A count-min sketch estimates every key's count; the ``capacity`` keys
+    with the highest estimates are kept as candidates. A new key replaces
+    the weakest candidate once its estimate is higher.
+    """
+
+    def __init__(self, capacity: int = 100, width: int = 2048, depth: int = 4):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self._candidates: Dict[Hashable, int] = {}
+        # Lower bound of the smallest candidate count (counts only grow)
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable):
+        with self._lock:
+            estimate = self.sketch.add(key)
+            candidates = self._candidates
+            if key in candidates or len(candidates) < self.capacity:
+                candidates[key] = estimate
+                return
+            if estimate <= self._floor:
+                return
+            weakest = min(candidates, key=candidates.get)
+            self._floor = candidates[weakest]
+            if estimate > self._floor:
+                del candidates[weakest]
+                candidates[key] = estimate
+
+    def top(self, limit: int = 0) -> List[Tuple[Hashable, int]]:
+        """Candidates by estimated count, most frequent first."""
+        with self._lock:
+            ranked = sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
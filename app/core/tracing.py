@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """A single timed operation inside a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration_ms", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.attributes: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 4),
+            "attributes": self.attributes,
+        }
+
+
+class _Trace:
+    """Per-request collection of finished spans plus the current parent."""
+
+    __slots__ = ("trace_id", "spans", "stack")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.stack: List[str] = []
+
+
+class _NoopSpan:
+    """Shared context manager used whenever the current request is not sampled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar("current_trace", default=None)
+
+
+class _ActiveSpan:
+    __slots__ = ("_trace", "_span", "_t0")
+
+    def __init__(self, trace: _Trace, name: str):
+        parent = trace.stack[-1] if trace.stack else None
+        self._trace = trace
+        self._span = Span(name, trace.trace_id, parent)
+
+    def __enter__(self):
+        self._trace.stack.append(self._span.span_id)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.duration_ms = (time.perf_counter() - self._t0) * 1000.0
+        if exc_type is not None:
+            self._span.attributes["error"] = exc_type.__name__
+        self._trace.stack.pop()
+        self._trace.spans.append(self._span)
+        return False
+
+    def set(self, key: str, value: Any):
+        self._span.attributes[key] = value
+
+
+def span(name: str):
+    """Time a block as a child of the current trace.
+
+    Returns a shared no-op context manager when the request is not sampled,
+    so instrumented code pays a single context variable lookup.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _ActiveSpan(trace, name)
+
+
+# --- Exporters ---
+
+
+class RingBufferExporter:
+    """Keep the most recent spans in memory."""
+
+    def __init__(self, capacity: int = 1000):
+        self._spans = deque(maxlen=capacity)
+
+    def export(self, spans: List[Span]):
+        self._spans.extend(s.to_dict() for s in spans)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return list(self._spans)
+
+
+class JsonlExporter:
+    """Append spans to a local JSON Lines file, one span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(s.to_dict()) + "\n" for s in spans)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return []
+
+
+def build_exporter(kind: str, path: str, capacity: int):
+    """Create an exporter from its configuration name ("memory" or "jsonl")."""
+    if kind == "jsonl":
+        return JsonlExporter(path)
+    if kind == "memory":
+        return RingBufferExporter(capacity)
+    raise ValueError(f"Unknown trace exporter: {kind}")
+
+
+# --- Tracer ---
+
+
+class Tracer:
+    def __init__(self, exporter, sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start(self) -> Optional[object]:
+        """Begin a trace for the current context if it is sampled.
+
+        Returns a token to pass to ``finish`` or ``None`` when not sampled.
+        """
+        if self.sample_rate <= 0.0 or random.random() >= self.sample_rate:
+            return None
+        return _current_trace.set(_Trace())
+
+    def finish(self, token):
+        trace = _current_trace.get()
+        _current_trace.reset(token)
+        if trace is None or not trace.spans:
+            return
+        try:
+            self.exporter.export(trace.spans)
+        except Exception:
+            logger.exception("Failed to export trace spans")
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a sampled trace around each HTTP request."""
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = self.tracer.start()
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            with span("http.request") as root:
+                root.set("method", scope["method"])
+                root.set("path", scope["path"])
+                await self.app(scope, receive, send)
+        finally:
+            self.tracer.finish(token)
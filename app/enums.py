@@ -0,0 +1,66 @@
+from enum import StrEnum
+
+# Enums live apart from the pydantic models so the calculation core can be
+# imported without pydantic (see ``app.calc``); ``app.schemas`` re-exports them.
+
+
+class PressureUnitEnum(StrEnum):
+    BAR = "BAR"
+    PSI = "PSI"
+
+
+class WidthUnitEnum(StrEnum):
+    IN = "IN"
+    MM = "MM"
+
+
+class WeightUnitEnum(StrEnum):
+    LBS = ("lbs",)
+    KG = "kg"
+
+
+class DisciplineEnum(StrEnum):
+    ROAD = "ROAD"
+    CYCLOCROSS = "CYCLOCROSS"
+    GRAVEL = "GRAVEL"
+    MTB_XC = "MTB_XC"
+    MTB_TRAIL = "MTB_TRAIL"
+    MTB_ENDURO = "MTB_ENDURO"
+    MTB_DOWNHILL = "MTB_DOWNHILL"
+    FATBIKE = "FATBIKE"
+
+
+class PositionEnum(StrEnum):
+    FRONT = "FRONT"
+    REAR = "REAR"
+
+
+class SurfaceEnum(StrEnum):
+    DRY = "DRY"
+    WET = "WET"
+    MIXED = "MIXED"
+    SNOW = "SNOW"
+
+
+class CasingEnum(StrEnum):
+    THIN = "THIN"
+    STANDARD = "STANDARD"
+    REINFORCED = "REINFORCED"
+    DOWNHILL_CASING = "DOWNHILL_CASING"
+
+
+class DiameterEnum(StrEnum):
+    D_650C = "650C"
+    D_650B = "650B"
+    D_700C = "700C"
+    D_26 = "26"
+    D_27_5 = "27.5"
+    D_29 = "29"
+
+
+class RimTypeEnum(StrEnum):
+    TUBES = "TUBES"
+    TUBULAR = "TUBULAR"
+    HOOKED = "HOOKED"
+    HOOKS = "HOOKS"
+    HOOKLESS = "HOOKLESS"
@@ -0,0 +1,90 @@
+"""Pressures for every rider x bike x surface combination of a team.
+
+The scalar formula is a product of independent terms, so each term is
+computed once at the level it depends on: geometry per distinct bike and
+wheel, the weight factor per rider and bike, and the remaining factors
+per bike, wheel and surface. The cross product is then one broadcast
+multiplication, performed in the same order as the scalar formula.
+"""
+
+from typing import Dict, List
+
+from .schemas import Bike, DisciplineEnum, FleetRequest, FleetResponse, PressureUnitEnum
+from . import services
+from .services import PressureCalculator
+
+
+def bike_key(bike: Bike) -> tuple:
+    """Everything about a bike the formula reads; the name is left out."""
+    parts = [bike.discipline.value, float(bike.weight.value)]
+    for tire, wheel in ((bike.front_tire, bike.front_wheel), (bike.rear_tire, bike.rear_wheel)):
+        parts += [
+            tire.get_width_mm(), tire.casing.value,
+            float(wheel.rim_width), wheel.rim_type.value, wheel.diameter.value,
+        ]
+    return tuple(parts)
+
+
+def fleet_matrix(payload: FleetRequest) -> FleetResponse:
+    import numpy as np
+
+    calc = PressureCalculator
+
+    # Duplicate setups (same bike under another name) are computed once
+    unique: Dict[tuple, int] = {}
+    bike_index: List[int] = []
+    bikes: List[Bike] = []
+    for bike in payload.bikes:
+        key = bike_key(bike)
+        if key not in unique:
+            unique[key] = len(bikes)
+            bikes.append(bike)
+        bike_index.append(unique[key])
+
+    rider_weights = np.array([rider.weight.value for rider in payload.riders], dtype=np.float64)
+    bike_weights = np.array([bike.weight.value for bike in bikes], dtype=np.float64)
+    # Weight factor per rider and bike
+    weight_sum = bike_weights[None, :] + rider_weights[:, None]
+    weight_factor = 1.0 + (
+        calc.WEIGHT_LBS_PER_KG * weight_sum - calc.WEIGHT_REFERENCE_LBS
+    ) * calc.WEIGHT_SLOPE
+
+    def wheel(position: str):
+        base = np.empty(len(bikes))
+        factors = np.empty((len(bikes), len(payload.surfaces)))
+        for b, bike in enumerate(bikes):
+            tire, rim = (
+                (bike.front_tire, bike.front_wheel)
+                if position == "FRONT"
+                else (bike.rear_tire, bike.rear_wheel)
+            )
+            base[b] = services.geometry_base(
+                tire.get_width_mm(), rim.rim_width, calc.WHEEL_DIAMETER_MAP.get(rim.diameter, 622)
+            )
+            rim_factors = (
+                calc.RIM_TYPE_CX_FACTORS
+                if bike.discipline == DisciplineEnum.CYCLOCROSS
+                else calc.RIM_TYPE_FACTORS
+            )
+            rim_factor = rim_factors.get(rim.rim_type, 1.0)
+            ride_factor = calc.DISCIPLINE_FACTORS.get(bike.discipline, 1.0)
+            casing_factor = calc.CASING_FACTORS.get(tire.casing, 1.0)
+            for s, surface in enumerate(payload.surfaces):
+                surface_factor = calc.SURFACE_FACTORS.get(surface, 1.0)
+                factors[b, s] = rim_factor * ride_factor * surface_factor * casing_factor
+
+        wheel_factor = calc.WHEEL_POSITION_FACTORS.get(position, 1.0)
+        pressure = base[None, :] * weight_factor * wheel_factor
+        pressure = pressure[:, :, None] * factors[None, :, :]
+        # Back to the requested bike order, duplicates included
+        return np.round(pressure[:, bike_index, :], 1).tolist()
+
+    return FleetResponse(
+        riders=[rider.name for rider in payload.riders],
+        bikes=[bike.name for bike in payload.bikes],
+        surfaces=payload.surfaces,
+        front_wheel=wheel("FRONT"),
+        rear_wheel=wheel("REAR"),
+        unit=PressureUnitEnum.PSI,
+        unique_bikes=len(bikes),
+    )
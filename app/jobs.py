@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pydantic import ValidationError
+
+from .schemas import TirePressureRequest
+from .services import build_and_compute
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    input_offset INTEGER NOT NULL DEFAULT 0,
+    output_size INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+)
+"""
+
+_FIELDS = (
+    "id", "status", "created_at", "updated_at", "total",
+    "processed", "failed", "input_offset", "output_size", "error",
+)
+
+
+class JobStore:
+    """SQLite-backed job records, including the checkpoint of each job."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, total: int) -> dict:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, created_at, updated_at, total) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED, now, now, total),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(_FIELDS, row)) if row else None
+
+    def update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+            )
+
+    def transition(self, job_id: str, status: str, **fields) -> bool:
+        """Set ``status`` unless the job has already finished; ``False`` if it had.
+
+        The check and the write are one statement, so a finished status
+        (in particular a cancellation) is never overwritten.
+        """
+        fields["status"] = status
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        placeholders = ", ".join("?" for _ in JobStatus.FINISHED)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status NOT IN ({placeholders})",
+                (*fields.values(), job_id, *JobStatus.FINISHED),
+            )
+        return cursor.rowcount > 0
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.QUEUED, JobStatus.RUNNING),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def compute_row(line: bytes) -> dict:
+    """Result record for one JSON-encoded ``TirePressureRequest``."""
+    try:
+        request = TirePressureRequest.model_validate_json(line)
+    except ValidationError as exc:
+        return {
+            "errors": exc.errors(include_url=False, include_context=False, include_input=False)
+        }
+    result = build_and_compute(request.bike, request.surface, request.rider_weight)
+    return result.model_dump(mode="json")
+
+
+class JobRunner:
+    """Run batch jobs in chunks on a dedicated thread pool.
+
+    Jobs never use the AnyIO threadpool that serves ``/compute``. After each
+    chunk the output is flushed and the input/output offsets are stored, so
+    a job interrupted by a restart resumes from its last checkpoint.
+    """
+
+    def __init__(self, store: JobStore, directory: str, workers: int = 1, chunk_size: int = 1000):
+        self.store = store
+        self.directory = directory
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+        # Jobs being run by a worker, and those among them cancelled since
+        self._running = set()
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    def input_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.input.jsonl")
+
+    def output_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.output.jsonl")
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def start(self):
+        """Start the workers and resume every job left unfinished."""
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="job-worker")
+        for job_id in self.store.unfinished():
+            logger.info(f"Resuming job {job_id}")
+            self._executor.submit(self._run, job_id)
+
+    def stop(self):
+        """Stop after the current chunk; unfinished jobs resume on next start."""
+        self._stopping.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, job_id: str, total: int) -> dict:
+        """Register a job whose input file is already written and queue it."""
+        job = self.store.create(job_id, total)
+        self._executor.submit(self._run, job_id)
+        return job
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            if self.store.transition(job_id, JobStatus.CANCELLED) and job_id in self._running:
+                # The worker stops at its next chunk
+                self._cancelled.add(job_id)
+
+    def _run(self, job_id: str):
+        with self._lock:
+            if not self.store.transition(job_id, JobStatus.RUNNING):
+                return
+            self._running.add(job_id)
+        try:
+            if self._process(self.store.get(job_id)):
+                self.store.transition(job_id, JobStatus.DONE)
+        except Exception as exc:
+            logger.exception(f"Job {job_id} failed")
+            self.store.transition(job_id, JobStatus.FAILED, error=str(exc))
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+                self._cancelled.discard(job_id)
+
+    def _process(self, job: Dict) -> bool:
+        """Process chunks from the checkpoint on; ``False`` if interrupted."""
+        job_id = job["id"]
+        processed, failed = job["processed"], job["failed"]
+        output_path = self.output_path(job_id)
+        mode = "r+b" if os.path.exists(output_path) else "w+b"
+        with open(self.input_path(job_id), "rb") as src, open(output_path, mode) as dst:
+            # Drop anything written after the last checkpoint
+            dst.truncate(job["output_size"])
+            dst.seek(job["output_size"])
+            src.seek(job["input_offset"])
+            while True:
+                if self._stopping.is_set():
+                    self.store.transition(job_id, JobStatus.QUEUED)
+                    return False
+                if job_id in self._cancelled:
+                    return False
+
+                lines = []
+                for _ in range(self.chunk_size):
+                    line = src.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        lines.append(line)
+                if not lines:
+                    return True
+
+                out = []
+                for line in lines:
+                    record = compute_row(line)
+                    if "errors" in record:
+                        failed += 1
+                    out.append(json.dumps({"row": processed, **record}, separators=(",", ":")))
+                    processed += 1
+                dst.write(("\n".join(out) + "\n").encode())
+                dst.flush()
+                os.fsync(dst.fileno())
+                self.store.update(
+                    job_id,
+                    processed=processed,
+                    failed=failed,
+                    input_offset=src.tell(),
+                    output_size=dst.tell(),
+                )
+                # Give the GIL back to request-serving threads between chunks
+                time.sleep(0)
@@ -1,62 +1,355 @@
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from .schemas import TirePressureRequest, TirePressure
-from .services import build_and_compute
-from .core.config import ALLOWED_ORIGINS, ALLOW_CREDENTIALS
+import asyncio
 import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request, Response
+
+from . import services
+from .core.admission import AdmissionController, Rejected
+from .core.cache import LRUCache, ShardedLRUCache
+from .core.capture import build_recorder
+from .core.config import Settings
+from .core.cors import CachedCORSMiddleware
+from .core.execution import ClientDisconnected, ExecutionStrategy
+from .core.http import install_openapi, json_response, parse_body, request_body
+from .core.loopmonitor import LoopMonitor
+from .core.metrics import metrics
+from .core.runtime import default_cache_shards, gil_enabled
+from .core.tracing import Tracer, TracingMiddleware, build_exporter
+from .popularity import PopularityTracker
+from .routers import batch as batch_router
+from .routers import fleet as fleet_router
+from .routers import model as model_router
+from .routers import route as route_router
+from .routers import uncertainty as uncertainty_router
+from .schemas import TirePressure, TirePressureRequest, TirePressureRequestV2, TirePressureV2
+from .services import cached_compute, cached_compute_flat
+from .warmup import build_warmer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
-
-# Log CORS configuration on startup
-@app.on_event("startup")
-async def startup_event():
-    logger.info(f"CORS Configuration - ALLOWED_ORIGINS: {ALLOWED_ORIGINS}")
-    logger.info(f"CORS Configuration - ALLOW_CREDENTIALS: {ALLOW_CREDENTIALS}")
-
-# Middleware to log all requests
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    origin = request.headers.get("origin", "No Origin Header")
-    logger.info(f"Request: {request.method} {request.url.path} | Origin: {origin}")
-    response = await call_next(request)
-    logger.info(f"Response Status: {response.status_code}")
-    return response
-
-# Configure CORS to allow frontend requests
-# Note: ALLOWED_ORIGINS can be either a list of strings or "*"
-if isinstance(ALLOWED_ORIGINS, list):
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=ALLOWED_ORIGINS,
-        allow_credentials=ALLOW_CREDENTIALS,
-        allow_methods=["*"],
-        allow_headers=["*"],
-        expose_headers=["*"],
+
+def _result_cache(settings: Settings):
+    """/compute result cache, per worker or shared by all workers (None when disabled)."""
+    if settings.result_cache_size <= 0:
+        return None
+    if settings.result_cache_backend == "shared":
+        from .core.shared_cache import SharedResultCache
+
+        return SharedResultCache(
+            settings.shared_cache_path, settings.result_cache_size, services.coefficients_version()
+        )
+    shards = settings.result_cache_shards or default_cache_shards()
+    if shards > 1:
+        return ShardedLRUCache(settings.result_cache_size, shards)
+    return LRUCache(settings.result_cache_size)
+
+
+def _admission(settings: Settings) -> Optional[AdmissionController]:
+    """Shed /compute requests early instead of queueing them without limit."""
+    if not settings.admission_enabled:
+        return None
+    admission = AdmissionController(
+        max_concurrency=settings.admission_max_concurrency,
+        max_queue=settings.admission_max_queue,
+        max_queue_wait=settings.admission_max_queue_wait,
+        rate=settings.admission_rate,
+        burst=settings.admission_burst,
+        client_rate=settings.admission_client_rate,
+        client_burst=settings.admission_client_burst,
+        max_clients=settings.admission_max_clients,
     )
-else:
-    # ALLOWED_ORIGINS is "*" (development mode)
+    metrics.gauge("admission.in_flight", lambda: admission.in_flight)
+    metrics.gauge("admission.queued", lambda: admission.queued)
+    return admission
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the API. Settings come from the environment unless given.
+
+    Optional subsystems (tracing, capture, caches, jobs, admin, ...) are
+    only created, and their modules only imported, when enabled.
+    """
+    if settings is None:
+        settings = Settings.from_env()
+    logging.basicConfig(level=logging.INFO)
+
+    if settings.memory_trace_frames > 0:
+        # Allocation tracing has overhead, so it is off unless asked for
+        from .core.memory import memory_profiler
+
+        memory_profiler.start(settings.memory_trace_frames)
+
+    if settings.geometry_cache_size != services.geometry_base.cache_info().maxsize:
+        services.configure_geometry_cache(settings.geometry_cache_size)
+
+    # Sampled payload capture for replay (None when disabled)
+    traffic_recorder = build_recorder(
+        settings.capture_sample_rate,
+        settings.capture_file,
+        settings.capture_max_bytes,
+        settings.capture_backups,
+        settings.capture_queue_size,
+    )
+    result_cache = _result_cache(settings)
+    warmer = build_warmer(result_cache, settings.warmup_file, settings.warmup_limit)
+    admission = _admission(settings)
+    # Cheap requests are computed on the event loop, expensive ones in the threadpool
+    execution = ExecutionStrategy(
+        settings.execution_mode,
+        settings.execution_inline_max_cost,
+        settings.execution_process_min_cost,
+    )
+
+    # Most requested configurations; a saved GET /popular response can seed warm-up
+    popularity = None
+    if settings.popularity_enabled:
+        popularity = PopularityTracker(
+            settings.popularity_top_k,
+            settings.popularity_sketch_width,
+            settings.popularity_sketch_depth,
+        )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Log CORS configuration on startup
+        logger.info(f"CORS Configuration - ALLOWED_ORIGINS: {settings.allowed_origins}")
+        logger.info(f"CORS Configuration - ALLOW_CREDENTIALS: {settings.allow_credentials}")
+
+        if settings.threadpool_size > 0:
+            to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+
+        # Measure event-loop lag and report anything holding the loop
+        loop_monitor = None
+        if settings.loop_monitor_enabled:
+            loop_monitor = LoopMonitor(settings.loop_monitor_interval, settings.loop_block_threshold)
+            loop_monitor.start()
+            metrics.gauge("event_loop.lag_percentiles_seconds", loop_monitor.percentiles)
+
+        # Heavy batches run in worker processes, started with the app
+        process_pool = None
+        if settings.process_pool_workers > 0:
+            from .offload import ProcessPool
+
+            process_pool = ProcessPool(
+                settings.process_pool_workers,
+                settings.process_pool_max_pending,
+                settings.process_pool_chunk_rows,
+            )
+            process_pool.start()
+            execution.process_pool = process_pool
+            metrics.gauge("process_pool.pending", lambda: process_pool.pending)
+
+        # Warm caches in the background so startup is not delayed
+        warmup_task = None
+        if settings.warmup_enabled:
+            warmup_task = asyncio.create_task(warmer.run())
+
+        # Batch jobs run on their own thread pool; unfinished jobs resume here
+        job_runner = None
+        if settings.jobs_enabled:
+            from .jobs import JobRunner, JobStore
+
+            os.makedirs(settings.jobs_dir, exist_ok=True)
+            job_store = JobStore(os.path.join(settings.jobs_dir, "jobs.sqlite3"))
+            job_runner = JobRunner(
+                job_store, settings.jobs_dir, settings.jobs_workers, settings.jobs_chunk_size
+            )
+            job_runner.start()
+            app.state.job_runner = job_runner
+
+        yield
+
+        if loop_monitor is not None:
+            loop_monitor.stop()
+        if process_pool is not None:
+            execution.process_pool = None
+            process_pool.stop()
+        if job_runner is not None:
+            job_runner.stop()
+            job_runner.store.close()
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+        if traffic_recorder is not None:
+            traffic_recorder.close()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.execution = execution
+
+    @app.exception_handler(ClientDisconnected)
+    async def client_disconnected(request: Request, exc: ClientDisconnected):
+        # Nobody reads this response; the status shows up in the access log
+        return Response(status_code=499)
+
+    if settings.request_logging:
+        # Middleware to log all requests
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            origin = request.headers.get("origin", "No Origin Header")
+            logger.info(f"Request: {request.method} {request.url.path} | Origin: {origin}")
+            response = await call_next(request)
+            logger.info(f"Response Status: {response.status_code}")
+            return response
+
+    # Configure CORS to allow frontend requests; preflight answers are
+    # precomputed per origin and cached by browsers for cors_max_age seconds
+    # Note: allowed_origins can be either a list of strings or "*" (development mode)
+    origins = settings.allowed_origins
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=False,
+        CachedCORSMiddleware,
+        allow_origins=origins if isinstance(origins, list) else ["*"],
+        allow_credentials=settings.allow_credentials,
         allow_methods=["*"],
         allow_headers=["*"],
         expose_headers=["*"],
+        max_age=settings.cors_max_age,
     )
 
+    # Tracing is only wired in when sampling is enabled
+    if settings.trace_sample_rate > 0:
+        tracer = Tracer(
+            build_exporter(
+                settings.trace_exporter, settings.trace_file, settings.trace_buffer_size
+            ),
+            sample_rate=settings.trace_sample_rate,
+        )
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+
+        @app.get("/debug/traces")
+        def recent_traces():
+            return tracer.exporter.snapshot()
+
+    # Compress large responses (batch results, catalogs); small ones go out as is
+    if settings.compression_enabled:
+        from .core.compression import CompressionMiddleware
+
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_min_size,
+            offload_size=settings.compression_offload_size,
+        )
+        metrics.gauge(
+            "compression.ratio",
+            lambda: round(
+                metrics.counter("compression.bytes_out")
+                / max(metrics.counter("compression.bytes_in"), 1.0),
+                4,
+            ),
+        )
+
+    app.include_router(batch_router.router)
+    app.include_router(model_router.router)
+    app.include_router(uncertainty_router.router)
+    app.include_router(route_router.router)
+    app.include_router(fleet_router.router)
+    if settings.jobs_enabled:
+        from .routers import jobs as jobs_router
+
+        app.include_router(jobs_router.router)
+    if settings.admin_token:
+        from .routers import admin as admin_router
+
+        app.state.admin_token = settings.admin_token
+        app.include_router(admin_router.router)
 
-@app.get("/")
-def root():
-    return {"status": "healthy"}
+    install_openapi(app)
 
+    @app.get("/")
+    def root():
+        return {"status": "healthy"}
 
-@app.post("/compute", response_model=TirePressure)
-def compute_pressure(payload: TirePressureRequest):
-    recommended_pressure = build_and_compute(
-        payload.bike, payload.surface, payload.rider_weight
+    @app.get("/ready")
+    def ready():
+        progress = warmer.progress() if settings.warmup_enabled else {"state": "disabled"}
+        cache = result_cache.stats() if result_cache is not None else None
+        return {
+            "status": "ready",
+            "gil_enabled": gil_enabled(),
+            "warmup": progress,
+            "result_cache": cache,
+            "geometry_cache": services.geometry_base.cache_info()._asdict(),
+        }
+
+    if settings.metrics_enabled:
+
+        @app.get("/metrics")
+        def get_metrics():
+            return metrics.snapshot()
+
+    if popularity is not None:
+
+        @app.get("/popular")
+        def popular(limit: int = 0):
+            return popularity.top(limit)
+
+    async def _compute(request: Request):
+        started = time.perf_counter()
+        payload = await parse_body(request, TirePressureRequest)
+        if popularity is not None:
+            popularity.record(payload)
+        recommended_pressure = await execution.run(
+            "compute",
+            1,
+            cached_compute,
+            payload.bike,
+            payload.surface,
+            payload.rider_weight,
+            result_cache,
+        )
+        if traffic_recorder is not None:
+            traffic_recorder.record("/compute", payload, started)
+        return json_response(recommended_pressure)
+
+    async def _compute_v2(request: Request):
+        payload = await parse_body(request, TirePressureRequestV2)
+        result = await execution.run("compute_v2", 1, cached_compute_flat, payload, result_cache)
+        return json_response(result)
+
+    async def _admitted(request: Request, handler):
+        if admission is None:
+            return await handler(request)
+        client = request.client.host if request.client else "unknown"
+        try:
+            async with admission.admit(client):
+                return await handler(request)
+        except Rejected as rejection:
+            raise HTTPException(
+                status_code=rejection.status_code,
+                detail="Too many requests" if rejection.status_code == 429 else "Server busy",
+                headers=rejection.headers,
+            )
+
+    @app.post(
+        "/compute",
+        response_model=TirePressure,
+        # text/plain bodies make this a CORS "simple request": no preflight
+        openapi_extra=request_body(TirePressureRequest, ("application/json", "text/plain")),
+    )
+    async def compute_pressure(request: Request):
+        return await _admitted(request, _compute)
+
+    @app.post(
+        "/v2/compute",
+        response_model=TirePressureV2,
+        openapi_extra=request_body(TirePressureRequestV2, ("application/json", "text/plain")),
     )
-    return recommended_pressure
+    async def compute_pressure_v2(request: Request):
+        """Flat request and response; shares the result cache with ``/compute``."""
+        return await _admitted(request, _compute_v2)
+
+    return app
+
+
+def __getattr__(name: str):
+    # ``app.main:app`` (uvicorn, Docker) builds the app on first access rather
+    # than at import, so importing this module has no side effects
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+"""Process pool for CPU-heavy column computations.
+
+Work is shipped as row chunks of the columnar arrays (float64 values and
+int8 enum codes), and results come back as arrays, so nothing but compact
+buffers is pickled. Children import the calculator and build its lookup
+tables when they start, not on their first task.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from .core.admission import Rejected
+from .core.execution import ClientDisconnected
+from .core.metrics import metrics
+
+
+def _init_worker():
+    from .columnar import _tables
+
+    _tables()
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _row_count(columns: Dict[str, object]) -> int:
+    return len(next(iter(columns.values())))
+
+
+class ProcessPool:
+    """A bounded pool of worker processes for ``func(columns) -> (front, rear)``.
+
+    At most ``max_pending`` calls are in flight; more are rejected with a
+    503 right away instead of queueing behind heavy work. Each call is
+    split into chunks of ``chunk_rows`` rows. When ``is_disconnected``
+    reports the client gone, chunks that have not started are cancelled.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int = 4,
+        chunk_rows: int = 10000,
+        poll_interval: float = 0.1,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.chunk_rows = chunk_rows
+        self.poll_interval = poll_interval
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Start the workers; they load the calculator in the background."""
+        # forkserver children do not inherit the server's threads or sockets
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=context, initializer=_init_worker
+        )
+        for _ in range(self.workers):
+            self._executor.submit(_ready)
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def map_rows(
+        self,
+        func: Callable[[Dict[str, object]], Tuple[object, object]],
+        columns: Dict[str, object],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Tuple[object, object]:
+        """``func`` over row chunks of ``columns``, with the results joined back together."""
+        import numpy as np
+
+        if self._executor is None:
+            raise RuntimeError("ProcessPool is not started")
+        if self.pending >= self.max_pending:
+            metrics.inc("process_pool.rejected")
+            raise Rejected(503, "process_queue", 1.0)
+
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        rows = _row_count(columns)
+        futures = [
+            loop.run_in_executor(
+                self._executor,
+                func,
+                {name: values[start : start + self.chunk_rows] for name, values in columns.items()},
+            )
+            for start in range(0, rows, self.chunk_rows)
+        ]
+        metrics.inc("process_pool.chunks", len(futures))
+        results = asyncio.gather(*futures)
+        watcher = None
+        if is_disconnected is not None:
+            watcher = asyncio.create_task(self._watch(results, is_disconnected))
+        try:
+            chunks = await results
+        except asyncio.CancelledError:
+            if watcher is not None and watcher.done() and not watcher.cancelled():
+                metrics.inc("process_pool.cancelled")
+                raise ClientDisconnected() from None
+            raise
+        finally:
+            self.pending -= 1
+            if watcher is not None:
+                watcher.cancel()
+        if not chunks:
+            return np.empty(0), np.empty(0)
+        front = np.concatenate([chunk[0] for chunk in chunks])
+        rear = np.concatenate([chunk[1] for chunk in chunks])
+        return front, rear
+
+    async def _watch(self, results: asyncio.Future, is_disconnected):
+        while not results.done():
+            await asyncio.sleep(self.poll_interval)
+            if await is_disconnected():
+                # Cancels every chunk that has not started yet
+                results.cancel()
+                return
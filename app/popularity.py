@@ -0,0 +1,64 @@
+from typing import List
+
+from .core.sketch import TopK
+from .schemas import TirePressureRequest
+
+
+def config_key(request: TirePressureRequest) -> tuple:
+    """Normalized bike configuration of a request; the rider weight is left out.
+
+    Rider weights vary from request to request, so they would split one
+    popular setup into many rare ones. Warm-up expands each configuration
+    over common rider weights instead.
+    """
+    bike = request.bike
+    key = [
+        bike.discipline.value,
+        request.surface.value,
+        round(bike.weight.value, 1),
+        bike.weight.unit.value,
+    ]
+    for tire, wheel in ((bike.front_tire, bike.front_wheel), (bike.rear_tire, bike.rear_wheel)):
+        key += [
+            round(tire.width, 2),
+            tire.unit.value,
+            tire.casing.value,
+            round(wheel.rim_width, 1),
+            wheel.rim_type.value,
+            wheel.diameter.value,
+        ]
+    return tuple(key)
+
+
+def config_from_key(key: tuple) -> dict:
+    """Request fields for a ``config_key``, in the shape ``/compute`` accepts."""
+    discipline, surface, weight, weight_unit = key[:4]
+    bike = {"name": "popular", "discipline": discipline}
+    for position, offset in (("FRONT", 4), ("REAR", 10)):
+        width, unit, casing, rim_width, rim_type, diameter = key[offset : offset + 6]
+        prefix = position.lower()
+        bike[f"{prefix}_tire"] = {
+            "width": width, "unit": unit, "casing": casing, "position": position,
+        }
+        bike[f"{prefix}_wheel"] = {
+            "rim_width": rim_width, "rim_type": rim_type, "diameter": diameter, "position": position,
+        }
+    bike["weight"] = {"value": weight, "unit": weight_unit}
+    return {"surface": surface, "bike": bike}
+
+
+class PopularityTracker:
+    """Most requested bike configurations, tracked in constant memory."""
+
+    def __init__(self, capacity: int = 100, width: int = 2048, depth: int = 4):
+        self._top = TopK(capacity, width, depth)
+
+    def record(self, request: TirePressureRequest):
+        self._top.add(config_key(request))
+
+    def top(self, limit: int = 0) -> dict:
+        """Top configurations with estimated counts; the format warm-up reads."""
+        configurations: List[dict] = [
+            {"count": count, **config_from_key(key)} for key, count in self._top.top(limit)
+        ]
+        return {"total": self._top.total, "configurations": configurations}
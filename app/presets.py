@@ -0,0 +1,55 @@
+from typing import Iterator, List
+
+from .schemas import Bike, SurfaceEnum, TirePressureRequest, Weight, WeightUnitEnum
+
+
+def _bike(name, discipline, width, unit, casing, rim_width, rim_type, diameter, weight_kg) -> dict:
+    tire = {"width": width, "casing": casing, "unit": unit}
+    wheel = {"rim_width": rim_width, "rim_type": rim_type, "diameter": diameter}
+    return {
+        "name": name,
+        "discipline": discipline,
+        "front_tire": {**tire, "position": "FRONT"},
+        "front_wheel": {**wheel, "position": "FRONT"},
+        "rear_tire": {**tire, "position": "REAR"},
+        "rear_wheel": {**wheel, "position": "REAR"},
+        "weight": {"value": weight_kg, "unit": "kg"},
+    }
+
+
+# Most common bike setups, used to warm the caches after a restart
+POPULAR_PRESETS = [
+    _bike("Road 25mm", "ROAD", 25, "MM", "STANDARD", 19, "HOOKED", "700C", 7.5),
+    _bike("Road 28mm", "ROAD", 28, "MM", "STANDARD", 23, "HOOKLESS", "700C", 6.8),
+    _bike("Road 28mm tubes", "ROAD", 28, "MM", "STANDARD", 21, "TUBES", "700C", 8.0),
+    _bike("Road 30mm", "ROAD", 30, "MM", "THIN", 25, "HOOKLESS", "700C", 7.5),
+    _bike("Road 32mm", "ROAD", 32, "MM", "STANDARD", 25, "HOOKLESS", "700C", 8.5),
+    _bike("Cyclocross tubular", "CYCLOCROSS", 33, "MM", "THIN", 21, "TUBULAR", "700C", 7.8),
+    _bike("Cyclocross tubeless", "CYCLOCROSS", 33, "MM", "STANDARD", 23, "HOOKLESS", "700C", 8.2),
+    _bike("Gravel 40mm", "GRAVEL", 40, "MM", "STANDARD", 25, "HOOKLESS", "700C", 9.0),
+    _bike("Gravel 45mm", "GRAVEL", 45, "MM", "REINFORCED", 25, "HOOKLESS", "700C", 9.5),
+    _bike("Gravel 650B", "GRAVEL", 47, "MM", "STANDARD", 25, "HOOKED", "650B", 9.8),
+    _bike("XC 2.3in", "MTB_XC", 2.3, "IN", "STANDARD", 30, "HOOKLESS", "29", 10.9),
+    _bike("XC 2.4in", "MTB_XC", 2.4, "IN", "STANDARD", 30, "HOOKED", "29", 11.5),
+    _bike("Trail 2.4in", "MTB_TRAIL", 2.4, "IN", "REINFORCED", 30, "HOOKED", "29", 14.0),
+    _bike("Enduro 2.5in", "MTB_ENDURO", 2.5, "IN", "REINFORCED", 30, "HOOKED", "29", 15.5),
+    _bike("Enduro 27.5", "MTB_ENDURO", 2.5, "IN", "DOWNHILL_CASING", 30, "HOOKED", "27.5", 16.0),
+    _bike("Downhill 2.5in", "MTB_DOWNHILL", 2.5, "IN", "DOWNHILL_CASING", 30, "HOOKED", "27.5", 17.5),
+    _bike("Fatbike 4.0in", "FATBIKE", 4.0, "IN", "STANDARD", 80, "TUBES", "26", 14.5),
+]
+
+# Whole-kilogram rider weights covering most riders
+PRESET_RIDER_WEIGHTS_KG = range(50, 111)
+
+
+def preset_requests() -> Iterator[TirePressureRequest]:
+    """Every popular preset on every surface for common rider weights."""
+    bikes: List[Bike] = [Bike.model_validate(preset) for preset in POPULAR_PRESETS]
+    for bike in bikes:
+        for surface in SurfaceEnum:
+            for rider_kg in PRESET_RIDER_WEIGHTS_KG:
+                yield TirePressureRequest(
+                    bike=bike,
+                    rider_weight=Weight(value=rider_kg, unit=WeightUnitEnum.KG),
+                    surface=surface,
+                )
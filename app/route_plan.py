@@ -0,0 +1,43 @@
+from typing import Dict
+
+from .schemas import PressureUnitEnum, RoutePlanRequest, RoutePlanResponse, TirePressure
+from .services import build_calculator
+
+
+def plan_route(payload: RoutePlanRequest) -> RoutePlanResponse:
+    """Pressures for every segment of a route, plus one compromise setting.
+
+    Only the surface factor differs between segments, so the formula runs
+    once per distinct surface (at most four times) with the geometry term
+    shared, and segments reuse those results. The compromise is the
+    distance-weighted mean of the unrounded per-surface pressures.
+    """
+    distance_by_surface: Dict[str, float] = {}
+    for segment in payload.segments:
+        distance_by_surface[segment.surface] = (
+            distance_by_surface.get(segment.surface, 0.0) + segment.distance_km
+        )
+
+    calculator = build_calculator(payload.bike, payload.segments[0].surface, payload.rider_weight)
+    raw = {}
+    for surface in distance_by_surface:
+        calculator.surface = surface
+        raw[surface] = calculator.calculate_unrounded()
+
+    results = {
+        surface: TirePressure(
+            front_wheel=round(front, 1), rear_wheel=round(rear, 1), unit=PressureUnitEnum.PSI
+        )
+        for surface, (front, rear) in raw.items()
+    }
+
+    total = sum(distance_by_surface.values())
+    front = sum(raw[s][0] * d for s, d in distance_by_surface.items()) / total
+    rear = sum(raw[s][1] * d for s, d in distance_by_surface.items()) / total
+    return RoutePlanResponse(
+        segments=[results[segment.surface] for segment in payload.segments],
+        compromise=TirePressure(
+            front_wheel=round(front, 1), rear_wheel=round(rear, 1), unit=PressureUnitEnum.PSI
+        ),
+        total_distance_km=round(total, 3),
+    )
@@ -0,0 +1,45 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from ..core.memory import memory_profiler, rss_bytes, worker_rss
+
+
+def require_admin(request: Request):
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), request.app.state.admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/memory")
+def memory(limit: int = 20):
+    """RSS of this worker and its siblings, plus the top allocation sites when tracing."""
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": rss_bytes(),
+        "workers": worker_rss(),
+        "tracemalloc": memory_profiler.summary(),
+        "top": memory_profiler.top(limit),
+    }
+
+
+@router.get("/memory/diff")
+def memory_diff(limit: int = 20):
+    """Allocation growth per site since the previous call."""
+    return {"tracemalloc": memory_profiler.summary(), "diff": memory_profiler.diff(limit)}
+
+
+@router.post("/memory/tracing")
+def start_tracing(frames: int = 1):
+    memory_profiler.start(frames)
+    return memory_profiler.summary()
+
+
+@router.delete("/memory/tracing")
+def stop_tracing():
+    memory_profiler.stop()
+    return memory_profiler.summary()
@@ -0,0 +1,139 @@
+import json
+
+from fastapi import APIRouter, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+
+from ..columnar import (
+    ColumnError,
+    calculate_columns,
+    pressure_columns,
+    request_columns,
+    validate_columns,
+)
+from ..core.binary import MEDIA_TYPE, binary_response, wants_binary
+from ..core.execution import VECTOR_OVERHEAD, execution_for
+from ..core.http import json_response, parse_body, request_body
+from ..core.tracing import span
+from ..schemas import (
+    BatchRequest,
+    BatchResponse,
+    ColumnarBatchRequest,
+    ColumnarBatchResponse,
+    PressureUnitEnum,
+    TirePressure,
+)
+from ..services import build_and_compute
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# Both batch endpoints can answer with the binary column format instead of JSON
+BINARY_RESPONSE = {
+    200: {
+        "content": {MEDIA_TYPE: {}},
+        "description": "front_wheel and rear_wheel columns when requested via Accept",
+    }
+}
+
+
+def _compute_items(payload: BatchRequest) -> BatchResponse:
+    return BatchResponse(
+        items=[
+            build_and_compute(item.bike, item.surface, item.rider_weight)
+            for item in payload.items
+        ]
+    )
+
+
+async def _compute_items_in_processes(request: Request, payload: BatchRequest) -> BatchResponse:
+    # Unrounded columns come back so rounding matches the scalar calculator exactly
+    columns = await run_in_threadpool(request_columns, payload.items)
+    front, rear = await execution_for(request).run_in_processes(
+        "batch", pressure_columns, columns, request
+    )
+    return BatchResponse(
+        items=[
+            TirePressure(front_wheel=round(f, 1), rear_wheel=round(r, 1), unit=PressureUnitEnum.PSI)
+            for f, r in zip(front.tolist(), rear.tolist())
+        ]
+    )
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    responses=BINARY_RESPONSE,
+    openapi_extra=request_body(BatchRequest),
+)
+async def compute_batch(request: Request):
+    """Compute many nested ``TirePressureRequest`` items in one call."""
+    payload = await parse_body(request, BatchRequest)
+    strategy = execution_for(request)
+    if strategy.uses_processes(len(payload.items)):
+        result = await _compute_items_in_processes(request, payload)
+    else:
+        result = await strategy.run("batch", len(payload.items), _compute_items, payload)
+    if wants_binary(request):
+        import numpy as np
+
+        with span("encode"):
+            return binary_response(
+                {
+                    "front_wheel": np.fromiter((i.front_wheel for i in result.items), float),
+                    "rear_wheel": np.fromiter((i.rear_wheel for i in result.items), float),
+                }
+            )
+    response = json_response(result)
+    response.headers["Vary"] = "Accept"
+    return response
+
+
+def _rows(payload: ColumnarBatchRequest) -> int:
+    return max((len(value) for value in vars(payload).values() if isinstance(value, list)), default=1)
+
+
+def _compute_columns(payload: ColumnarBatchRequest):
+    with span("validate_columns"):
+        columns = validate_columns(payload)
+    with span("calculate_columns"):
+        return calculate_columns(columns)
+
+
+@router.post(
+    "/columnar",
+    response_model=ColumnarBatchResponse,
+    responses=BINARY_RESPONSE,
+    openapi_extra=request_body(ColumnarBatchRequest),
+)
+async def compute_columnar(request: Request):
+    """Compute a struct-of-arrays batch without building per-row models.
+
+    Each field is a column with one entry per row, or a single value used
+    for every row. Errors point at ``(column, row)``.
+    """
+    payload = await parse_body(request, ColumnarBatchRequest)
+    try:
+        # Vectorized: about 20 rows cost as much as one scalar calculation
+        cost = VECTOR_OVERHEAD + _rows(payload) / 20
+        strategy = execution_for(request)
+        if strategy.uses_processes(cost):
+            columns = await run_in_threadpool(validate_columns, payload)
+            front, rear = await strategy.run_in_processes(
+                "batch_columnar", calculate_columns, columns, request
+            )
+        else:
+            front, rear = await strategy.run("batch_columnar", cost, _compute_columns, payload)
+    except ColumnError as exc:
+        raise RequestValidationError(exc.errors)
+    with span("encode"):
+        if wants_binary(request):
+            return binary_response({"front_wheel": front, "rear_wheel": rear})
+        body = json.dumps(
+            {
+                "front_wheel": front.tolist(),
+                "rear_wheel": rear.tolist(),
+                "unit": PressureUnitEnum.PSI.value,
+            },
+            separators=(",", ":"),
+        )
+        return Response(body, media_type="application/json", headers={"Vary": "Accept"})
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Request
+
+from ..core.execution import VECTOR_OVERHEAD, execution_for
+from ..core.http import json_response, parse_body, request_body
+from ..core.tracing import span
+from ..fleet import fleet_matrix
+from ..schemas import FleetRequest, FleetResponse
+
+router = APIRouter(tags=["fleet"])
+
+
+def _matrix(payload: FleetRequest) -> FleetResponse:
+    with span("fleet.matrix"):
+        return fleet_matrix(payload)
+
+
+@router.post(
+    "/fleet",
+    response_model=FleetResponse,
+    openapi_extra=request_body(FleetRequest),
+)
+async def compute_fleet(request: Request):
+    """Pressures for every rider on every bike on every surface, in one call."""
+    payload = await parse_body(request, FleetRequest)
+    cells = len(payload.riders) * len(payload.bikes) * len(payload.surfaces)
+    cost = VECTOR_OVERHEAD + len(payload.bikes) + cells / 20
+    return json_response(await execution_for(request).run("fleet", cost, _matrix, payload))
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+
+from ..jobs import JobRunner, JobStatus
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+
+def _runner(request: Request) -> JobRunner:
+    return request.app.state.job_runner
+
+
+def _job_or_404(runner: JobRunner, job_id: str) -> dict:
+    job = runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _describe(job: dict) -> dict:
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "total": job["total"],
+        "processed": job["processed"],
+        "failed": job["failed"],
+        "progress": round(job["processed"] / job["total"], 4) if job["total"] else 1.0,
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "error": job["error"],
+    }
+
+
+def _items_lines(body: bytes) -> Optional[Tuple[bytes, int]]:
+    """The items of a ``{"items": [...]}`` body as JSON Lines and their count, or ``None``."""
+    try:
+        items = json.loads(body)["items"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(items, list):
+        return None
+    return b"".join(json.dumps(item, separators=(",", ":")).encode() + b"\n" for item in items), len(items)
+
+
+async def _write_ndjson(request: Request, path: str) -> int:
+    """Stream a JSON Lines body to ``path``; returns the number of non-blank lines."""
+    total = 0
+    tail = b""
+    async with await anyio.open_file(path, "wb") as fh:
+        async for chunk in request.stream():
+            data = tail + chunk
+            lines = data.split(b"\n")
+            tail = lines.pop()
+            total += sum(1 for line in lines if line.strip())
+            await fh.write(data[: len(data) - len(tail)])
+        if tail.strip():
+            total += 1
+            await fh.write(tail + b"\n")
+    return total
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as fh:
+        fh.write(data)
+
+
+@router.post("", status_code=202)
+async def submit_job(request: Request):
+    """Submit a batch of ``TirePressureRequest`` items.
+
+    Send either a JSON object ``{"items": [...]}`` or a JSON Lines file
+    (``Content-Type: application/x-ndjson``) with one request per line.
+    Rows are validated when the job runs; invalid rows are reported in the
+    results instead of failing the whole job.
+    """
+    runner = _runner(request)
+    job_id = runner.new_job_id()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    path = runner.input_path(job_id)
+
+    # File writes and JSON work run off the event loop
+    if content_type in NDJSON_TYPES:
+        try:
+            # Appended in small pieces straight from the request stream
+            total = await _write_ndjson(request, path)
+        except BaseException:
+            # No job was created; drop the partial input
+            await run_in_threadpool(_remove, path)
+            raise
+    else:
+        parsed = await run_in_threadpool(_items_lines, await request.body())
+        if parsed is None:
+            raise HTTPException(
+                status_code=422, detail='Expected {"items": [...]} or a JSON Lines body'
+            )
+        lines, total = parsed
+        await run_in_threadpool(_write_file, path, lines)
+
+    # SQLite calls wait on the store lock, which job workers hold while checkpointing
+    job = await run_in_threadpool(runner.submit, job_id, total)
+    return JSONResponse(
+        _describe(job), status_code=202, headers={"Location": f"/jobs/{job_id}"}
+    )
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, request: Request):
+    return _describe(_job_or_404(_runner(request), job_id))
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, request: Request, interval: float = 0.5):
+    """Server-Sent Events stream of progress updates until the job finishes."""
+    runner = _runner(request)
+    await run_in_threadpool(_job_or_404, runner, job_id)
+
+    async def events():
+        last = None
+        while True:
+            job = _describe(await run_in_threadpool(runner.store.get, job_id))
+            if job != last:
+                yield f"event: progress\ndata: {json.dumps(job)}\n\n"
+                last = job
+            if job["status"] in JobStatus.FINISHED or await request.is_disconnected():
+                return
+            await asyncio.sleep(max(interval, 0.1))
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/{job_id}/results")
+def job_results(job_id: str, request: Request):
+    """Download results as JSON Lines, one ``{"row": n, ...}`` record per input row."""
+    runner = _runner(request)
+    job = _job_or_404(runner, job_id)
+    if job["status"] != JobStatus.DONE:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return FileResponse(
+        runner.output_path(job_id),
+        media_type="application/x-ndjson",
+        filename=f"{job_id}.jsonl",
+    )
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str, request: Request):
+    runner = _runner(request)
+    _job_or_404(runner, job_id)
+    runner.cancel(job_id)
+    return _describe(runner.store.get(job_id))
@@ -0,0 +1,28 @@
+import json
+
+from fastapi import APIRouter, Request, Response
+
+from ..services import coefficients_version, model_bundle
+
+router = APIRouter(tags=["model"])
+
+# The coefficients cannot change while the process runs, so the bundle is
+# encoded once; its version doubles as the ETag.
+_VERSION = coefficients_version()
+_ETAG = f'"{_VERSION}"'
+_BODY = json.dumps({"version": _VERSION, **model_bundle()}, separators=(",", ":")).encode()
+# Clients keep the bundle but revalidate it before use
+_HEADERS = {"ETag": _ETAG, "Cache-Control": "no-cache"}
+
+
+def _matches(if_none_match: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or _ETAG in tags or f"W/{_ETAG}" in tags
+
+
+@router.get("/model")
+def get_model(request: Request):
+    """Coefficients for computing pressures on the client; see ``model_bundle``."""
+    if _matches(request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=_HEADERS)
+    return Response(_BODY, media_type="application/json", headers=_HEADERS)
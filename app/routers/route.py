@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Request
+
+from ..core.execution import execution_for
+from ..core.http import json_response, parse_body, request_body
+from ..core.tracing import span
+from ..route_plan import plan_route
+from ..schemas import RoutePlanRequest, RoutePlanResponse, SurfaceEnum
+
+router = APIRouter(tags=["route"])
+
+
+def _plan(payload: RoutePlanRequest) -> RoutePlanResponse:
+    with span("route.plan"):
+        return plan_route(payload)
+
+
+@router.post(
+    "/route",
+    response_model=RoutePlanResponse,
+    openapi_extra=request_body(RoutePlanRequest),
+)
+async def compute_route(request: Request):
+    """Per-segment pressures and a compromise setting for a mixed-surface route."""
+    payload = await parse_body(request, RoutePlanRequest)
+    # At most one calculation per surface, plus a pass over the segments
+    cost = len(SurfaceEnum) + len(payload.segments) / 10
+    return json_response(await execution_for(request).run("route", cost, _plan, payload))
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+
+from ..core.execution import VECTOR_OVERHEAD, execution_for
+from ..core.http import json_response, parse_body, request_body
+from ..core.tracing import span
+from ..schemas import UncertaintyRequest, UncertaintyResponse
+from ..uncertainty import uncertainty_bands
+
+router = APIRouter(tags=["uncertainty"])
+
+
+def _bands(payload: UncertaintyRequest) -> UncertaintyResponse:
+    with span("uncertainty.sample"):
+        return uncertainty_bands(payload)
+
+
+@router.post(
+    "/uncertainty",
+    response_model=UncertaintyResponse,
+    openapi_extra=request_body(UncertaintyRequest),
+)
+async def compute_uncertainty(request: Request):
+    """A ``/compute`` request plus percentile bands from sampled input noise.
+
+    The optional ``uncertainty`` object sets the sample count, seed, noise
+    levels and percentiles; the same seed always gives the same bands.
+    """
+    payload = await parse_body(request, UncertaintyRequest)
+    cost = VECTOR_OVERHEAD + payload.uncertainty.samples / 20
+    return json_response(await execution_for(request).run("uncertainty", cost, _bands, payload))
@@ -1,67 +1,17 @@
-from pydantic import BaseModel
-from enum import StrEnum
-
-
-class PressureUnitEnum(StrEnum):
-    BAR = "BAR"
-    PSI = "PSI"
-
-
-class WidthUnitEnum(StrEnum):
-    IN = "IN"
-    MM = "MM"
-
-
-class WeightUnitEnum(StrEnum):
-    LBS = ("lbs",)
-    KG = "kg"
-
-
-class DisciplineEnum(StrEnum):
-    ROAD = "ROAD"
-    CYCLOCROSS = "CYCLOCROSS"
-    GRAVEL = "GRAVEL"
-    MTB_XC = "MTB_XC"
-    MTB_TRAIL = "MTB_TRAIL"
-    MTB_ENDURO = "MTB_ENDURO"
-    MTB_DOWNHILL = "MTB_DOWNHILL"
-    FATBIKE = "FATBIKE"
-
-
-class PositionEnum(StrEnum):
-    FRONT = "FRONT"
-    REAR = "REAR"
-
-
-class SurfaceEnum(StrEnum):
-    DRY = "DRY"
-    WET = "WET"
-    MIXED = "MIXED"
-    SNOW = "SNOW"
-
-
-class CasingEnum(StrEnum):
-    THIN = "THIN"
-    STANDARD = "STANDARD"
-    REINFORCED = "REINFORCED"
-    DOWNHILL_CASING = "DOWNHILL_CASING"
-
-
-class DiameterEnum(StrEnum):
-    D_650C = "650C"
-    D_650B = "650B"
-    D_700C = "700C"
-    D_26 = "26"
-    D_27_5 = "27.5"
-    D_29 = "29"
-
-
-class RimTypeEnum(StrEnum):
-    TUBES = "TUBES"
-    TUBULAR = "TUBULAR"
-    HOOKED = "HOOKED"
-    HOOKS = "HOOKS"
-    HOOKLESS = "HOOKLESS"
+from pydantic import BaseModel, ConfigDict, Field, WithJsonSchema, field_validator, model_validator
+from typing import Annotated, Any, Dict, List, Union
+
+from .enums import (
+    PressureUnitEnum,
+    WidthUnitEnum,
+    WeightUnitEnum,
+    DisciplineEnum,
+    PositionEnum,
+    SurfaceEnum,
+    CasingEnum,
+    DiameterEnum,
+    RimTypeEnum,
+)
 
 
 # --- Component Models ---
@@ -125,3 +75,202 @@ class TirePressureRequest(BaseModel):
     bike: Bike
     rider_weight: Weight
     surface: SurfaceEnum
+
+
+# --- Batch Models ---
+
+
+class BatchRequest(BaseModel):
+    items: List[TirePressureRequest]
+
+
+class BatchResponse(BaseModel):
+    items: List[TirePressure]
+
+
+# A column is either one value per row or a single value for every row. Cells
+# are checked by ``columnar.validate_columns``, so a bad cell is reported once
+# at (column, row) instead of once per branch of a union.
+FloatColumn = Annotated[
+    Union[List[Any], Any],
+    WithJsonSchema({"anyOf": [{"type": "array", "items": {"type": "number"}}, {"type": "number"}]}),
+]
+CodeColumn = Annotated[
+    Union[List[Any], Any],
+    WithJsonSchema({"anyOf": [{"type": "array", "items": {"type": "string"}}, {"type": "string"}]}),
+]
+
+
+class ColumnarBatchRequest(BaseModel):
+    """Struct-of-arrays batch input: one column per formula input.
+
+    Weights are in kilograms and tire widths in ``tire_width_unit``.
+    Enum columns take the same codes as the nested models.
+    """
+
+    discipline: CodeColumn
+    surface: CodeColumn
+    rider_weight_kg: FloatColumn
+    bike_weight_kg: FloatColumn
+    tire_width_unit: CodeColumn = WidthUnitEnum.MM.value
+    front_tire_width: FloatColumn
+    rear_tire_width: FloatColumn
+    front_casing: CodeColumn
+    rear_casing: CodeColumn
+    front_rim_width: FloatColumn
+    rear_rim_width: FloatColumn
+    front_rim_type: CodeColumn
+    rear_rim_type: CodeColumn
+    front_diameter: CodeColumn
+    rear_diameter: CodeColumn
+
+
+class ColumnarBatchResponse(BaseModel):
+    front_wheel: List[float]
+    rear_wheel: List[float]
+    unit: PressureUnitEnum
+
+
+# --- Uncertainty Models ---
+
+
+class UncertaintySpec(BaseModel):
+    """Input noise to sample; standard deviations are in the inputs' own units."""
+
+    samples: int = Field(10_000, ge=100, le=100_000)
+    seed: int = 0
+    # Bathroom-scale error on the rider weight
+    rider_weight_sd: float = Field(1.0, ge=0)
+    # Actual vs nominal tire width, in mm
+    tire_width_sd_mm: float = Field(1.0, ge=0)
+    # Inner rim width manufacturing tolerance, in mm
+    rim_width_sd_mm: float = Field(0.25, ge=0)
+    percentiles: List[Annotated[float, Field(ge=0, le=100)]] = Field([5.0, 25.0, 50.0, 75.0, 95.0], min_length=1)
+
+
+class UncertaintyRequest(TirePressureRequest):
+    uncertainty: UncertaintySpec = UncertaintySpec()
+
+
+class UncertaintyResponse(BaseModel):
+    nominal: TirePressure
+    # Percentile ("p5", "p50", ...) to pressure
+    front_wheel: Dict[str, float]
+    rear_wheel: Dict[str, float]
+    unit: PressureUnitEnum
+    samples: int
+    seed: int
+
+
+# --- Route Plan Models ---
+
+
+class RouteSegment(BaseModel):
+    surface: SurfaceEnum
+    distance_km: float = Field(gt=0)
+
+
+class RoutePlanRequest(BaseModel):
+    bike: Bike
+    rider_weight: Weight
+    # Segments in riding order
+    segments: List[RouteSegment] = Field(min_length=1, max_length=100_000)
+
+
+class RoutePlanResponse(BaseModel):
+    # One result per request segment, in the same order
+    segments: List[TirePressure]
+    # Distance-weighted setting for riding the whole route on one pressure
+    compromise: TirePressure
+    total_distance_km: float
+
+
+# --- Fleet Models ---
+
+
+class FleetRider(BaseModel):
+    name: str
+    weight: Weight
+
+
+class FleetRequest(BaseModel):
+    riders: List[FleetRider] = Field(min_length=1, max_length=200)
+    bikes: List[Bike] = Field(min_length=1, max_length=200)
+    surfaces: List[SurfaceEnum] = Field(
+        default_factory=lambda: list(SurfaceEnum), min_length=1, max_length=len(SurfaceEnum)
+    )
+
+    @field_validator("surfaces")
+    @classmethod
+    def _distinct_surfaces(cls, surfaces: List[SurfaceEnum]) -> List[SurfaceEnum]:
+        # A repeated surface would only repeat a slice of the matrix
+        return list(dict.fromkeys(surfaces))
+
+
+class FleetResponse(BaseModel):
+    riders: List[str]
+    bikes: List[str]
+    surfaces: List[SurfaceEnum]
+    # Indexed [rider][bike][surface], in request order
+    front_wheel: List[List[List[float]]]
+    rear_wheel: List[List[List[float]]]
+    unit: PressureUnitEnum
+    # Distinct bike setups actually computed
+    unique_bikes: int
+
+
+# --- Flat (v2) Models ---
+
+
+class TirePressureRequestV2(BaseModel):
+    """Flat ``/v2/compute`` request holding only the inputs the formula reads.
+
+    Weights are in kilograms. Tire widths are given in ``tire_width_unit``
+    and stored in millimeters once parsed, with the unit set to ``MM``, so a
+    dumped request validates back to the same request. Instances are
+    frozen, and so hashable.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    discipline: DisciplineEnum
+    surface: SurfaceEnum
+    rider_weight_kg: float
+    bike_weight_kg: float
+    tire_width_unit: WidthUnitEnum = WidthUnitEnum.MM
+    front_tire_width: float
+    rear_tire_width: float
+    front_casing: CasingEnum
+    rear_casing: CasingEnum
+    front_rim_width: float
+    rear_rim_width: float
+    front_rim_type: RimTypeEnum
+    rear_rim_type: RimTypeEnum
+    front_diameter: DiameterEnum
+    rear_diameter: DiameterEnum
+
+    @model_validator(mode="before")
+    @classmethod
+    def _widths_in_mm(cls, data):
+        if not isinstance(data, dict) or data.get("tire_width_unit") not in ("IN", WidthUnitEnum.IN):
+            return data
+        data = {**data, "tire_width_unit": WidthUnitEnum.MM}
+        for name in ("front_tire_width", "rear_tire_width"):
+            width = data.get(name)
+            if isinstance(width, bool):
+                continue
+            try:
+                data[name] = float(width) * 25.4
+            except (TypeError, ValueError):
+                # Left as given for the field's own validation error
+                pass
+        return data
+
+
+class TirePressureV2(BaseModel):
+    """Front and rear pressures in PSI."""
+
+    model_config = ConfigDict(frozen=True)
+
+    front_psi: float
+    rear_psi: float
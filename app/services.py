@@ -1,18 +1,35 @@
+from __future__ import annotations
+
+import json
 import math
-from .schemas import (
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from .core.runtime import gil_enabled
+from .core.tracing import span
+from .enums import (
     PressureUnitEnum,
     DisciplineEnum,
     SurfaceEnum,
     CasingEnum,
     RimTypeEnum,
     DiameterEnum,
-    Tire,
-    Weight,
-    Wheel,
-    TirePressure,
-    Bike,
 )
 
+# The pydantic models are only needed for annotations and for the result of
+# ``calculate``; importing them lazily keeps ``app.calc`` free of pydantic.
+if TYPE_CHECKING:
+    from .schemas import (
+        Bike,
+        Tire,
+        TirePressure,
+        TirePressureRequestV2,
+        TirePressureV2,
+        Weight,
+        Wheel,
+    )
+
 
 class PressureCalculator:
     # Ride style fudge factors
@@ -91,6 +108,18 @@ class PressureCalculator:
         DiameterEnum.D_29: 622,
     }
 
+    # Regression model: base = 10**BASE_LOG10 * c**BASE_EXPONENT
+    BASE_LOG10 = 8.684670773
+    BASE_EXPONENT = -1.304556655
+
+    # Share of the rim/tire width mismatch added to the effective tire width
+    RIM_WIDTH_ADJUSTMENT = 0.4
+
+    # weight_factor = 1 + (WEIGHT_LBS_PER_KG * kg - WEIGHT_REFERENCE_LBS) * WEIGHT_SLOPE
+    WEIGHT_LBS_PER_KG = 2.2
+    WEIGHT_REFERENCE_LBS = 180.0
+    WEIGHT_SLOPE = 0.0025
+
     def __init__(self):
         self.front_tire = None
         self.rear_tire = None
@@ -102,13 +131,34 @@ class PressureCalculator:
         self.discipline = None
         self.surface = None
 
-    def _rim_width_lookup(self, tire_width: float) -> float:
+    @classmethod
+    def _rim_width_lookup(cls, tire_width: float) -> float:
         """Get the compatible rim width based on tire width."""
-        for entry in self.RIM_WIDTH_TABLE:
+        for entry in cls.RIM_WIDTH_TABLE:
             if entry["min"] <= tire_width < entry["max"]:
                 return float(entry["compatible"])
         return 21.0  # Default fallback
 
+    @classmethod
+    def _geometry_base(
+        cls, tire_width_mm: float, inner_rim_width_mm: float, wheel_diameter: float
+    ) -> float:
+        """Base pressure from the regression model for a tire/rim/wheel geometry."""
+
+        # 2. Calculate effective tire width
+        compatible_rim_width = cls._rim_width_lookup(tire_width_mm)
+        effective_width = tire_width_mm + cls.RIM_WIDTH_ADJUSTMENT * (
+            inner_rim_width_mm - compatible_rim_width
+        )
+
+        # 3. Calculate geometric constant (proportional to tire volume)
+        outer_radius = wheel_diameter / 2.0 + effective_width / 2.0
+        inner_radius = effective_width / 2.0
+        c = 4.0 * math.pi**2 * outer_radius * inner_radius
+
+        # 4. Base pressure from regression model
+        return (10**cls.BASE_LOG10) * (c**cls.BASE_EXPONENT)
+
     def _calculate_recommended_pressure(
         self,
         rider_weight_kg: float,
@@ -139,23 +189,14 @@ class PressureCalculator:
         else:
             rim_factor = self.RIM_TYPE_FACTORS.get(rim_type, 1.0)
 
-        # 2. Calculate effective tire width
-        compatible_rim_width = self._rim_width_lookup(tire_width_mm)
-        effective_width = tire_width_mm + 0.4 * (
-            inner_rim_width_mm - compatible_rim_width
-        )
-
-        # 3. Calculate geometric constant (proportional to tire volume)
-        outer_radius = wheel_diameter / 2.0 + effective_width / 2.0
-        inner_radius = effective_width / 2.0
-        c = 4.0 * math.pi**2 * outer_radius * inner_radius
-
-        # 4. Base pressure from regression model
-        base = (10**8.684670773) * (c**-1.304556655)
+        # 2-4. Base pressure from tire/rim geometry (cached per geometry)
+        base = geometry_base(tire_width_mm, inner_rim_width_mm, wheel_diameter)
 
         # 5. Calculate weight factor
         weight_sum = bike_weight_kg + rider_weight_kg
-        weight_factor = 1.0 + (2.2 * weight_sum - 180.0) * 0.0025
+        weight_factor = 1.0 + (
+            self.WEIGHT_LBS_PER_KG * weight_sum - self.WEIGHT_REFERENCE_LBS
+        ) * self.WEIGHT_SLOPE
 
         # 6. Combine everything
         pressure = base * weight_factor * wheel_factor
@@ -168,6 +209,17 @@ class PressureCalculator:
 
     def calculate(self) -> TirePressure:
         """Calculate front and rear tire pressures."""
+        from .schemas import TirePressure
+
+        front_pressure, rear_pressure = self.calculate_unrounded()
+        return TirePressure(
+            front_wheel=round(front_pressure, 1),
+            rear_wheel=round(rear_pressure, 1),
+            unit=PressureUnitEnum.PSI,
+        )
+
+    def calculate_unrounded(self) -> tuple:
+        """Front and rear pressures in PSI, before rounding."""
 
         front_casing = self.front_tire.casing
         rear_casing = self.rear_tire.casing
@@ -186,38 +238,153 @@ class PressureCalculator:
         rear_diameter_mm = self.WHEEL_DIAMETER_MAP.get(self.rear_wheel.diameter, 622)
 
         # Calculate front pressure
-        front_pressure = self._calculate_recommended_pressure(
-            rider_weight_kg=self.rider_weight,
-            bike_weight_kg=self.bike_weight,
-            discipline=self.discipline,
-            rim_type=front_rim_type,
-            surface=self.surface,
-            tire_width_mm=front_width_mm,
-            inner_rim_width_mm=front_rim_width,
-            tire_casing=front_casing,
-            wheel_position="FRONT",
-            wheel_diameter=front_diameter_mm,
-        )
+        with span("calculate.front"):
+            front_pressure = self._calculate_recommended_pressure(
+                rider_weight_kg=self.rider_weight,
+                bike_weight_kg=self.bike_weight,
+                discipline=self.discipline,
+                rim_type=front_rim_type,
+                surface=self.surface,
+                tire_width_mm=front_width_mm,
+                inner_rim_width_mm=front_rim_width,
+                tire_casing=front_casing,
+                wheel_position="FRONT",
+                wheel_diameter=front_diameter_mm,
+            )
 
         # Calculate rear pressure
-        rear_pressure = self._calculate_recommended_pressure(
-            rider_weight_kg=self.rider_weight,
-            bike_weight_kg=self.bike_weight,
-            discipline=self.discipline,
-            rim_type=rear_rim_type,
-            surface=self.surface,
-            tire_width_mm=rear_width_mm,
-            inner_rim_width_mm=rear_rim_width,
-            tire_casing=rear_casing,
-            wheel_position="REAR",
-            wheel_diameter=rear_diameter_mm,
-        )
+        with span("calculate.rear"):
+            rear_pressure = self._calculate_recommended_pressure(
+                rider_weight_kg=self.rider_weight,
+                bike_weight_kg=self.bike_weight,
+                discipline=self.discipline,
+                rim_type=rear_rim_type,
+                surface=self.surface,
+                tire_width_mm=rear_width_mm,
+                inner_rim_width_mm=rear_rim_width,
+                tire_casing=rear_casing,
+                wheel_position="REAR",
+                wheel_diameter=rear_diameter_mm,
+            )
+
+        return front_pressure, rear_pressure
+
+
+def model_bundle() -> dict:
+    """Every coefficient and constant the formula uses, in plain JSON types.
+
+    Enough for a client to reproduce ``PressureCalculator.calculate`` without
+    calling the API; tables are keyed by enum value. Rim width ranges are
+    ``[min, max, compatible]`` with ``min <= tire width < max``; widths outside
+    every range use ``defaults.compatible_rim_width``.
+    """
+    calc = PressureCalculator
+    return {
+        "discipline": dict(calc.DISCIPLINE_FACTORS),
+        "wheel_position": dict(calc.WHEEL_POSITION_FACTORS),
+        "rim_type": dict(calc.RIM_TYPE_FACTORS),
+        "rim_type_cx": dict(calc.RIM_TYPE_CX_FACTORS),
+        "casing": dict(calc.CASING_FACTORS),
+        "surface": dict(calc.SURFACE_FACTORS),
+        "rim_width_table": [
+            [entry["min"], entry["max"], entry["compatible"]] for entry in calc.RIM_WIDTH_TABLE
+        ],
+        "wheel_diameter_mm": dict(calc.WHEEL_DIAMETER_MAP),
+        "regression": {
+            "base_log10": calc.BASE_LOG10,
+            "base_exponent": calc.BASE_EXPONENT,
+            "rim_width_adjustment": calc.RIM_WIDTH_ADJUSTMENT,
+            "weight_lbs_per_kg": calc.WEIGHT_LBS_PER_KG,
+            "weight_reference_lbs": calc.WEIGHT_REFERENCE_LBS,
+            "weight_slope": calc.WEIGHT_SLOPE,
+        },
+        "defaults": {
+            "factor": 1.0,
+            "compatible_rim_width": 21.0,
+            "wheel_diameter_mm": 622,
+        },
+        "mm_per_inch": 25.4,
+        "decimals": 1,
+    }
 
-        return TirePressure(
-            front_wheel=round(front_pressure, 1),
-            rear_wheel=round(rear_pressure, 1),
-            unit=PressureUnitEnum.PSI,
-        )
+
+def coefficients_version() -> str:
+    """Short fingerprint of every coefficient the formula uses.
+
+    Changes whenever a factor table or regression constant changes, so caches
+    shared across processes or releases can reject stale entries.
+    """
+    import hashlib
+
+    encoded = json.dumps(model_bundle(), sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+# Same fields as ``lru_cache``'s cache_info()
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class GeometryCache:
+    """Bounded memo of ``PressureCalculator._geometry_base`` for free-threaded builds.
+
+    ``functools.lru_cache`` serializes every call on its own lock when there
+    is no GIL. Here a hit is a plain dict lookup; only misses take the lock,
+    and a full cache evicts its oldest entry (insertion order, not recency).
+    Hit counts are approximate without the GIL.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(
+        self, tire_width_mm: float, inner_rim_width_mm: float, wheel_diameter: float
+    ) -> float:
+        key = (tire_width_mm, inner_rim_width_mm, wheel_diameter)
+        value = self._data.get(key)
+        if value is not None:
+            self._hits += 1
+            return value
+        value = PressureCalculator._geometry_base(*key)
+        with self._lock:
+            self._misses += 1
+            data = self._data
+            if self.maxsize > 0 and key not in data:
+                if len(data) >= self.maxsize:
+                    del data[next(iter(data))]
+                data[key] = value
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def cache_clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+
+def _geometry_cache(maxsize: int):
+    # lru_cache is faster while the GIL is held anyway
+    if gil_enabled():
+        return lru_cache(maxsize=maxsize)(PressureCalculator._geometry_base)
+    return GeometryCache(maxsize)
+
+
+# The geometry term only depends on three numbers, so it is memoized; the
+# same tire/rim/wheel combination shows up across riders and surfaces.
+GEOMETRY_CACHE_SIZE = 4096
+
+geometry_base = _geometry_cache(GEOMETRY_CACHE_SIZE)
+
+
+def configure_geometry_cache(maxsize: int):
+    """Replace the geometry cache with an empty one holding ``maxsize`` entries."""
+    global geometry_base
+    geometry_base = _geometry_cache(maxsize)
 
 
 class PressureCalculatorBuilder:
@@ -254,19 +421,130 @@ class PressureCalculatorBuilder:
         return self.calculator
 
 
-def build_and_compute(
+def build_calculator(
     bike: Bike, surface: SurfaceEnum, rider_weight: Weight
 ) -> PressureCalculator:
-    builder = PressureCalculatorBuilder()
-    return (
-        (
+    with span("builder.setup"):
+        builder = PressureCalculatorBuilder()
+        calculator = (
             builder.set_discipline(bike.discipline)
             .set_surface(surface)
             .set_bike_weight(bike.weight.value)
             .set_rider_weight(rider_weight.value)
             .set_tires(bike.front_tire, bike.rear_tire)
             .set_wheels(bike.front_wheel, bike.rear_wheel)
-        )
-        .build()
-        .calculate()
+        ).build()
+    return calculator
+
+
+def build_and_compute(
+    bike: Bike, surface: SurfaceEnum, rider_weight: Weight
+) -> TirePressure:
+    return build_calculator(bike, surface, rider_weight).calculate()
+
+
+def compute_key(bike: Bike, surface: SurfaceEnum, rider_weight: Weight) -> tuple:
+    """Normalized cache key holding exactly the inputs the formula reads."""
+    front_tire, rear_tire = bike.front_tire, bike.rear_tire
+    front_wheel, rear_wheel = bike.front_wheel, bike.rear_wheel
+    return (
+        bike.discipline.value,
+        surface.value,
+        float(bike.weight.value),
+        float(rider_weight.value),
+        front_tire.get_width_mm(),
+        front_tire.casing.value,
+        float(front_wheel.rim_width),
+        front_wheel.rim_type.value,
+        front_wheel.diameter.value,
+        rear_tire.get_width_mm(),
+        rear_tire.casing.value,
+        float(rear_wheel.rim_width),
+        rear_wheel.rim_type.value,
+        rear_wheel.diameter.value,
+    )
+
+
+def cached_compute(
+    bike: Bike, surface: SurfaceEnum, rider_weight: Weight, cache
+) -> TirePressure:
+    """``build_and_compute`` through a result cache (``None`` disables caching)."""
+    if cache is None:
+        return build_and_compute(bike, surface, rider_weight)
+    key = compute_key(bike, surface, rider_weight)
+    result = cache.get(key)
+    if result is None:
+        result = build_and_compute(bike, surface, rider_weight)
+        cache.put(key, result)
+    return result
+
+
+# --- Flat (v2) requests ---
+
+_FLAT_CALCULATOR = PressureCalculator()
+
+
+def flat_key(request: TirePressureRequestV2) -> tuple:
+    """The ``compute_key`` of the equivalent nested request, so both versions share cache entries."""
+    return (
+        request.discipline.value,
+        request.surface.value,
+        request.bike_weight_kg,
+        request.rider_weight_kg,
+        request.front_tire_width,
+        request.front_casing.value,
+        request.front_rim_width,
+        request.front_rim_type.value,
+        request.front_diameter.value,
+        request.rear_tire_width,
+        request.rear_casing.value,
+        request.rear_rim_width,
+        request.rear_rim_type.value,
+        request.rear_diameter.value,
     )
+
+
+def compute_flat(request: TirePressureRequestV2) -> tuple:
+    """Rounded front and rear pressures (PSI) for a flat request, without building any models."""
+    calc = _FLAT_CALCULATOR
+    pressures = []
+    for position, width, casing, rim_width, rim_type, diameter in (
+        (
+            "FRONT", request.front_tire_width, request.front_casing,
+            request.front_rim_width, request.front_rim_type, request.front_diameter,
+        ),
+        (
+            "REAR", request.rear_tire_width, request.rear_casing,
+            request.rear_rim_width, request.rear_rim_type, request.rear_diameter,
+        ),
+    ):
+        pressure = calc._calculate_recommended_pressure(
+            rider_weight_kg=request.rider_weight_kg,
+            bike_weight_kg=request.bike_weight_kg,
+            discipline=request.discipline,
+            rim_type=rim_type,
+            surface=request.surface,
+            tire_width_mm=width,
+            inner_rim_width_mm=rim_width,
+            tire_casing=casing,
+            wheel_position=position,
+            wheel_diameter=calc.WHEEL_DIAMETER_MAP.get(diameter, 622),
+        )
+        pressures.append(round(pressure, 1))
+    return tuple(pressures)
+
+
+def cached_compute_flat(request: TirePressureRequestV2, cache) -> TirePressureV2:
+    """``compute_flat`` through the ``/compute`` result cache (``None`` disables caching)."""
+    from .schemas import TirePressure, TirePressureV2
+
+    if cache is None:
+        front, rear = compute_flat(request)
+        return TirePressureV2(front_psi=front, rear_psi=rear)
+    key = flat_key(request)
+    result = cache.get(key)
+    if result is None:
+        front, rear = compute_flat(request)
+        cache.put(key, TirePressure(front_wheel=front, rear_wheel=rear, unit=PressureUnitEnum.PSI))
+        return TirePressureV2(front_psi=front, rear_psi=rear)
+    return TirePressureV2(front_psi=result.front_wheel, rear_psi=result.rear_wheel)
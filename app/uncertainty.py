@@ -0,0 +1,81 @@
+"""Percentile bands for a recommendation under noisy inputs.
+
+Samples the rider weight, tire widths and rim widths around their nominal
+values and evaluates every sample in one call of the vectorized formula.
+"""
+
+from typing import Dict, List, Tuple
+
+from .columnar import pressure_vector
+from .schemas import (
+    CasingEnum,
+    DisciplineEnum,
+    PressureUnitEnum,
+    RimTypeEnum,
+    SurfaceEnum,
+    UncertaintyRequest,
+    UncertaintyResponse,
+)
+from .services import PressureCalculator, build_and_compute
+
+# Sampled widths are kept physically meaningful
+_MIN_WIDTH_MM = 1.0
+
+
+def _code(enum, member) -> int:
+    return list(enum).index(member)
+
+
+def _bands(pressures, percentiles: List[float]) -> Dict[str, float]:
+    import numpy as np
+
+    values = np.percentile(pressures, percentiles)
+    return {f"p{p:g}": round(float(v), 1) for p, v in zip(percentiles, values)}
+
+
+def sample_pressures(payload: UncertaintyRequest) -> Tuple["object", "object"]:
+    """Front and rear pressures (PSI) for every sample; seeded and reproducible."""
+    import numpy as np
+
+    spec = payload.uncertainty
+    bike = payload.bike
+    rng = np.random.default_rng(spec.seed)
+    n = spec.samples
+
+    # Weights are used as given, like the scalar formula does
+    rider = rng.normal(payload.rider_weight.value, spec.rider_weight_sd, n)
+    discipline = _code(DisciplineEnum, bike.discipline)
+    surface = _code(SurfaceEnum, payload.surface)
+
+    def wheel(tire, rim, position: str):
+        width = rng.normal(tire.get_width_mm(), spec.tire_width_sd_mm, n)
+        rim_width = rng.normal(rim.rim_width, spec.rim_width_sd_mm, n)
+        return pressure_vector(
+            rider_weight_kg=rider,
+            bike_weight_kg=bike.weight.value,
+            discipline=discipline,
+            rim_type=_code(RimTypeEnum, rim.rim_type),
+            surface=surface,
+            tire_width_mm=np.maximum(width, _MIN_WIDTH_MM),
+            inner_rim_width_mm=np.maximum(rim_width, _MIN_WIDTH_MM),
+            tire_casing=_code(CasingEnum, tire.casing),
+            wheel_position=position,
+            wheel_diameter=PressureCalculator.WHEEL_DIAMETER_MAP.get(rim.diameter, 622),
+        )
+
+    front = wheel(bike.front_tire, bike.front_wheel, "FRONT")
+    rear = wheel(bike.rear_tire, bike.rear_wheel, "REAR")
+    return front, rear
+
+
+def uncertainty_bands(payload: UncertaintyRequest) -> UncertaintyResponse:
+    front, rear = sample_pressures(payload)
+    spec = payload.uncertainty
+    return UncertaintyResponse(
+        nominal=build_and_compute(payload.bike, payload.surface, payload.rider_weight),
+        front_wheel=_bands(front, spec.percentiles),
+        rear_wheel=_bands(rear, spec.percentiles),
+        unit=PressureUnitEnum.PSI,
+        samples=spec.samples,
+        seed=spec.seed,
+    )
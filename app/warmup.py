@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import Counter
+from typing import Callable, List, Optional
+
+from .presets import PRESET_RIDER_WEIGHTS_KG, preset_requests
+from .schemas import TirePressureRequest
+from .services import cached_compute, compute_key
+
+logger = logging.getLogger(__name__)
+
+
+def recorded_requests(path: str, limit: int) -> List[TirePressureRequest]:
+    """The ``limit`` most frequent configurations in a traffic capture file."""
+    counts: Counter = Counter()
+    requests = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            # Truncated or foreign lines (a partial last write, a rotation
+            # boundary) are skipped rather than failing the warm-up
+            try:
+                record = json.loads(line)
+                request = TirePressureRequest.model_validate(record.get("payload", record))
+            except (ValueError, AttributeError):
+                continue
+            key = compute_key(request.bike, request.surface, request.rider_weight)
+            counts[key] += 1
+            requests.setdefault(key, request)
+    return [requests[key] for key, _ in counts.most_common(limit)]
+
+
+def popular_requests(path: str, limit: int) -> List[TirePressureRequest]:
+    """Configurations from a saved ``GET /popular`` response, for common rider weights."""
+    with open(path, encoding="utf-8") as fh:
+        configurations = json.load(fh)["configurations"]
+    requests = []
+    for configuration in configurations:
+        for rider_kg in PRESET_RIDER_WEIGHTS_KG:
+            if len(requests) >= limit:
+                return requests
+            requests.append(
+                TirePressureRequest.model_validate(
+                    {
+                        "bike": configuration["bike"],
+                        "surface": configuration["surface"],
+                        "rider_weight": {"value": rider_kg, "unit": "kg"},
+                    }
+                )
+            )
+    return requests
+
+
+class CacheWarmer:
+    """Pre-compute popular configurations into the caches in the background.
+
+    The configuration list is loaded off the event loop, then computed on it
+    in small chunks so requests keep being served while the cache fills up.
+    """
+
+    def __init__(
+        self, load: Callable[[], List[TirePressureRequest]], cache, chunk_size: int = 100
+    ):
+        self.load = load
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.state = "pending"
+        self.done = 0
+        self.total: Optional[int] = None
+        self.duration_s: Optional[float] = None
+
+    async def run(self):
+        self.state = "running"
+        started = time.perf_counter()
+        try:
+            requests = await asyncio.to_thread(self.load)
+            self.total = len(requests)
+            for request in requests:
+                cached_compute(request.bike, request.surface, request.rider_weight, self.cache)
+                self.done += 1
+                if self.done % self.chunk_size == 0:
+                    await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception:
+            self.state = "failed"
+            logger.exception("Cache warm-up failed")
+            return
+        self.state = "done"
+        self.duration_s = round(time.perf_counter() - started, 3)
+        logger.info(f"Cache warm-up finished: {self.done} configurations in {self.duration_s}s")
+
+    def progress(self) -> dict:
+        return {
+            "state": self.state,
+            "done": self.done,
+            "total": self.total,
+            "duration_s": self.duration_s,
+        }
+
+
+def build_warmer(cache, path: str = "", limit: int = 5000) -> CacheWarmer:
+    """Warm from a ``/popular`` export (``.json``) or a capture file, else from presets."""
+    if path.endswith(".json"):
+        return CacheWarmer(lambda: popular_requests(path, limit), cache)
+    if path:
+        return CacheWarmer(lambda: recorded_requests(path, limit), cache)
+    return CacheWarmer(lambda: list(itertools.islice(preset_requests(), limit)), cache)
@@ -218,10 +218,12 @@ export default function App() {
     const rearTireWidthMm = widthUnit === "IN" ? rearTireWidthValue * 25.4 : rearTireWidthValue;
 
     try {
+      // A text/plain body keeps this a CORS "simple request", so the
+      // browser skips the OPTIONS preflight; the API parses it as JSON
       const response = await fetch(API_ENDPOINT, {
         method: "POST",
         headers: {
-          "Content-Type": "application/json",
+          "Content-Type": "text/plain;charset=UTF-8",
           accept: "application/json"
         },
         body: JSON.stringify({
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, Rejected, TokenBucket
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=2.0)
+    now = bucket._updated
+    assert bucket.take(now) == 0.0
+    assert bucket.take(now) == 0.0
+    assert bucket.take(now) == pytest.approx(0.5)
+    assert bucket.take(now + 0.5) == 0.0
+
+
+def test_client_rate_limit_is_per_client():
+    controller = AdmissionController(client_rate=1.0, client_burst=1.0)
+
+    async def run():
+        async with controller.admit("a"):
+            pass
+        async with controller.admit("b"):
+            pass
+        with pytest.raises(Rejected) as excinfo:
+            async with controller.admit("a"):
+                pass
+        return excinfo.value
+
+    rejection = asyncio.run(run())
+    assert rejection.status_code == 429
+    assert rejection.headers == {"Retry-After": "1"}
+
+
+def test_queue_is_bounded_and_times_out():
+    """Past the concurrency limit requests wait briefly, then get 503."""
+    controller = AdmissionController(max_concurrency=1, max_queue=1, max_queue_wait=0.05)
+
+    async def hold(release: asyncio.Event):
+        async with controller.admit("a"):
+            await release.wait()
+
+    async def waiter():
+        try:
+            async with controller.admit("b"):
+                return "admitted"
+        except Rejected as rejection:
+            return rejection.reason
+
+    async def run():
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        # The queue already holds one request
+        full = await waiter()
+        timed_out = await queued
+        release.set()
+        await holder
+        return full, timed_out, await waiter()
+
+    assert asyncio.run(run()) == ("queue_full", "queue_timeout", "admitted")
+    assert controller.in_flight == 0 and controller.queued == 0
@@ -0,0 +1,110 @@
+import re
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import create_app
+from app.presets import POPULAR_PRESETS
+
+# Cold-start budgets for ``import app.main``, in microseconds: everything it
+# imports, and the time spent in the app's own modules alone
+IMPORT_BUDGET_US = 2_000_000
+OWN_IMPORT_BUDGET_US = 250_000
+
+MINIMAL = Settings(
+    request_logging=False,
+    metrics_enabled=False,
+    result_cache_size=0,
+    warmup_enabled=False,
+    compression_enabled=False,
+    admission_enabled=False,
+    popularity_enabled=False,
+)
+
+
+def test_settings_from_env():
+    settings = Settings.from_env(
+        {
+            "ALLOWED_ORIGINS": "https://a.example, https://b.example",
+            "RESULT_CACHE_SIZE": "50",
+            "WARMUP_ENABLED": "false",
+            "TRACE_EXPORTER": "JSONL",
+            "ADMISSION_MAX_QUEUE_WAIT": "0.25",
+        }
+    )
+    assert settings.allowed_origins == ["https://a.example", "https://b.example"]
+    assert settings.allow_credentials
+    assert settings.result_cache_size == 50 and not settings.warmup_enabled
+    assert settings.trace_exporter == "jsonl"
+    assert settings.admission_max_queue_wait == 0.25
+    assert Settings.from_env({}).allowed_origins == "*" and not Settings().allow_credentials
+
+
+def test_settings_production_requires_origins():
+    with pytest.raises(ValueError):
+        Settings.from_env({"ENVIRONMENT": "production"})
+
+
+def test_low_memory_caps_settings():
+    settings = Settings.from_env({"LOW_MEMORY": "true", "RESULT_CACHE_SIZE": "50000"})
+    assert settings.result_cache_size == 1000
+    assert settings.geometry_cache_size == 256
+
+
+def test_minimal_app_computes():
+    client = TestClient(create_app(MINIMAL))
+    request = {
+        "bike": POPULAR_PRESETS[0],
+        "surface": "DRY",
+        "rider_weight": {"value": 72, "unit": "kg"},
+    }
+    response = client.post("/compute", json=request)
+    assert response.status_code == 200
+    assert set(response.json()) == {"front_wheel", "rear_wheel", "unit"}
+    assert client.get("/ready").json()["result_cache"] is None
+
+
+def test_disabled_subsystems_are_not_mounted():
+    client = TestClient(create_app(MINIMAL))
+    for path in ("/metrics", "/popular", "/admin/memory", "/jobs/missing", "/debug/traces"):
+        assert client.get(path).status_code == 404, path
+
+    client = TestClient(create_app(Settings(warmup_enabled=False, admin_token="secret")))
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/popular").status_code == 200
+    assert client.get("/admin/memory", headers={"x-admin-token": "secret"}).status_code == 200
+
+
+def test_import_has_no_side_effects():
+    """Importing app.main neither builds the app nor reads .env."""
+    code = (
+        "import sys, app.main; "
+        "sys.exit('app' in vars(app.main) or 'dotenv' in sys.modules or 'sqlite3' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_import_time_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    own, total = 0, None
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        if module == "app" or module.startswith("app."):
+            own += int(self_us)
+        if module == "app.main":
+            total = int(cumulative_us)
+    assert total is not None
+    assert total < IMPORT_BUDGET_US, f"import app.main took {total / 1000:.0f} ms"
+    assert own < OWN_IMPORT_BUDGET_US, f"app modules took {own / 1000:.0f} ms to import"
@@ -0,0 +1,31 @@
+import struct
+
+import numpy as np
+from starlette.requests import Request
+
+from app.core.binary import MEDIA_TYPE, decode_columns, encode_columns, wants_binary
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+
+
+def test_round_trip_and_layout():
+    front = np.array([51.0, 32.6, 34.4])
+    rear = np.array([54.3, 34.6, 36.6])
+    payload = bytes(encode_columns({"front_wheel": front, "rear_wheel": rear}))
+
+    assert payload[:4] == b"TPCB"
+    assert struct.unpack_from("<I", payload, 8)[0] == 3
+    assert len(payload) == 16 + 2 * 16 + 2 * 3 * 4
+    decoded = decode_columns(payload)
+    assert list(decoded) == ["front_wheel", "rear_wheel"]
+    np.testing.assert_allclose(decoded["rear_wheel"], rear, atol=1e-5)
+
+
+def test_accept_negotiation():
+    assert wants_binary(_request(MEDIA_TYPE))
+    assert wants_binary(_request(f"application/json;q=0.5, {MEDIA_TYPE}"))
+    assert not wants_binary(_request(f"application/json, {MEDIA_TYPE};q=0.5"))
+    assert not wants_binary(_request("*/*"))
+    assert not wants_binary(_request(""))
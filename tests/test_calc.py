@@ -0,0 +1,70 @@
+import io
+import json
+import subprocess
+import sys
+
+from app.calc import main
+from app.presets import POPULAR_PRESETS
+from app.schemas import TirePressureRequest
+from app.services import build_and_compute
+
+ROAD_FLAGS = [
+    "--discipline", "ROAD", "--tire-width", "28", "--rim-width", "23",
+    "--rider-weight", "72", "--bike-weight", "6.8",
+]
+
+
+def _run(argv, stdin=""):
+    out, err = io.StringIO(), io.StringIO()
+    status = main(argv, stdin=io.StringIO(stdin), stdout=out, stderr=err)
+    return status, out.getvalue(), err.getvalue()
+
+
+def _request(preset: dict, surface: str = "DRY") -> dict:
+    return {"bike": preset, "surface": surface, "rider_weight": {"value": 72, "unit": "kg"}}
+
+
+def test_flags_match_the_api():
+    status, out, _ = _run(ROAD_FLAGS)
+    request = TirePressureRequest.model_validate(_request(POPULAR_PRESETS[1]))
+    expected = build_and_compute(request.bike, request.surface, request.rider_weight)
+    assert status == 0
+    assert json.loads(out) == expected.model_dump(mode="json")
+
+
+def test_stdin_lines_to_csv_with_errors_reported():
+    lines = [json.dumps(_request(POPULAR_PRESETS[10], "WET")), '{"bike": {}}']
+    status, out, err = _run(["--format", "csv"], "\n".join(lines))
+
+    request = TirePressureRequest.model_validate(_request(POPULAR_PRESETS[10], "WET"))
+    expected = build_and_compute(request.bike, request.surface, request.rider_weight)
+    assert status == 1
+    assert out.splitlines() == [
+        "name,front_wheel,rear_wheel,unit",
+        f"XC 2.3in,{expected.front_wheel},{expected.rear_wheel},PSI",
+        ",,,",
+    ]
+    assert err.startswith("item 1: missing field")
+
+
+def test_cli_imports_only_the_calculation_core():
+    code = (
+        "import sys, app.calc; "
+        "sys.exit(sorted(m for m in sys.modules if m == 'app.core.config' or m.split('.')[0] in "
+        "('fastapi', 'starlette', 'pydantic', 'dotenv', 'numpy')) or 0)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_cold_start_loads_only_the_standard_library_and_the_core():
+    """Cold start is checked by what gets imported, not by timing, which varies with load."""
+    code = (
+        "import sys; before = set(sys.modules); import app.calc; "
+        "extra = sorted(m for m in set(sys.modules) - before "
+        "if m.split('.')[0] not in sys.stdlib_module_names and m.split('.')[0] != 'app' "
+        "and not m.startswith('_sysconfigdata')); "
+        "sys.exit(extra or 0)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
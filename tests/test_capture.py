@@ -0,0 +1,45 @@
+import json
+import time
+
+from app.core.capture import BackgroundJsonlWriter, TrafficRecorder
+from app.schemas import TirePressureRequest
+from tools.loadgen import grid_mix
+from tools.replay import load_capture
+
+
+def test_recorder_writes_anonymized_payloads(tmp_path):
+    """
+    sampled payloads are written with names blanked and weights coarsened
+    """
+    path = tmp_path / "traffic.jsonl"
+    writer = BackgroundJsonlWriter(str(path), max_bytes=0, backups=0, queue_size=100)
+    recorder = TrafficRecorder(writer, sample_rate=1.0)
+
+    payloads = [TirePressureRequest.model_validate_json(body) for body in grid_mix(3, 5)]
+    for payload in payloads:
+        recorder.record("/compute", payload, time.perf_counter())
+    recorder.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 5
+    for line, payload in zip(lines, payloads):
+        assert line["endpoint"] == "/compute"
+        assert line["duration_ms"] >= 0
+        assert line["payload"]["bike"]["name"] == "captured"
+        assert line["payload"]["rider_weight"]["value"] == round(payload.rider_weight.value)
+        assert line["payload"]["surface"] == payload.surface
+        TirePressureRequest.model_validate(line["payload"])
+
+
+def test_load_capture_reads_rotated_files_in_order(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    writer = BackgroundJsonlWriter(str(path), max_bytes=2000, backups=10, queue_size=100)
+    recorder = TrafficRecorder(writer, sample_rate=1.0)
+    for body in grid_mix(4, 12):
+        recorder.record("/compute", TirePressureRequest.model_validate_json(body), time.perf_counter())
+    recorder.close()
+
+    records = load_capture(str(path))
+    assert len(list(tmp_path.iterdir())) > 1
+    assert len(records) == 12
+    assert [r[0] for r in records] == sorted(r[0] for r in records)
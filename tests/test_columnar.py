@@ -0,0 +1,115 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.columnar import ColumnError, calculate_columns, validate_columns
+from app.core.config import Settings
+from app.main import create_app
+from app.schemas import ColumnarBatchRequest, TirePressureRequest
+from app.services import build_and_compute
+from tools.loadgen import grid_mix
+
+
+def _columns_from(requests):
+    def column(getter):
+        return [getter(r) for r in requests]
+
+    return ColumnarBatchRequest(
+        discipline=column(lambda r: r.bike.discipline.value),
+        surface=column(lambda r: r.surface.value),
+        rider_weight_kg=column(lambda r: r.rider_weight.value),
+        bike_weight_kg=column(lambda r: r.bike.weight.value),
+        front_tire_width=column(lambda r: r.bike.front_tire.get_width_mm()),
+        rear_tire_width=column(lambda r: r.bike.rear_tire.get_width_mm()),
+        front_casing=column(lambda r: r.bike.front_tire.casing.value),
+        rear_casing=column(lambda r: r.bike.rear_tire.casing.value),
+        front_rim_width=column(lambda r: r.bike.front_wheel.rim_width),
+        rear_rim_width=column(lambda r: r.bike.rear_wheel.rim_width),
+        front_rim_type=column(lambda r: r.bike.front_wheel.rim_type.value),
+        rear_rim_type=column(lambda r: r.bike.rear_wheel.rim_type.value),
+        front_diameter=column(lambda r: r.bike.front_wheel.diameter.value),
+        rear_diameter=column(lambda r: r.bike.rear_wheel.diameter.value),
+    )
+
+
+def test_columnar_matches_scalar_calculator():
+    """
+    every discipline x surface combination gives the same pressures as build_and_compute
+    """
+    requests = [TirePressureRequest.model_validate_json(body) for body in grid_mix(5, 256)]
+    front, rear = calculate_columns(validate_columns(_columns_from(requests)))
+
+    for i, request in enumerate(requests):
+        expected = build_and_compute(request.bike, request.surface, request.rider_weight)
+        assert front[i] == expected.front_wheel
+        assert rear[i] == expected.rear_wheel
+
+
+def test_scalar_columns_broadcast():
+    request = TirePressureRequest.model_validate_json(grid_mix(1, 1)[0])
+    columns = _columns_from([request]).model_dump()
+    columns["rider_weight_kg"] = [60.0, 70.0, 80.0]
+    for name, value in columns.items():
+        if name != "rider_weight_kg" and isinstance(value, list):
+            columns[name] = value[0]
+
+    front, rear = calculate_columns(validate_columns(ColumnarBatchRequest(**columns)))
+    assert len(front) == len(rear) == 3
+    assert front[0] < front[1] < front[2]
+
+
+def test_invalid_codes_are_reported_per_row():
+    request = TirePressureRequest.model_validate_json(grid_mix(1, 1)[0])
+    columns = _columns_from([request, request, request]).model_dump()
+    columns["surface"] = ["DRY", "MUD", "DRY"]
+    columns["front_casing"] = ["PAPER", "STANDARD", "PAPER"]
+
+    with pytest.raises(ColumnError) as exc:
+        validate_columns(ColumnarBatchRequest(**columns))
+
+    locs = [error["loc"] for error in exc.value.errors]
+    assert locs == [
+        ("body", "front_casing", 0),
+        ("body", "surface", 1),
+        ("body", "front_casing", 2),
+    ]
+
+
+def test_column_length_mismatch():
+    request = TirePressureRequest.model_validate_json(grid_mix(1, 1)[0])
+    columns = _columns_from([request, request]).model_dump()
+    columns["rear_rim_width"] = [23.0]
+
+    with pytest.raises(ColumnError) as exc:
+        validate_columns(ColumnarBatchRequest(**columns))
+    assert exc.value.errors[0]["loc"] == ("body", "rear_rim_width")
+
+
+def test_invalid_float_cells_are_reported_once_per_row():
+    request = TirePressureRequest.model_validate_json(grid_mix(1, 1)[0])
+    columns = _columns_from([request, request, request]).model_dump()
+    columns["rider_weight_kg"] = [70.0, "heavy", None]
+    columns["bike_weight_kg"] = "light"
+
+    with pytest.raises(ColumnError) as exc:
+        validate_columns(ColumnarBatchRequest(**columns))
+    assert [error["loc"] for error in exc.value.errors] == [
+        ("body", "bike_weight_kg"),
+        ("body", "rider_weight_kg", 1),
+        ("body", "rider_weight_kg", 2),
+    ]
+    assert exc.value.errors[1]["input"] == "heavy"
+
+    # Numeric strings are accepted, like the nested models do
+    columns["rider_weight_kg"], columns["bike_weight_kg"] = [70, "71.5", 72.0], 8
+    front, _ = calculate_columns(validate_columns(ColumnarBatchRequest(**columns)))
+    assert front[0] < front[1] < front[2]
+
+
+def test_endpoint_reports_float_errors_at_column_and_row():
+    client = TestClient(create_app(Settings(warmup_enabled=False, request_logging=False)))
+    request = TirePressureRequest.model_validate_json(grid_mix(1, 1)[0])
+    columns = _columns_from([request, request]).model_dump()
+    columns["rear_rim_width"] = [23.0, "wide"]
+    response = client.post("/batch/columnar", json=columns)
+    assert response.status_code == 422
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "rear_rim_width", 1]]
@@ -0,0 +1,52 @@
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+
+def _client() -> TestClient:
+    async def small(request):
+        return JSONResponse({"front_wheel": 51.0})
+
+    async def large(request):
+        return JSONResponse({"items": [{"front_wheel": 51.0, "rear_wheel": 54.3}] * 500})
+
+    app = Starlette(routes=[Route("/small", small), Route("/large", large)])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=4096)
+    return TestClient(app)
+
+
+def test_choose_encoding():
+    available = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, br", available) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", available) == "gzip"
+    assert choose_encoding("*", available) == "zstd"
+    assert choose_encoding("identity", available) is None
+    assert choose_encoding("gzip;q=0", ["gzip"]) is None
+
+
+def test_large_responses_are_compressed():
+    """Bodies above the threshold are compressed; small ones are left alone."""
+    client = _client()
+    response = client.get("/large", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["items"]) == 500
+
+    # httpx decodes the body; the wire size is what Content-Length reports
+    assert int(response.headers["content-length"]) < len(response.content)
+
+    small = client.get("/small", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"front_wheel": 51.0}
+
+
+def test_every_response_varies_on_accept_encoding():
+    """Shared caches must keep compressed and uncompressed variants apart, whatever the size."""
+    client = _client()
+    for path in ("/small", "/large"):
+        for accept in ("gzip", "identity"):
+            response = client.get(path, headers={"accept-encoding": accept})
+            assert response.headers["vary"] == "Accept-Encoding", (path, accept)
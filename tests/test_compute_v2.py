@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.core.cache import LRUCache
+from app.core.config import Settings
+from app.main import create_app
+from app.presets import POPULAR_PRESETS
+from app.schemas import TirePressureRequest, TirePressureRequestV2
+from app.services import build_and_compute, cached_compute, cached_compute_flat, compute_key, flat_key
+from tools.loadgen import grid_mix
+from tools.schemabench import flat_payload
+
+
+def _pairs(payloads):
+    for payload in payloads:
+        yield (
+            TirePressureRequest.model_validate(payload),
+            TirePressureRequestV2.model_validate(flat_payload(payload)),
+        )
+
+
+def test_flat_requests_match_nested_ones():
+    payloads = [json.loads(body) for body in grid_mix(7, 300)]
+    payloads += [
+        {"bike": preset, "surface": "DRY", "rider_weight": {"value": 72, "unit": "kg"}}
+        for preset in POPULAR_PRESETS
+    ]
+    for nested, flat in _pairs(payloads):
+        expected = build_and_compute(nested.bike, nested.surface, nested.rider_weight)
+        result = cached_compute_flat(flat, None)
+        assert (result.front_psi, result.rear_psi) == (expected.front_wheel, expected.rear_wheel)
+        assert flat_key(flat) == compute_key(nested.bike, nested.surface, nested.rider_weight)
+
+
+def test_widths_are_normalized_to_mm_and_requests_are_frozen():
+    payload = {**flat_payload(json.loads(grid_mix(1, 1)[0])), "tire_width_unit": "IN"}
+    payload.update(front_tire_width=2.4, rear_tire_width=2.4)
+    request = TirePressureRequestV2.model_validate(payload)
+    assert request.front_tire_width == request.rear_tire_width == 2.4 * 25.4
+    assert request.tire_width_unit == "MM"
+    # A dumped request validates back to itself, without a second conversion
+    assert TirePressureRequestV2.model_validate(request.model_dump()) == request
+    assert TirePressureRequestV2.model_validate_json(json.dumps(payload)) == request
+    assert hash(request) == hash(TirePressureRequestV2.model_validate(payload))
+    with pytest.raises(ValidationError):
+        request.rider_weight_kg = 80
+
+
+def test_versions_share_cache_entries():
+    cache = LRUCache(10)
+    nested, flat = next(_pairs([json.loads(grid_mix(2, 1)[0])]))
+    cached_compute(nested.bike, nested.surface, nested.rider_weight, cache)
+    cached_compute_flat(flat, cache)
+    assert cache.stats()["hits"] == 1 and len(cache) == 1
+
+
+def test_both_versions_are_served():
+    client = TestClient(create_app(Settings(warmup_enabled=False, request_logging=False)))
+    payload = json.loads(grid_mix(4, 1)[0])
+    v1 = client.post("/compute", json=payload).json()
+    v2 = client.post("/v2/compute", json=flat_payload(payload))
+    assert v2.status_code == 200
+    assert v2.json() == {"front_psi": v1["front_wheel"], "rear_psi": v1["rear_wheel"]}
+    assert client.post("/v2/compute", json={"discipline": "ROAD"}).status_code == 422
@@ -0,0 +1,86 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.core.cors import CachedCORSMiddleware
+from app.main import create_app
+from app.presets import POPULAR_PRESETS
+
+PREFLIGHT = {"access-control-request-method": "POST", "access-control-request-headers": "content-type"}
+
+
+def _client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CachedCORSMiddleware, **options)
+
+    @app.post("/echo")
+    def echo():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_preflight_is_answered_from_the_cache_with_max_age():
+    client = _client(
+        allow_origins=["https://a.example"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        allow_credentials=True,
+        max_age=7200,
+    )
+    response = client.options("/echo", headers={"origin": "https://a.example", **PREFLIGHT})
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "https://a.example"
+    assert response.headers["access-control-max-age"] == "7200"
+    assert response.headers["access-control-allow-headers"] == "content-type"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+    rejected = client.options("/echo", headers={"origin": "https://evil.example", **PREFLIGHT})
+    assert rejected.status_code == 400
+    assert "access-control-allow-origin" not in rejected.headers
+
+
+def test_explicit_headers_and_methods_are_checked():
+    client = _client(allow_origins=["*"], allow_methods=["GET"], allow_headers=["x-admin-token"])
+    response = client.options(
+        "/echo",
+        headers={
+            "origin": "https://a.example",
+            "access-control-request-method": "POST",
+            "access-control-request-headers": "X-Other",
+        },
+    )
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS method, headers"
+
+
+def test_simple_responses_get_origin_headers():
+    client = _client(allow_origins=["https://a.example"], expose_headers=["x-trace-id"])
+    allowed = client.post("/echo", headers={"origin": "https://a.example"})
+    assert allowed.headers["access-control-allow-origin"] == "https://a.example"
+    assert allowed.headers["access-control-expose-headers"] == "x-trace-id"
+    other = client.post("/echo", headers={"origin": "https://b.example"})
+    assert "access-control-allow-origin" not in other.headers
+
+    wildcard = _client(allow_origins=["*"])
+    assert wildcard.post("/echo", headers={"origin": "https://b.example"}).headers[
+        "access-control-allow-origin"
+    ] == "*"
+
+
+def test_compute_accepts_text_plain_bodies():
+    """The frontend posts text/plain, a CORS simple request that needs no preflight."""
+    client = TestClient(create_app(Settings(warmup_enabled=False, request_logging=False)))
+    body = {"bike": POPULAR_PRESETS[0], "surface": "DRY", "rider_weight": {"value": 72, "unit": "kg"}}
+    as_json = client.post("/compute", json=body)
+    as_text = client.post(
+        "/compute",
+        content=as_json.request.content,
+        headers={"content-type": "text/plain;charset=UTF-8", "origin": "http://localhost:5173"},
+    )
+    assert as_text.status_code == 200
+    assert as_text.json() == as_json.json()
+    assert as_text.headers["access-control-allow-origin"] == "*"
+    content = client.get("/openapi.json").json()["paths"]["/compute"]["post"]["requestBody"]["content"]
+    assert set(content) == {"application/json", "text/plain"}
@@ -0,0 +1,40 @@
+from app.services import PressureCalculator
+from tools.enginebench import ENGINES, boundary_widths, compare, edge_cases, random_cases
+
+
+def test_edge_cases_cover_the_rim_width_table():
+    widths = boundary_widths()
+    for entry in PressureCalculator.RIM_WIDTH_TABLE:
+        assert {entry["min"], entry["max"] - 0.01, entry["max"]} <= set(widths)
+    # The gap between the last two ranges falls back to the default rim width
+    assert any(113 < width < 114 for width in widths)
+    assert len(edge_cases()) > 8 * 4 * 4 * 4 * 6
+
+
+def test_every_engine_matches_the_scalar_calculator():
+    report = compare(edge_cases() + random_cases(3, 500), repeat=1)
+    assert set(report["engines"]) == set(ENGINES)
+    for name, entry in report["engines"].items():
+        assert entry["differing"] == 0, (name, entry.get("first_differing_case"))
+        assert entry["cases_per_s"] > 0
+    assert report["ok"]
+
+
+def test_a_one_step_difference_fails():
+    """An engine off by a single 0.1 PSI rounding step, on one case, is reported and fails."""
+
+    def off_by_one_step(cases, stack):
+        run, evaluated = ENGINES["scalar"](cases, stack)
+
+        def shifted():
+            front, rear = run()
+            return front, [round(value + 0.1, 1) if i == 1 else value for i, value in enumerate(rear)]
+
+        return shifted, evaluated
+
+    cases = random_cases(4, 3)
+    report = compare(cases, {"shifted": off_by_one_step}, repeat=1)
+    entry = report["engines"]["shifted"]
+    assert entry["max_deviation_psi"] == 0.1 and entry["differing"] == 1
+    assert entry["first_differing_case"] == cases[1]
+    assert not entry["ok"] and not report["ok"]
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.core.execution import ExecutionStrategy
+from app.core.metrics import metrics
+from app.main import create_app
+from tools.loadgen import grid_mix
+
+
+def _thread_name(strategy: ExecutionStrategy, cost: float) -> str:
+    return asyncio.run(strategy.run("test", cost, lambda: threading.current_thread().name))
+
+
+def test_auto_mode_offloads_by_estimated_cost():
+    strategy = ExecutionStrategy("auto", inline_max_cost=10)
+    assert _thread_name(strategy, 1) == threading.current_thread().name
+    assert _thread_name(strategy, 11) != threading.current_thread().name
+    assert not ExecutionStrategy("threadpool").runs_inline(0)
+    assert ExecutionStrategy("inline").runs_inline(1e9)
+    with pytest.raises(ValueError):
+        ExecutionStrategy("sometimes")
+
+
+def test_decisions_are_counted_per_endpoint():
+    metrics.reset()
+    client = TestClient(create_app(Settings(warmup_enabled=False, request_logging=False)))
+    payload = json.loads(grid_mix(5, 1)[0])
+    assert client.post("/compute", json=payload).status_code == 200
+    assert client.post("/batch", json={"items": [payload] * 40}).status_code == 200
+    snapshot = client.get("/metrics").json()
+    assert snapshot["counters"]["execution.compute.inline"] == 1
+    assert snapshot["counters"]["execution.batch.threadpool"] == 1
+    assert snapshot["summaries"]["execution.inline_seconds"]["count"] == 1
+
+
+def test_forced_threadpool_mode():
+    metrics.reset()
+    settings = Settings(warmup_enabled=False, request_logging=False, execution_mode="threadpool")
+    client = TestClient(create_app(settings))
+    assert client.post("/compute", json=json.loads(grid_mix(5, 1)[0])).status_code == 200
+    assert metrics.counter("execution.compute.threadpool") == 1
+    assert metrics.counter("execution.compute.inline") == 0
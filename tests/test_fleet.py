@@ -0,0 +1,45 @@
+import pytest
+from pydantic import ValidationError
+
+from app.fleet import fleet_matrix
+from app.presets import POPULAR_PRESETS
+from app.schemas import FleetRequest, SurfaceEnum
+from app.services import build_and_compute
+
+
+def test_matrix_matches_single_requests():
+    """Every cell equals the /compute result; duplicate bikes are computed once."""
+    duplicate = {**POPULAR_PRESETS[0], "name": "Spare road bike"}
+    payload = FleetRequest.model_validate(
+        {
+            "riders": [
+                {"name": "A", "weight": {"value": 58, "unit": "kg"}},
+                {"name": "B", "weight": {"value": 81.5, "unit": "kg"}},
+                {"name": "C", "weight": {"value": 170, "unit": "lbs"}},
+            ],
+            "bikes": [POPULAR_PRESETS[0], POPULAR_PRESETS[5], POPULAR_PRESETS[12], duplicate],
+        }
+    )
+    result = fleet_matrix(payload)
+
+    assert result.unique_bikes == 3
+    assert result.bikes[3] == "Spare road bike"
+    assert result.surfaces == list(SurfaceEnum)
+    for r, rider in enumerate(payload.riders):
+        for b, bike in enumerate(payload.bikes):
+            for s, surface in enumerate(result.surfaces):
+                expected = build_and_compute(bike, surface, rider.weight)
+                assert result.front_wheel[r][b][s] == expected.front_wheel
+                assert result.rear_wheel[r][b][s] == expected.rear_wheel
+
+
+def test_surfaces_are_bounded_and_deduplicated():
+    base = {
+        "riders": [{"name": "A", "weight": {"value": 70, "unit": "kg"}}],
+        "bikes": [POPULAR_PRESETS[0]],
+    }
+    payload = FleetRequest.model_validate({**base, "surfaces": ["WET", "DRY", "WET"]})
+    assert payload.surfaces == [SurfaceEnum.WET, SurfaceEnum.DRY]
+    assert len(fleet_matrix(payload).front_wheel[0][0]) == 2
+    with pytest.raises(ValidationError):
+        FleetRequest.model_validate({**base, "surfaces": ["DRY"] * 100_000})
@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.jobs import JobRunner, JobStatus, JobStore
+from app.main import create_app
+from tools.loadgen import grid_mix
+
+
+def _wait_until_finished(store: JobStore, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] in JobStatus.FINISHED:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def _write_input(runner: JobRunner, job_id: str, lines):
+    with open(runner.input_path(job_id), "wb") as fh:
+        fh.write(b"\n".join(lines) + b"\n")
+
+
+def test_job_processes_all_rows_and_reports_invalid_ones(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    runner = JobRunner(store, str(tmp_path), workers=1, chunk_size=7)
+    runner.start()
+
+    job_id = runner.new_job_id()
+    _write_input(runner, job_id, grid_mix(1, 20) + [b'{"surface": "DRY"}'])
+    runner.submit(job_id, total=21)
+    job = _wait_until_finished(store, job_id)
+    runner.stop()
+
+    assert job["status"] == JobStatus.DONE
+    assert (job["processed"], job["failed"]) == (21, 1)
+    rows = [json.loads(line) for line in open(runner.output_path(job_id))]
+    assert [row["row"] for row in rows] == list(range(21))
+    assert rows[0]["unit"] == "PSI"
+    assert rows[-1]["errors"][0]["type"] == "missing"
+
+
+def test_job_resumes_from_checkpoint_after_restart(tmp_path):
+    """
+    output written after the last checkpoint is discarded and rows are not repeated
+    """
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    runner = JobRunner(store, str(tmp_path), workers=1, chunk_size=5)
+    bodies = grid_mix(2, 12)
+
+    # Simulate a worker that checkpointed 5 rows, then died mid-chunk
+    job_id = runner.new_job_id()
+    _write_input(runner, job_id, bodies)
+    store.create(job_id, total=12)
+    first_chunk = b"".join(
+        json.dumps({"row": i, "checkpointed": True}).encode() + b"\n" for i in range(5)
+    )
+    with open(runner.output_path(job_id), "wb") as fh:
+        fh.write(first_chunk + b'{"row": 5, "partial"')
+    input_offset = sum(len(body) + 1 for body in bodies[:5])
+    store.update(
+        job_id,
+        status=JobStatus.RUNNING,
+        processed=5,
+        input_offset=input_offset,
+        output_size=len(first_chunk),
+    )
+
+    runner.start()
+    job = _wait_until_finished(store, job_id)
+    runner.stop()
+
+    rows = [json.loads(line) for line in open(runner.output_path(job_id))]
+    assert job["status"] == JobStatus.DONE
+    assert [row["row"] for row in rows] == list(range(12))
+    assert all(row.get("checkpointed") for row in rows[:5])
+    assert all("front_wheel" in row for row in rows[5:])
+
+
+def test_cancelled_jobs_stay_cancelled(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    runner = JobRunner(store, str(tmp_path), workers=1, chunk_size=1)
+
+    # Cancelled while queued: never started, and not resumed
+    queued = runner.new_job_id()
+    _write_input(runner, queued, grid_mix(3, 5))
+    store.create(queued, total=5)
+    runner.cancel(queued)
+    # Cancelled while running: stops at the next chunk
+    running = runner.new_job_id()
+    _write_input(runner, running, grid_mix(4, 2000))
+    runner.start()
+    runner.submit(running, total=2000)
+    while store.get(running)["status"] != JobStatus.RUNNING:
+        time.sleep(0.001)
+    runner.cancel(running)
+    job = _wait_until_finished(store, running)
+    runner.stop()
+
+    assert store.get(queued)["status"] == JobStatus.CANCELLED
+    assert store.get(queued)["processed"] == 0
+    assert job["status"] == JobStatus.CANCELLED and job["processed"] < 2000
+    assert not store.transition(running, JobStatus.DONE)
+    assert store.get(running)["status"] == JobStatus.CANCELLED
+    assert not runner._cancelled and not runner._running
+    assert store.unfinished() == []
+
+
+def test_submit_validates_before_writing_input(tmp_path):
+    settings = Settings(
+        warmup_enabled=False, request_logging=False, jobs_enabled=True, jobs_dir=str(tmp_path)
+    )
+    items = [json.loads(body) for body in grid_mix(5, 3)]
+    with TestClient(create_app(settings)) as client:
+        assert client.post("/jobs", json={"rows": items}).status_code == 422
+        response = client.post("/jobs", json={"items": items})
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        ndjson = b"\n".join(grid_mix(6, 4))
+        streamed = client.post(
+            "/jobs", content=ndjson, headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert streamed.json()["total"] == 4
+    inputs = sorted(path.name for path in tmp_path.glob("*.input.jsonl"))
+    assert inputs == sorted([f"{job_id}.input.jsonl", f"{streamed.json()['id']}.input.jsonl"])
+
+
+def test_job_endpoints_do_not_block_compute_on_the_store_lock(tmp_path):
+    """
+    while a job worker holds the store lock, job requests wait in the threadpool, not on the loop
+    """
+    settings = Settings(
+        warmup_enabled=False, request_logging=False, jobs_enabled=True, jobs_dir=str(tmp_path)
+    )
+    items = [json.loads(body) for body in grid_mix(8, 2)]
+    with TestClient(create_app(settings)) as client:
+        job_id = client.post("/jobs", json={"items": items}).json()["id"]
+        _wait_until_finished(client.app.state.job_runner.store, job_id)
+        store_lock = client.app.state.job_runner.store._lock
+        responses = {}
+
+        def call(name, method, *args, **kwargs):
+            responses[name] = getattr(client, method)(*args, **kwargs)
+
+        store_lock.acquire()
+        try:
+            blocked = [
+                threading.Thread(
+                    target=call, args=("submit", "post", "/jobs"), kwargs={"json": {"items": items}}
+                ),
+                threading.Thread(target=call, args=("events", "get", f"/jobs/{job_id}/events")),
+            ]
+            for thread in blocked:
+                thread.start()
+            time.sleep(0.2)
+            compute = threading.Thread(
+                target=call, args=("compute", "post", "/compute"), kwargs={"json": items[0]}
+            )
+            compute.start()
+            compute.join(5)
+            assert not compute.is_alive() and responses["compute"].status_code == 200
+            assert "submit" not in responses and "events" not in responses
+        finally:
+            store_lock.release()
+        for thread in blocked:
+            thread.join(10)
+    assert responses["submit"].status_code == 202
+    assert "event: progress" in responses["events"].text
@@ -0,0 +1,25 @@
+from app.schemas import TirePressureRequest
+from tools.loadgen import grid_mix, percentile
+
+
+def test_grid_mix_is_valid_and_repeatable():
+    """
+    generated payloads validate and the same seed gives the same mix
+    """
+    bodies = grid_mix(seed=7, size=64)
+
+    assert bodies == grid_mix(seed=7, size=64)
+    surfaces = set()
+    for body in bodies:
+        request = TirePressureRequest.model_validate_json(body)
+        surfaces.add((request.bike.discipline, request.surface))
+    assert len(surfaces) == 32
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
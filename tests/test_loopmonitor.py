@@ -0,0 +1,47 @@
+import asyncio
+import logging
+import time
+
+from app.core.loopmonitor import LoopMonitor
+from app.core.metrics import metrics
+
+
+async def _blocking_handler():
+    time.sleep(0.3)
+
+
+async def _monitored(monitor: LoopMonitor):
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        await _blocking_handler()
+        await asyncio.sleep(0.1)
+    finally:
+        monitor.stop()
+
+
+def test_blocked_loop_is_logged_with_its_stack(caplog):
+    metrics.reset()
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    with caplog.at_level(logging.WARNING, logger="app.core.loopmonitor"):
+        asyncio.run(_monitored(monitor))
+    assert metrics.counter("event_loop.blocked") == 1
+    assert "_blocking_handler" in caplog.text
+    lags = monitor.percentiles()
+    assert lags["max"] >= 0.2 > lags["p50"]
+
+
+def test_idle_loop_reports_no_blocking(caplog):
+    metrics.reset()
+    monitor = LoopMonitor(interval=0.01, threshold=0.1)
+
+    async def idle():
+        monitor.start()
+        await asyncio.sleep(0.2)
+        monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="app.core.loopmonitor"):
+        asyncio.run(idle())
+    assert metrics.counter("event_loop.blocked") == 0
+    assert not caplog.records
+    assert set(monitor.percentiles()) == {"p50", "p90", "p99", "max"}
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.memory import MemoryProfiler, is_supervisor, rss_bytes
+from app.routers import admin
+
+
+def test_rss_is_reported():
+    assert rss_bytes() > 1024 * 1024
+
+
+def test_siblings_are_only_reported_under_a_supervisor():
+    assert is_supervisor(["/usr/local/bin/uvicorn", "app.main:app", "--workers", "4"])
+    assert is_supervisor(["python3", "-m", "uvicorn", "app.main:app"])
+    assert is_supervisor(["/usr/bin/python3", "/usr/local/bin/gunicorn", "-k", "uvicorn.workers.UvicornWorker"])
+    assert not is_supervisor(["/bin/bash"])
+    assert not is_supervisor(["/sbin/init"])
+    assert not is_supervisor([sys.executable, "-m", "pytest"])
+
+    # This process is not a supervisor: its other children are not workers
+    sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        code = "import os; from app.core.memory import worker_rss; print(len(worker_rss()))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    finally:
+        sibling.kill()
+        sibling.wait()
+    assert output.stdout.strip() == "1"
+
+
+def test_profiler_reports_growth_between_snapshots():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        assert profiler.diff() == []
+        retained = [bytearray(1024) for _ in range(2000)]
+        diff = profiler.diff()
+        assert sum(site["size_diff_bytes"] for site in diff) > 1024 * 1024
+        assert any(__file__ in site["site"] for site in profiler.top(10))
+        del retained
+    finally:
+        profiler.stop()
+    assert profiler.top() == [] and not profiler.tracing
+
+
+def test_admin_memory_requires_token():
+    app = FastAPI()
+    app.state.admin_token = "secret"
+    app.include_router(admin.router)
+    client = TestClient(app)
+
+    assert client.get("/admin/memory").status_code == 403
+    assert client.get("/admin/memory", headers={"x-admin-token": "wrong"}).status_code == 403
+    report = client.get("/admin/memory", headers={"x-admin-token": "secret"}).json()
+    assert report["rss_bytes"] > 0
+    assert report["pid"] in [worker["pid"] for worker in report["workers"]]
+
+
+def test_app_import_does_not_load_numpy():
+    """NumPy is only imported by the endpoints that use it, not when building the app."""
+    code = "import sys; from app.main import app; sys.exit('numpy' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True).returncode == 0
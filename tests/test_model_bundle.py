@@ -0,0 +1,86 @@
+import json
+import math
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import model
+from app.schemas import TirePressureRequest
+from app.services import build_and_compute, coefficients_version
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "golden", "model_vectors.json")
+
+
+def _client_pressure(bundle: dict, request: dict, position: str) -> float:
+    """What a client computes from the bundle alone, without the server's code."""
+    bike = request["bike"]
+    tire, wheel = bike[f"{position.lower()}_tire"], bike[f"{position.lower()}_wheel"]
+    defaults, regression = bundle["defaults"], bundle["regression"]
+
+    width = tire["width"] * bundle["mm_per_inch"] if tire["unit"] == "IN" else tire["width"]
+    compatible = defaults["compatible_rim_width"]
+    for low, high, rim in bundle["rim_width_table"]:
+        if low <= width < high:
+            compatible = rim
+            break
+    effective = width + regression["rim_width_adjustment"] * (wheel["rim_width"] - compatible)
+    diameter = bundle["wheel_diameter_mm"].get(wheel["diameter"], defaults["wheel_diameter_mm"])
+    c = 4.0 * math.pi**2 * (diameter / 2.0 + effective / 2.0) * (effective / 2.0)
+    base = 10 ** regression["base_log10"] * c ** regression["base_exponent"]
+
+    weight = bike["weight"]["value"] + request["rider_weight"]["value"]
+    weight_factor = 1.0 + (
+        regression["weight_lbs_per_kg"] * weight - regression["weight_reference_lbs"]
+    ) * regression["weight_slope"]
+    rim_table = bundle["rim_type_cx"] if bike["discipline"] == "CYCLOCROSS" else bundle["rim_type"]
+    factor = defaults["factor"]
+    return (
+        base
+        * weight_factor
+        * bundle["wheel_position"].get(position, factor)
+        * rim_table.get(wheel["rim_type"], factor)
+        * bundle["discipline"].get(bike["discipline"], factor)
+        * bundle["surface"].get(request["surface"], factor)
+        * bundle["casing"].get(tire["casing"], factor)
+    )
+
+
+def _golden() -> dict:
+    with open(GOLDEN, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def test_golden_vectors_match_the_server():
+    """Regenerate with ``python -m tools.model_vectors`` when coefficients change."""
+    golden = _golden()
+    assert golden["version"] == coefficients_version()
+    for vector in golden["vectors"]:
+        request = TirePressureRequest.model_validate(vector["request"])
+        result = build_and_compute(request.bike, request.surface, request.rider_weight)
+        assert result.model_dump(mode="json") == vector["expected"]
+
+
+def test_bundle_reproduces_golden_vectors():
+    client = TestClient(FastAPI(routes=model.router.routes))
+    bundle = client.get("/model").json()
+    golden = _golden()
+    assert bundle["version"] == golden["version"]
+    for vector in golden["vectors"]:
+        for position in ("FRONT", "REAR"):
+            expected = vector["expected"][f"{position.lower()}_wheel"]
+            computed = _client_pressure(bundle, vector["request"], position)
+            assert abs(round(computed, bundle["decimals"]) - expected) <= golden["tolerance_psi"]
+
+
+def test_bundle_revalidation():
+    client = TestClient(FastAPI(routes=model.router.routes))
+    first = client.get("/model")
+    etag = first.headers["etag"]
+    assert etag == f'"{coefficients_version()}"'
+    assert first.headers["cache-control"] == "no-cache"
+
+    revalidated = client.get("/model", headers={"if-none-match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert client.get("/model", headers={"if-none-match": '"stale"'}).status_code == 200
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.columnar import pressure_columns, request_columns
+from app.core.admission import Rejected
+from app.core.config import Settings
+from app.core.execution import ClientDisconnected
+from app.core.metrics import metrics
+from app.main import create_app
+from app.offload import ProcessPool
+from app.schemas import TirePressureRequest
+from app.services import build_and_compute
+from tools.loadgen import grid_mix
+
+
+COLUMNAR = {
+    "discipline": "ROAD",
+    "surface": "DRY",
+    "rider_weight_kg": [50.0 + i for i in range(50)],
+    "bike_weight_kg": 8.0,
+    "front_tire_width": 28.0,
+    "rear_tire_width": 28.0,
+    "front_casing": "STANDARD",
+    "rear_casing": "STANDARD",
+    "front_rim_width": 23.0,
+    "rear_rim_width": 23.0,
+    "front_rim_type": "HOOKLESS",
+    "rear_rim_type": "HOOKLESS",
+    "front_diameter": "700C",
+    "rear_diameter": "700C",
+}
+
+
+def _slow_echo(columns):
+    time.sleep(0.05)
+    return columns["x"], columns["x"]
+
+
+async def _run_pool(pool: ProcessPool, coroutine):
+    pool.start()
+    try:
+        return await coroutine
+    finally:
+        pool.stop()
+
+
+def test_chunks_are_computed_in_worker_processes():
+    requests = [TirePressureRequest.model_validate_json(body) for body in grid_mix(6, 300)]
+    pool = ProcessPool(2, chunk_rows=64)
+    front, rear = asyncio.run(
+        _run_pool(pool, pool.map_rows(pressure_columns, request_columns(requests)))
+    )
+    for i, request in enumerate(requests):
+        expected = build_and_compute(request.bike, request.surface, request.rider_weight)
+        assert round(float(front[i]), 1) == expected.front_wheel
+        assert round(float(rear[i]), 1) == expected.rear_wheel
+
+
+def test_queue_is_bounded_and_disconnects_cancel_work():
+    pool = ProcessPool(1, max_pending=1, chunk_rows=10, poll_interval=0.01)
+    columns = {"x": np.arange(2000, dtype=np.float64)}
+
+    async def gone():
+        return True
+
+    async def scenario():
+        first = asyncio.create_task(pool.map_rows(_slow_echo, columns, gone))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected):
+            await pool.map_rows(_slow_echo, columns)
+        started = time.perf_counter()
+        with pytest.raises(ClientDisconnected):
+            await first
+        return time.perf_counter() - started
+
+    # 200 chunks of 50 ms would take 10 s; the rest are cancelled instead
+    assert asyncio.run(_run_pool(pool, scenario())) < 5
+    assert pool.pending == 0
+
+
+def test_large_batches_use_the_pool():
+    metrics.reset()
+    settings = Settings(
+        warmup_enabled=False,
+        request_logging=False,
+        process_pool_workers=1,
+        process_pool_chunk_rows=16,
+        execution_process_min_cost=30,
+    )
+    payloads = [json.loads(body) for body in grid_mix(8, 40)]
+    with TestClient(create_app(settings)) as client:
+        response = client.post("/batch", json={"items": payloads})
+        small = client.post("/batch", json={"items": payloads[:5]})
+        columnar = client.post("/batch/columnar", json=COLUMNAR).json()
+    assert response.status_code == small.status_code == 200
+    for payload, item in zip(payloads, response.json()["items"]):
+        request = TirePressureRequest.model_validate(payload)
+        expected = build_and_compute(request.bike, request.surface, request.rider_weight)
+        assert item == expected.model_dump(mode="json")
+    assert metrics.counter("execution.batch.process") == 1
+    assert metrics.counter("execution.batch_columnar.process") == 1
+    # 40 items and 50 rows in chunks of 16
+    assert metrics.counter("process_pool.chunks") == 3 + 4
+    assert len(columnar["front_wheel"]) == 50
+    assert columnar["front_wheel"] == sorted(columnar["front_wheel"])
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import random
+
+from app.core.cache import LRUCache
+from app.core.sketch import CountMinSketch, TopK
+from app.popularity import PopularityTracker, config_key
+from app.presets import POPULAR_PRESETS, PRESET_RIDER_WEIGHTS_KG
+from app.schemas import TirePressureRequest
+from app.warmup import build_warmer
+
+
+def _request(preset: dict, rider_kg: float, surface: str = "DRY") -> TirePressureRequest:
+    return TirePressureRequest.model_validate(
+        {"bike": preset, "surface": surface, "rider_weight": {"value": rider_kg, "unit": "kg"}}
+    )
+
+
+def test_count_min_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(1000):
+        sketch.add(i % 50)
+    assert all(sketch.estimate(i) >= 20 for i in range(50))
+
+
+def test_top_k_finds_heavy_hitters_in_a_long_tail():
+    rng = random.Random(7)
+    stream = ["hot-a"] * 500 + ["hot-b"] * 300 + [f"rare-{rng.random()}" for _ in range(5000)]
+    rng.shuffle(stream)
+    top = TopK(capacity=10, width=512, depth=4)
+    for key in stream:
+        top.add(key)
+
+    ranked = top.top(2)
+    assert [key for key, _ in ranked] == ["hot-a", "hot-b"]
+    assert ranked[0][1] >= 500
+    assert len(top.top()) == 10
+
+
+def test_rider_weight_is_not_part_of_the_configuration():
+    assert config_key(_request(POPULAR_PRESETS[0], 60)) == config_key(_request(POPULAR_PRESETS[0], 85))
+    assert config_key(_request(POPULAR_PRESETS[0], 60)) != config_key(_request(POPULAR_PRESETS[0], 60, "WET"))
+
+
+def test_top_configurations_seed_warm_up(tmp_path):
+    """A saved top-K export warms the cache for every common rider weight."""
+    tracker = PopularityTracker(capacity=5)
+    for _ in range(3):
+        tracker.record(_request(POPULAR_PRESETS[1], 70))
+    tracker.record(_request(POPULAR_PRESETS[2], 70))
+
+    export = tracker.top(1)
+    assert export["total"] == 4
+    assert export["configurations"][0]["count"] == 3
+    path = tmp_path / "popular.json"
+    path.write_text(json.dumps(export))
+
+    cache = LRUCache(maxsize=1000)
+    warmer = build_warmer(cache, str(path), limit=1000)
+    asyncio.run(warmer.run())
+    assert warmer.progress()["done"] == len(PRESET_RIDER_WEIGHTS_KG)
+    assert config_key(warmer.load()[0]) == config_key(_request(POPULAR_PRESETS[1], 70))
@@ -0,0 +1,34 @@
+from app.presets import POPULAR_PRESETS
+from app.route_plan import plan_route
+from app.schemas import RoutePlanRequest, Weight
+from app.services import build_and_compute
+
+
+def _plan(segments) -> RoutePlanRequest:
+    return RoutePlanRequest.model_validate(
+        {
+            "bike": POPULAR_PRESETS[7],
+            "rider_weight": {"value": 72, "unit": "kg"},
+            "segments": [{"surface": s, "distance_km": d} for s, d in segments],
+        }
+    )
+
+
+def test_segments_match_single_requests():
+    payload = _plan([("DRY", 12.0), ("MIXED", 30.0), ("WET", 4.5), ("DRY", 3.5)])
+    result = plan_route(payload)
+
+    rider = Weight(value=72, unit="kg")
+    assert result.segments == [
+        build_and_compute(payload.bike, segment.surface, rider) for segment in payload.segments
+    ]
+    assert result.total_distance_km == 50.0
+
+
+def test_compromise_is_distance_weighted():
+    """Equal distances on DRY (factor 1.0) and SNOW (0.5) average to 0.75 of dry."""
+    dry = plan_route(_plan([("DRY", 1.0)])).compromise
+    mixed = plan_route(_plan([("DRY", 10.0), ("SNOW", 10.0)])).compromise
+    assert abs(mixed.front_wheel - 0.75 * dry.front_wheel) <= 0.1
+    assert abs(mixed.rear_wheel - 0.75 * dry.rear_wheel) <= 0.1
+    assert plan_route(_plan([("WET", 3.0)] * 1000)).compromise == plan_route(_plan([("WET", 1.0)])).segments[0]
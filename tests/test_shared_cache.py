@@ -0,0 +1,101 @@
+import fcntl
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from app.core.shared_cache import WAYS, SharedResultCache
+from app.schemas import PressureUnitEnum, TirePressure
+
+
+RESULT = TirePressure(front_wheel=51.0, rear_wheel=54.3, unit=PressureUnitEnum.PSI)
+
+
+def _put_from_child(path: str):
+    cache = SharedResultCache(path, slots=64, version="v1")
+    cache.put(("ROAD", "DRY", 6.8, 58.0), RESULT)
+    cache.close()
+
+
+def _hold_lock(path: str, locked, release):
+    fd = os.open(path, os.O_RDWR)
+    fcntl.lockf(fd, fcntl.LOCK_EX)
+    locked.set()
+    release.wait(10)
+    os.close(fd)
+
+
+def test_entries_are_shared_between_processes(tmp_path):
+    """
+    an entry written by another process is served here
+    """
+    path = str(tmp_path / "cache")
+    cache = SharedResultCache(path, slots=64, version="v1")
+    assert cache.get(("ROAD", "DRY", 6.8, 58.0)) is None
+
+    child = multiprocessing.get_context("spawn").Process(target=_put_from_child, args=(path,))
+    child.start()
+    child.join()
+
+    assert cache.get(("ROAD", "DRY", 6.8, 58.0)) == RESULT
+    assert cache.stats()["hits"] == 1
+    cache.close()
+
+
+def test_entries_from_other_coefficient_version_are_ignored(tmp_path):
+    path = str(tmp_path / "cache")
+    old = SharedResultCache(path, slots=64, version="v1")
+    old.put("key", RESULT)
+
+    new = SharedResultCache(path, slots=64, version="v2")
+    assert new.get("key") is None
+    new.put("key", TirePressure(front_wheel=1.0, rear_wheel=2.0, unit=PressureUnitEnum.PSI))
+
+    assert new.get("key").front_wheel == 1.0
+    assert old.get("key") is None
+    old.close()
+    new.close()
+
+
+def test_full_bucket_evicts(tmp_path):
+    cache = SharedResultCache(str(tmp_path / "cache"), slots=WAYS, version="v1")
+    for i in range(WAYS + 3):
+        cache.put(i, RESULT)
+
+    assert cache.stats()["evictions"] == 3
+    assert sum(cache.get(i) is not None for i in range(WAYS + 3)) == WAYS
+    cache.close()
+
+
+def test_put_skips_a_bucket_locked_by_another_process(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = SharedResultCache(path, slots=64, version="v1")
+    context = multiprocessing.get_context("spawn")
+    locked, release = context.Event(), context.Event()
+    child = context.Process(target=_hold_lock, args=(path, locked, release))
+    child.start()
+    try:
+        assert locked.wait(10)
+        started = time.perf_counter()
+        cache.put("key", RESULT)
+        assert time.perf_counter() - started < 0.5
+    finally:
+        release.set()
+        child.join()
+
+    assert cache.get("key") is None
+    assert cache.stats()["skipped"] == 1
+    cache.put("key", RESULT)
+    assert cache.get("key") == RESULT
+    cache.close()
+
+
+def test_other_slot_counts_are_refused_not_reformatted(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = SharedResultCache(path, slots=64, version="v1")
+    cache.put("key", RESULT)
+    with pytest.raises(ValueError):
+        SharedResultCache(path, slots=128, version="v1")
+    assert cache.get("key") == RESULT
+    cache.close()
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app import services
+from app.core.cache import ShardedLRUCache
+from app.schemas import TirePressureRequest
+from app.services import GeometryCache, PressureCalculator
+from tools.loadgen import grid_mix
+from tools.threadbench import run
+
+
+def test_geometry_cache_matches_the_formula_and_stays_bounded():
+    cache = GeometryCache(4)
+    for width in (25, 28, 32, 40, 50, 28):
+        assert cache(width, 23, 622) == PressureCalculator._geometry_base(width, 23, 622)
+    info = cache.cache_info()
+    assert info.currsize == 4 and info.maxsize == 4
+    # 50 evicted the oldest entry (25); 28 was still cached
+    assert info.misses == 5 and info.hits == 1
+    cache(25, 23, 622)
+    assert cache.cache_info().misses == 6
+
+
+def test_sharded_cache_is_bounded_and_reports_totals():
+    cache = ShardedLRUCache(64, 8)
+    for key in range(200):
+        cache.put(key, key)
+    assert len(cache) <= 64
+    assert cache.get(199) == 199
+    stats = cache.stats()
+    assert stats["shards"] == 8 and stats["maxsize"] == 64
+    assert stats["size"] == len(cache) and stats["evictions"] == 200 - len(cache)
+
+
+def test_concurrent_computation_matches_serial(monkeypatch):
+    """Small caches force evictions while 8 threads compute at once."""
+    monkeypatch.setattr(services, "geometry_base", GeometryCache(16))
+    requests = [TirePressureRequest.model_validate_json(body) for body in grid_mix(3, 400)]
+    expected = [
+        services.build_and_compute(r.bike, r.surface, r.rider_weight) for r in requests
+    ]
+    cache = ShardedLRUCache(50, 4)
+
+    def compute(request):
+        return services.cached_compute(request.bike, request.surface, request.rider_weight, cache)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(compute, requests * 5))
+    assert results == expected * 5
+
+
+def test_threadbench_runs():
+    assert run(2, grid_mix(1, 20), 100, None, parse=True) > 0
@@ -0,0 +1,71 @@
+from .conftest import (
+    TIRE_ROAD_STANDARD_FRONT,
+    TIRE_ROAD_STANDARD_REAR,
+    WHEEL_ROAD_HOOKLESS_700C_FRONT,
+    WHEEL_ROAD_HOOKLESS_700C_REAR,
+)
+from app.core.tracing import RingBufferExporter, Tracer, span
+from app.schemas import (
+    DisciplineEnum,
+    SurfaceEnum,
+    WeightUnitEnum,
+    Weight,
+    Bike,
+)
+from app.services import build_and_compute
+
+
+ROAD_BIKE = Bike(
+    name="custom_road_bike",
+    discipline=DisciplineEnum.ROAD,
+    front_tire=TIRE_ROAD_STANDARD_FRONT,
+    rear_tire=TIRE_ROAD_STANDARD_REAR,
+    front_wheel=WHEEL_ROAD_HOOKLESS_700C_FRONT,
+    rear_wheel=WHEEL_ROAD_HOOKLESS_700C_REAR,
+    weight=Weight(value=6.8, unit=WeightUnitEnum.KG),
+)
+
+
+def test_unsampled_trace_records_nothing():
+    """
+    sampling off -> no trace started and spans are no-ops
+    """
+    exporter = RingBufferExporter(capacity=10)
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    assert tracer.start() is None
+    with span("ignored"):
+        build_and_compute(ROAD_BIKE, SurfaceEnum.DRY, Weight(value=58, unit=WeightUnitEnum.KG))
+    assert exporter.snapshot() == []
+
+
+def test_sampled_trace_covers_builder_and_each_wheel():
+    """
+    sampling on -> builder setup and both wheels are children of the root span
+    """
+    exporter = RingBufferExporter(capacity=10)
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    token = tracer.start()
+    with span("root"):
+        build_and_compute(ROAD_BIKE, SurfaceEnum.DRY, Weight(value=58, unit=WeightUnitEnum.KG))
+    tracer.finish(token)
+
+    spans = {s["name"]: s for s in exporter.snapshot()}
+    assert set(spans) == {"root", "builder.setup", "calculate.front", "calculate.rear"}
+    for name in ("builder.setup", "calculate.front", "calculate.rear"):
+        assert spans[name]["parent_id"] == spans["root"]["span_id"]
+        assert spans[name]["trace_id"] == spans["root"]["trace_id"]
+
+
+def test_ring_buffer_keeps_most_recent_spans():
+    exporter = RingBufferExporter(capacity=3)
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    for i in range(5):
+        token = tracer.start()
+        with span(f"span-{i}"):
+            pass
+        tracer.finish(token)
+
+    assert [s["name"] for s in exporter.snapshot()] == ["span-2", "span-3", "span-4"]
@@ -0,0 +1,34 @@
+from app.presets import POPULAR_PRESETS
+from app.schemas import UncertaintyRequest
+from app.uncertainty import uncertainty_bands
+
+
+def _request(**uncertainty) -> UncertaintyRequest:
+    return UncertaintyRequest.model_validate(
+        {
+            "bike": POPULAR_PRESETS[7],
+            "surface": "MIXED",
+            "rider_weight": {"value": 72, "unit": "kg"},
+            "uncertainty": uncertainty,
+        }
+    )
+
+
+def test_bands_are_reproducible_and_ordered():
+    first = uncertainty_bands(_request(seed=42))
+    assert first == uncertainty_bands(_request(seed=42))
+    assert first != uncertainty_bands(_request(seed=43))
+
+    bands = list(first.front_wheel.values())
+    assert list(first.front_wheel) == ["p5", "p25", "p50", "p75", "p95"]
+    assert bands == sorted(bands) and bands[0] < bands[-1]
+    assert abs(first.rear_wheel["p50"] - first.nominal.rear_wheel) < 1.0
+
+
+def test_without_noise_bands_collapse_to_nominal():
+    """The vectorized formula matches the scalar one sample for sample."""
+    result = uncertainty_bands(
+        _request(samples=100, rider_weight_sd=0, tire_width_sd_mm=0, rim_width_sd_mm=0, percentiles=[0, 100])
+    )
+    assert result.front_wheel == {"p0": result.nominal.front_wheel, "p100": result.nominal.front_wheel}
+    assert result.rear_wheel == {"p0": result.nominal.rear_wheel, "p100": result.nominal.rear_wheel}
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app.core.cache import LRUCache
+from app.presets import POPULAR_PRESETS, PRESET_RIDER_WEIGHTS_KG
+from app.schemas import SurfaceEnum, TirePressureRequest
+from app.services import build_and_compute, cached_compute
+from app.warmup import CacheWarmer, build_warmer
+from tools.loadgen import grid_mix
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_warmer_fills_cache_with_presets():
+    """
+    warm-up covers every preset x surface x rider weight and matches uncached results
+    """
+    cache = LRUCache(maxsize=100_000)
+    warmer = build_warmer(cache)
+    asyncio.run(warmer.run())
+
+    expected = len(POPULAR_PRESETS) * len(SurfaceEnum) * len(PRESET_RIDER_WEIGHTS_KG)
+    assert warmer.progress()["state"] == "done"
+    assert warmer.progress()["done"] == expected
+    assert len(cache) == expected
+
+    request = warmer.load()[123]
+    assert cached_compute(request.bike, request.surface, request.rider_weight, cache) == (
+        build_and_compute(request.bike, request.surface, request.rider_weight)
+    )
+    assert cache.hits == 1
+
+
+def test_preset_warmup_respects_the_limit():
+    cache = LRUCache(maxsize=1000)
+    warmer = build_warmer(cache, limit=1000)
+    asyncio.run(warmer.run())
+    assert warmer.progress()["total"] <= 1000
+    assert cache.stats()["evictions"] == 0
+
+
+def test_capture_warmup_skips_corrupt_lines(tmp_path):
+    bodies = grid_mix(9, 4)
+    lines = [
+        json.dumps({"payload": json.loads(bodies[0])}),
+        bodies[1].decode(),
+        '{"payload": {"bike": {"name": "trunc',
+        "[1, 2, 3]",
+        "not json",
+        bodies[1].decode(),
+        bodies[2].decode(),
+    ]
+    path = tmp_path / "traffic.jsonl"
+    path.write_text("\n".join(lines) + "\n" + bodies[3].decode()[:40])
+
+    cache = LRUCache(maxsize=100)
+    warmer = build_warmer(cache, str(path), limit=10)
+    asyncio.run(warmer.run())
+    assert warmer.progress()["state"] == "done"
+    assert warmer.progress()["total"] == 3
+    # The most frequent configuration comes first
+    request = TirePressureRequest.model_validate_json(bodies[1])
+    assert warmer.load()[0] == request
+
+
+def test_warmer_reports_failure():
+    def broken():
+        raise RuntimeError("boom")
+
+    warmer = CacheWarmer(broken, LRUCache(maxsize=10))
+    asyncio.run(warmer.run())
+    assert warmer.progress()["state"] == "failed"
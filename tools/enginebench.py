@@ -0,0 +1,397 @@
+"""Check that every calculation engine agrees with the scalar calculator, and time each one.
+
+The reference is ``build_and_compute``. Every other engine computes the
+same cases: the vectorized columns, the result caches (served from a warm
+cache), the command-line calculator, the fleet matrix, the flat ``/v2``
+path and the process pool. Cases cover every discipline x surface x rim
+type x casing x diameter combination, both sides of every
+``RIM_WIDTH_TABLE`` edge, the 113-114 mm gap, widths outside the table
+and inch widths, plus random inputs.
+
+Results are compared after rounding to 0.1 PSI, and must match exactly:
+a one-step (0.1 PSI) difference is the rounding or table-edge drift this
+check exists to catch. For each engine the report gives the largest
+difference from the reference, the number of cases that differ, and the
+throughput. Inputs are converted to each engine's own form before timing.
+The exit status is 1 when any engine differs on any case.
+
+Examples:
+    python -m tools.enginebench
+    python -m tools.enginebench --random 50000 --repeat 5 --engines scalar,columnar,flat_v2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app import calc, services
+from app.core.cache import LRUCache, ShardedLRUCache
+from app.enums import CasingEnum, DiameterEnum, DisciplineEnum, RimTypeEnum, SurfaceEnum
+from app.schemas import TirePressureRequest, TirePressureRequestV2
+from tools.schemabench import flat_payload
+
+# Fleet requests are cross products; only their diagonal is compared
+FLEET_SIZE = 16
+
+Results = Tuple[List[float], List[float]]
+# An engine gets the cases and an ExitStack for its cleanup, and returns a
+# runner computing every case plus the number of configurations it evaluates
+Engine = Callable[[List[dict], contextlib.ExitStack], Tuple[Callable[[], Results], int]]
+
+
+def _payload(
+    discipline: str,
+    surface: str,
+    rider_kg: float,
+    bike_kg: float,
+    front: Tuple[float, str, str, float, str, str],
+    rear: Tuple[float, str, str, float, str, str],
+    rider_unit: str = "kg",
+) -> dict:
+    """A ``/compute`` body; ``front`` and ``rear`` are (width, unit, casing, rim width, rim type, diameter)."""
+    bike = {"name": "engine check", "discipline": discipline, "weight": {"value": bike_kg, "unit": "kg"}}
+    for position, (width, unit, casing, rim_width, rim_type, diameter) in (("front", front), ("rear", rear)):
+        bike[f"{position}_tire"] = {
+            "width": width, "unit": unit, "casing": casing, "position": position.upper(),
+        }
+        bike[f"{position}_wheel"] = {
+            "rim_width": rim_width, "rim_type": rim_type, "diameter": diameter, "position": position.upper(),
+        }
+    return {"bike": bike, "surface": surface, "rider_weight": {"value": rider_kg, "unit": rider_unit}}
+
+
+def boundary_widths() -> List[float]:
+    """Tire widths (mm) on both sides of every rim width range edge, in the 113-114 gap and outside the table."""
+    widths = {10.0, 17.99, 113.0, 113.5, 113.99, 114.0, 140.0}
+    for entry in services.PressureCalculator.RIM_WIDTH_TABLE:
+        widths.update({float(entry["min"]), entry["max"] - 0.01, float(entry["max"])})
+    return sorted(widths)
+
+
+def edge_cases() -> List[dict]:
+    """Every enum combination, every rim width table edge, and inch widths."""
+    cases = []
+    rim_types = [member.value for member in RimTypeEnum]
+    casings = [member.value for member in CasingEnum]
+
+    # Every combination; the rear wheel uses the next rim type and casing
+    combos = [
+        (discipline, surface, rim_type, casing, diameter)
+        for discipline in DisciplineEnum
+        for surface in SurfaceEnum
+        for rim_type in range(len(rim_types))
+        for casing in range(len(casings))
+        for diameter in DiameterEnum
+    ]
+    for i, (discipline, surface, rim_type, casing, diameter) in enumerate(combos):
+        front = (28 + i % 5 * 7, "MM", casings[casing], 21 + i % 3 * 2, rim_types[rim_type], diameter.value)
+        rear = (
+            front[0], "MM", casings[(casing + 1) % len(casings)],
+            front[3], rim_types[(rim_type + 1) % len(rim_types)], diameter.value,
+        )
+        cases.append(_payload(discipline.value, surface.value, 50 + i % 60, 7 + i % 10, front, rear))
+
+    # Table edges on every diameter, with the rear tire on the other side of the edge
+    widths = boundary_widths()
+    for i, width in enumerate(widths):
+        for diameter in DiameterEnum:
+            front = (width, "MM", "STANDARD", 25.0, "HOOKLESS", diameter.value)
+            rear = (widths[(i + 1) % len(widths)], "MM", "THIN", 30.0, "HOOKED", diameter.value)
+            cases.append(_payload("GRAVEL", "DRY", 72.0, 9.5, front, rear))
+
+    # Inch widths, some converting into the 113-114 gap (4.48 in = 113.79 mm)
+    for width in (0.7, 0.87, 1.9, 2.25, 2.6, 3.0, 4.45, 4.48, 4.5, 4.8, 5.2):
+        front = (width, "IN", "REINFORCED", 30.0, "HOOKED", "29")
+        rear = (width, "IN", "DOWNHILL_CASING", 35.0, "TUBES", "27.5")
+        cases.append(_payload("MTB_TRAIL", "MIXED", 85.0, 14.0, front, rear))
+
+    # Weights are used as given, whatever their unit
+    road = (28.0, "MM", "STANDARD", 23.0, "HOOKLESS", "700C")
+    cases.append(_payload("ROAD", "WET", 165.0, 8.0, road, road, rider_unit="lbs"))
+    return cases
+
+
+def random_cases(seed: int, size: int) -> List[dict]:
+    """Random inputs over every enum value and realistic number ranges."""
+    rng = random.Random(seed)
+
+    def wheel() -> tuple:
+        unit = rng.choice(("MM", "IN"))
+        width = rng.uniform(15.0, 140.0)
+        return (
+            round(width / 25.4, 3) if unit == "IN" else round(width, 2),
+            unit,
+            rng.choice(list(CasingEnum)).value,
+            round(rng.uniform(15.0, 100.0), 1),
+            rng.choice(list(RimTypeEnum)).value,
+            rng.choice(list(DiameterEnum)).value,
+        )
+
+    return [
+        _payload(
+            rng.choice(list(DisciplineEnum)).value,
+            rng.choice(list(SurfaceEnum)).value,
+            round(rng.uniform(30.0, 150.0), 1),
+            round(rng.uniform(5.0, 25.0), 1),
+            wheel(),
+            wheel(),
+        )
+        for _ in range(size)
+    ]
+
+
+# --- Engines ---
+
+
+def _parsed(cases: List[dict]) -> List[TirePressureRequest]:
+    return [TirePressureRequest.model_validate(case) for case in cases]
+
+
+def _pairs(results) -> Results:
+    pairs = list(results)
+    return [front for front, _ in pairs], [rear for _, rear in pairs]
+
+
+def scalar(cases, stack):
+    requests = _parsed(cases)
+
+    def run():
+        results = [services.build_and_compute(r.bike, r.surface, r.rider_weight) for r in requests]
+        return _pairs((result.front_wheel, result.rear_wheel) for result in results)
+
+    return run, len(cases)
+
+
+def columnar(cases, stack):
+    from app.columnar import calculate_columns, request_columns
+
+    columns = request_columns(_parsed(cases))
+
+    def run():
+        front, rear = calculate_columns(columns)
+        return front.tolist(), rear.tolist()
+
+    return run, len(cases)
+
+
+def _cached(cache) -> Engine:
+    def engine(cases, stack):
+        requests = _parsed(cases)
+        # Timed on a warm cache: every lookup is a hit
+        for r in requests:
+            services.cached_compute(r.bike, r.surface, r.rider_weight, cache)
+
+        def run():
+            results = [
+                services.cached_compute(r.bike, r.surface, r.rider_weight, cache) for r in requests
+            ]
+            return _pairs((result.front_wheel, result.rear_wheel) for result in results)
+
+        return run, len(cases)
+
+    return engine
+
+
+def cached_lru(cases, stack):
+    return _cached(LRUCache(len(cases)))(cases, stack)
+
+
+def cached_sharded(cases, stack):
+    # Room to spare, since shards fill unevenly
+    return _cached(ShardedLRUCache(2 * len(cases), max(2, os.cpu_count() or 1)))(cases, stack)
+
+
+def cached_shared(cases, stack):
+    from app.core.shared_cache import SharedResultCache
+
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    # Room to spare, so few keys collide in a full bucket
+    cache = SharedResultCache(
+        os.path.join(directory, "results.cache"), 4 * len(cases), services.coefficients_version()
+    )
+    stack.callback(cache.close)
+    return _cached(cache)(cases, stack)
+
+
+def calc_cli(cases, stack):
+    def run():
+        return _pairs(calc.compute(case) for case in cases)
+
+    return run, len(cases)
+
+
+def flat_v2(cases, stack):
+    requests = [TirePressureRequestV2.model_validate(flat_payload(case)) for case in cases]
+
+    def run():
+        return _pairs(services.compute_flat(request) for request in requests)
+
+    return run, len(cases)
+
+
+def fleet(cases, stack):
+    from app.fleet import fleet_matrix
+    from app.schemas import FleetRequest
+
+    # Cases sharing a surface, FLEET_SIZE at a time; case i is rider i on bike i
+    by_surface: Dict[str, List[int]] = {}
+    for index, case in enumerate(cases):
+        by_surface.setdefault(case["surface"], []).append(index)
+    groups = []
+    for surface, indexes in by_surface.items():
+        for start in range(0, len(indexes), FLEET_SIZE):
+            chunk = indexes[start : start + FLEET_SIZE]
+            request = FleetRequest(
+                riders=[
+                    {"name": str(i), "weight": cases[i]["rider_weight"]} for i in chunk
+                ],
+                bikes=[cases[i]["bike"] for i in chunk],
+                surfaces=[surface],
+            )
+            groups.append((chunk, request))
+
+    def run():
+        front, rear = [0.0] * len(cases), [0.0] * len(cases)
+        for chunk, request in groups:
+            matrix = fleet_matrix(request)
+            for k, i in enumerate(chunk):
+                front[i] = matrix.front_wheel[k][k][0]
+                rear[i] = matrix.rear_wheel[k][k][0]
+        return front, rear
+
+    evaluated = sum(len(chunk) ** 2 for chunk, _ in groups)
+    return run, evaluated
+
+
+def _offload(workers: int) -> Engine:
+    def engine(cases, stack):
+        from app.columnar import calculate_columns, request_columns
+        from app.offload import ProcessPool
+
+        columns = request_columns(_parsed(cases))
+        pool = ProcessPool(workers, chunk_rows=max(1, math.ceil(len(cases) / workers)))
+        pool.start()
+        stack.callback(pool.stop)
+
+        def run():
+            front, rear = asyncio.run(pool.map_rows(calculate_columns, columns))
+            return front.tolist(), rear.tolist()
+
+        # The first call waits for the workers to start
+        run()
+        return run, len(cases)
+
+    return engine
+
+
+ENGINES: Dict[str, Engine] = {
+    "scalar": scalar,
+    "columnar": columnar,
+    "cached_lru": cached_lru,
+    "cached_sharded": cached_sharded,
+    "cached_shared": cached_shared,
+    "calc_cli": calc_cli,
+    "flat_v2": flat_v2,
+    "fleet": fleet,
+    "offload": _offload(2),
+}
+
+
+def _deviation(reference: Results, results: Results) -> Tuple[float, int, int]:
+    """Largest absolute difference, cases that differ, and the first one that does (-1 if none)."""
+    worst, differing, first = 0.0, 0, -1
+    for i, expected in enumerate(zip(*reference)):
+        got = (results[0][i], results[1][i])
+        difference = max(abs(got[0] - expected[0]), abs(got[1] - expected[1]))
+        if difference > 1e-9:
+            differing += 1
+            first = i if first < 0 else first
+        worst = max(worst, difference)
+    return round(worst, 6), differing, first
+
+
+def compare(cases: List[dict], engines: Dict[str, Engine] = None, repeat: int = 3) -> dict:
+    """Run ``engines`` (all of ``ENGINES`` by default) on ``cases`` against the scalar reference."""
+    engines = ENGINES if engines is None else engines
+    report = {"cases": len(cases), "engines": {}}
+    with contextlib.ExitStack() as stack:
+        reference_run, _ = scalar(cases, stack)
+        reference = reference_run()
+        for name, engine in engines.items():
+            run, evaluated = engine(cases, stack)
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                results = run()
+                best = min(best, time.perf_counter() - started)
+            worst, differing, first = _deviation(reference, results)
+            entry = {
+                "max_deviation_psi": worst,
+                "differing": differing,
+                "cases_per_s": round(len(cases) / best),
+                "evaluated_per_s": round(evaluated / best),
+                # Rounded results match exactly, or not at all
+                "ok": differing == 0,
+            }
+            if first >= 0:
+                entry["first_differing_case"] = cases[first]
+            report["engines"][name] = entry
+    report["ok"] = all(entry["ok"] for entry in report["engines"].values())
+    return report
+
+
+def print_table(report: dict, out=sys.stdout):
+    scalar_rate = report["engines"].get("scalar", {}).get("cases_per_s")
+    print(f"{report['cases']} cases, rounded results must match exactly", file=out)
+    header = f"{'engine':<16}{'max dev':>9}{'differ':>8}{'cases/s':>12}{'evaluated/s':>13}{'vs scalar':>11}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for name, entry in report["engines"].items():
+        speedup = f"{entry['cases_per_s'] / scalar_rate:.2f}x" if scalar_rate else "-"
+        flag = "" if entry["ok"] else "  FAIL"
+        print(
+            f"{name:<16}{entry['max_deviation_psi']:>9.3f}{entry['differing']:>8}"
+            f"{entry['cases_per_s']:>12,}{entry['evaluated_per_s']:>13,}{speedup:>11}{flag}",
+            file=out,
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--random", type=int, default=10000, help="random cases added to the edge cases")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per engine; the best is reported")
+    parser.add_argument(
+        "--engines", default=",".join(ENGINES), help=f"comma-separated subset of: {', '.join(ENGINES)}"
+    )
+    parser.add_argument("--workers", type=int, default=2, help="processes for the offload engine")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    engines = {}
+    for name in args.engines.split(","):
+        if name not in ENGINES:
+            parser.error(f"unknown engine {name!r}")
+        engines[name] = _offload(args.workers) if name == "offload" else ENGINES[name]
+
+    report = compare(edge_cases() + random_cases(args.seed, args.random), engines, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+        for name, entry in report["engines"].items():
+            if not entry["ok"]:
+                print(f"{name} first differs on {json.dumps(entry['first_differing_case'])}", file=sys.stderr)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
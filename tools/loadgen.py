@@ -0,0 +1,437 @@
+"""Async load generator for the tire pressure backend.
+
+Drives a running (or freshly spawned) instance with either a fixed number of
+concurrent clients (closed loop) or a fixed arrival rate (open loop) and
+reports throughput, latency percentiles and error rates.
+
+Examples:
+    python -m tools.loadgen --concurrency 32 --duration 20
+    python -m tools.loadgen --rate 500 --duration 30 --spawn --workers 4
+    python -m tools.loadgen --scenario scenario.json --output run.json
+
+A scenario file is a JSON object using the long option names as keys
+(e.g. ``{"rate": 200, "duration": 30, "seed": 7}``); command-line flags
+override it. With the same seed, every run sends the same payload sequence.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.schemas import DisciplineEnum, SurfaceEnum
+
+# Typical equipment per discipline: tire width (mm), inner rim width (mm),
+# wheel diameter, rim type and bike weight (kg)
+DISCIPLINE_PRESETS = {
+    DisciplineEnum.ROAD: ([25, 28, 30, 32], [19, 21, 23, 25], ["700C"], ["HOOKLESS", "HOOKED", "TUBES"], (6.8, 9.0)),
+    DisciplineEnum.CYCLOCROSS: ([33], [21, 23, 25], ["700C"], ["TUBULAR", "HOOKLESS", "HOOKED"], (7.5, 9.5)),
+    DisciplineEnum.GRAVEL: ([38, 40, 45, 50], [23, 25, 27], ["700C", "650B"], ["HOOKLESS", "HOOKED"], (8.5, 11.0)),
+    DisciplineEnum.MTB_XC: ([55.9, 58.4], [25, 28, 30], ["29"], ["HOOKLESS", "HOOKED"], (9.5, 12.0)),
+    DisciplineEnum.MTB_TRAIL: ([58.4, 61.0], [30, 32], ["29", "27.5"], ["HOOKED", "HOOKLESS"], (12.5, 15.0)),
+    DisciplineEnum.MTB_ENDURO: ([61.0, 63.5], [30, 32, 35], ["29", "27.5"], ["HOOKED"], (14.0, 17.0)),
+    DisciplineEnum.MTB_DOWNHILL: ([63.5, 66.0], [30, 35], ["27.5", "29"], ["HOOKED", "TUBES"], (16.0, 19.0)),
+    DisciplineEnum.FATBIKE: ([96.5, 114.3], [65, 80], ["26"], ["TUBES", "HOOKED"], (13.0, 16.0)),
+}
+
+CASINGS = ["THIN", "STANDARD", "REINFORCED", "DOWNHILL_CASING"]
+
+
+def make_payload(rng: random.Random, discipline: DisciplineEnum, surface: SurfaceEnum) -> dict:
+    widths, rims, diameters, rim_types, bike_weight = DISCIPLINE_PRESETS[discipline]
+    width = rng.choice(widths)
+    rim_width = rng.choice(rims)
+    diameter = rng.choice(diameters)
+    rim_type = rng.choice(rim_types)
+    casing = rng.choice(CASINGS)
+
+    def tire(position):
+        return {"width": width, "position": position, "casing": casing, "unit": "MM"}
+
+    def wheel(position):
+        return {"rim_width": rim_width, "rim_type": rim_type, "position": position, "diameter": diameter}
+
+    return {
+        "bike": {
+            "name": f"{discipline.value.lower()} load test",
+            "discipline": discipline.value,
+            "front_tire": tire("FRONT"),
+            "front_wheel": wheel("FRONT"),
+            "rear_tire": tire("REAR"),
+            "rear_wheel": wheel("REAR"),
+            "weight": {"value": round(rng.uniform(*bike_weight), 1), "unit": "kg"},
+        },
+        "rider_weight": {"value": round(rng.uniform(50, 110), 1), "unit": "kg"},
+        "surface": surface.value,
+    }
+
+
+def grid_mix(seed: int, size: int) -> List[bytes]:
+    """Payloads spread evenly over every discipline x surface combination."""
+    rng = random.Random(seed)
+    combos = [(d, s) for d in DisciplineEnum for s in SurfaceEnum]
+    return [
+        json.dumps(make_payload(rng, *combos[i % len(combos)])).encode()
+        for i in range(size)
+    ]
+
+
+def traffic_mix(path: str, seed: int) -> List[bytes]:
+    """Payloads taken from a recorded traffic file (one JSON record per line).
+
+    Lines may be bare request bodies or capture records with a ``payload`` key.
+    """
+    bodies = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            bodies.append(json.dumps(record.get("payload", record)).encode())
+    if not bodies:
+        raise ValueError(f"No payloads found in {path}")
+    random.Random(seed).shuffle(bodies)
+    return bodies
+
+
+# --- Minimal keep-alive HTTP/1.1 client ---
+
+
+class HttpConnection:
+    """One persistent connection; avoids client-library overhead in the numbers."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        """Send a request and return ``(status, body)``; reconnects as needed."""
+        if self.writer is None:
+            await self._connect()
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        if body:
+            head.append("Content-Type: application/json")
+        for name, value in (headers or {}).items():
+            head.append(f"{name}: {value}")
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            self.close()
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        length, chunked, keep_alive = 0, False, True
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value:
+                chunked = True
+            elif name == "connection" and value == "close":
+                keep_alive = False
+
+        if chunked:
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            content = b"".join(parts)
+        else:
+            content = await self.reader.readexactly(length)
+
+        if not keep_alive:
+            self.close()
+        return status, content
+
+
+# --- Load patterns ---
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+
+    def record(self, latency: float, outcome: str):
+        self.latencies.append(latency)
+        self.outcomes[outcome] += 1
+
+
+async def _send(conn: HttpConnection, path: str, body: bytes, headers: Dict[str, str]) -> str:
+    try:
+        status, _ = await conn.request("POST", path, body, headers)
+        return str(status)
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as exc:
+        conn.close()
+        return f"error:{type(exc).__name__}"
+
+
+async def run_closed_loop(host, port, path, bodies, headers, concurrency, deadline, max_requests, recorder):
+    """``concurrency`` clients, each sending its next request as soon as the last completes."""
+    counter = iter(range(max_requests or sys.maxsize))
+
+    async def client():
+        conn = HttpConnection(host, port)
+        try:
+            for i in counter:
+                if time.perf_counter() >= deadline:
+                    break
+                t0 = time.perf_counter()
+                outcome = await _send(conn, path, bodies[i % len(bodies)], headers)
+                recorder.record(time.perf_counter() - t0, outcome)
+        finally:
+            conn.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+
+
+async def run_open_loop(host, port, path, bodies, headers, rate, deadline, max_requests, connections, seed, recorder):
+    """Poisson arrivals at ``rate`` per second, independent of response times.
+
+    Latency is measured from the scheduled arrival time, so time spent
+    waiting for a free connection counts against the server.
+    """
+    rng = random.Random(seed)
+    pool: asyncio.Queue = asyncio.Queue()
+    for _ in range(connections):
+        pool.put_nowait(HttpConnection(host, port))
+
+    async def one(body: bytes, scheduled: float):
+        conn = await pool.get()
+        try:
+            outcome = await _send(conn, path, body, headers)
+        finally:
+            pool.put_nowait(conn)
+        recorder.record(time.perf_counter() - scheduled, outcome)
+
+    tasks = []
+    next_at = time.perf_counter()
+    i = 0
+    while next_at < deadline and (not max_requests or i < max_requests):
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(bodies[i % len(bodies)], next_at)))
+        i += 1
+        next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    while not pool.empty():
+        pool.get_nowait().close()
+
+
+# --- Reporting ---
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float, config: dict) -> dict:
+    latencies = sorted(recorder.latencies)
+    total = len(latencies)
+    ok = sum(n for outcome, n in recorder.outcomes.items() if outcome.startswith("2"))
+    ms = lambda seconds: round(seconds * 1000.0, 3)
+    return {
+        "config": config,
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / total) if total else 0.0,
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if total else 0.0,
+        },
+        "error_rate": round(1.0 - ok / total, 5) if total else 0.0,
+        "outcomes": dict(sorted(recorder.outcomes.items())),
+    }
+
+
+def print_report(report: dict):
+    lat = report["latency_ms"]
+    label = report["config"].get("label") or "run"
+    print(f"== {label} ==")
+    print(f"requests      {report['requests']} in {report['elapsed_s']} s")
+    print(f"throughput    {report['throughput_rps']} req/s")
+    print(
+        f"latency (ms)  mean {lat['mean']}  p50 {lat['p50']}  p95 {lat['p95']}  "
+        f"p99 {lat['p99']}  max {lat['max']}"
+    )
+    print(f"error rate    {report['error_rate'] * 100:.3f}%")
+    for outcome, count in report["outcomes"].items():
+        print(f"  {outcome:<24} {count}")
+
+
+# --- Local instance ---
+
+
+def spawn_server(port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start uvicorn on ``port`` and wait until it answers health checks."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env={**os.environ, **env},
+    )
+
+    async def wait_ready():
+        for _ in range(100):
+            conn = HttpConnection("127.0.0.1", port)
+            try:
+                status, _ = await conn.request("GET", "/")
+                if status == 200:
+                    return
+            except OSError:
+                pass
+            finally:
+                conn.close()
+            await asyncio.sleep(0.1)
+        raise RuntimeError(f"Server on port {port} did not become ready")
+
+    try:
+        asyncio.run(wait_ready())
+    except Exception:
+        process.terminate()
+        raise
+    return process
+
+
+DEFAULTS = {
+    "url": "http://127.0.0.1:8088",
+    "path": "/compute",
+    "concurrency": 16,
+    "rate": None,
+    "connections": 64,
+    "duration": 10.0,
+    "requests": 0,
+    "warmup": 1.0,
+    "seed": 1,
+    "mix_size": 1024,
+    "traffic": None,
+    "header": [],
+    "spawn": False,
+    "workers": 1,
+    "env": [],
+    "label": None,
+    "output": None,
+}
+
+
+def parse_args(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", help="JSON file with option defaults")
+    parser.add_argument("--url", help="base URL of the instance under test")
+    parser.add_argument("--path", help="endpoint to POST to")
+    parser.add_argument("--concurrency", type=int, help="closed-loop client count")
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate (req/s); overrides --concurrency")
+    parser.add_argument("--connections", type=int, help="connection pool size for open-loop mode")
+    parser.add_argument("--duration", type=float, help="measured run length in seconds")
+    parser.add_argument("--requests", type=int, help="stop after this many requests (0 = no limit)")
+    parser.add_argument("--warmup", type=float, help="unmeasured warm-up in seconds")
+    parser.add_argument("--seed", type=int, help="seed for payload mix and arrivals")
+    parser.add_argument("--mix-size", dest="mix_size", type=int, help="distinct generated payloads")
+    parser.add_argument("--traffic", help="recorded traffic JSONL to use instead of generated payloads")
+    parser.add_argument("--header", action="append", help="extra request header, NAME:VALUE")
+    parser.add_argument("--spawn", action="store_true", default=None, help="start a local uvicorn instance")
+    parser.add_argument("--workers", type=int, help="uvicorn workers when spawning")
+    parser.add_argument("--env", action="append", help="environment for the spawned server, KEY=VALUE")
+    parser.add_argument("--label", help="name shown in the report")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = vars(parser.parse_args(argv))
+
+    options = dict(DEFAULTS)
+    scenario = args.pop("scenario")
+    if scenario:
+        with open(scenario, encoding="utf-8") as fh:
+            options.update(json.load(fh))
+    options.update({key: value for key, value in args.items() if value is not None})
+    return options
+
+
+def main(argv=None) -> int:
+    options = parse_args(argv)
+    url = urlsplit(options["url"])
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    headers = dict(h.split(":", 1) for h in options["header"])
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+    if options["traffic"]:
+        bodies = traffic_mix(options["traffic"], options["seed"])
+    else:
+        bodies = grid_mix(options["seed"], options["mix_size"])
+
+    server = None
+    if options["spawn"]:
+        env = dict(item.split("=", 1) for item in options["env"])
+        server = spawn_server(port, options["workers"], env)
+
+    async def run(seconds: float, recorder: Recorder, max_requests: int = 0):
+        deadline = time.perf_counter() + seconds
+        if options["rate"]:
+            await run_open_loop(
+                host, port, options["path"], bodies, headers, options["rate"], deadline,
+                max_requests, options["connections"], options["seed"], recorder,
+            )
+        else:
+            await run_closed_loop(
+                host, port, options["path"], bodies, headers, options["concurrency"],
+                deadline, max_requests, recorder,
+            )
+
+    try:
+        if options["warmup"] > 0:
+            asyncio.run(run(options["warmup"], Recorder()))
+        recorder = Recorder()
+        started = time.perf_counter()
+        asyncio.run(run(options["duration"], recorder, options["requests"]))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = summarize(recorder, elapsed, {k: v for k, v in options.items() if k != "output"})
+    print_report(report)
+    if options["output"]:
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 0 if report["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Check a spawned backend's memory against a budget, idle and under load.
+
+Starts uvicorn with the given environment, measures the RSS of the whole
+process tree once warm-up has settled, then again (peak) while load runs,
+and fails when either exceeds the budget.
+
+Examples:
+    python -m tools.membench --budget-mb 150
+    python -m tools.membench --budget-mb 120 --env LOW_MEMORY=true --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from typing import List
+
+from app.core.memory import rss_bytes
+from tools.loadgen import Recorder, grid_mix, run_closed_loop, spawn_server
+
+MB = 1024 * 1024
+
+
+def process_tree(pid: int) -> List[int]:
+    """``pid`` and all of its descendants (Linux ``/proc``)."""
+    pids = [pid]
+    for parent in pids:
+        try:
+            with open(f"/proc/{parent}/task/{parent}/children", encoding="ascii") as fh:
+                pids.extend(int(child) for child in fh.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def tree_rss(pid: int) -> int:
+    return sum(rss_bytes(p) for p in process_tree(pid))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _load_with_sampling(pid, port, bodies, concurrency, duration, recorder) -> int:
+    peak = 0
+    done = asyncio.Event()
+
+    async def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, tree_rss(pid))
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.create_task(sample())
+    deadline = time.perf_counter() + duration
+    try:
+        await run_closed_loop(
+            "127.0.0.1", port, "/compute", bodies, {}, concurrency, deadline, 0, recorder
+        )
+    finally:
+        done.set()
+        await sampler
+    return max(peak, tree_rss(pid))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-mb", type=float, required=True, help="maximum RSS of the server, in MiB")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], help="server environment, KEY=VALUE")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to wait before the idle reading")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix-size", type=int, default=20000, help="distinct payloads (fills the caches)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    env = dict(item.split("=", 1) for item in args.env)
+    bodies = grid_mix(args.seed, args.mix_size)
+    server = spawn_server(port, args.workers, env)
+    recorder = Recorder()
+    try:
+        time.sleep(args.settle)
+        idle = tree_rss(server.pid)
+        peak = asyncio.run(
+            _load_with_sampling(server.pid, port, bodies, args.concurrency, args.duration, recorder)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "env": env,
+        "workers": args.workers,
+        "budget_mb": args.budget_mb,
+        "idle_mb": round(idle / MB, 1),
+        "peak_mb": round(peak / MB, 1),
+        "requests": len(recorder.latencies),
+        "outcomes": dict(recorder.outcomes),
+    }
+    print(json.dumps(report, indent=2))
+    within = report["peak_mb"] <= args.budget_mb and report["idle_mb"] <= args.budget_mb
+    if not within:
+        print(f"Memory budget of {args.budget_mb} MiB exceeded", file=sys.stderr)
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Write golden test vectors for client-side implementations of the formula.
+
+Each vector is a ``/compute`` request body with the server's response. A client that computes from ``GET /model`` must match the
+rounded results to within 0.1 PSI. The file records the coefficients
+version it was generated for; regenerate it whenever that changes:
+
+    python -m tools.model_vectors tests/golden/model_vectors.json
+"""
+
+import argparse
+import json
+import sys
+from typing import List
+
+from app.presets import POPULAR_PRESETS
+from app.schemas import DisciplineEnum, RimTypeEnum, SurfaceEnum, TirePressureRequest
+from app.services import PressureCalculator, build_and_compute, coefficients_version
+
+
+def _payload(bike: dict, surface: str, rider_kg: float, rider_unit: str = "kg") -> dict:
+    return {"bike": bike, "surface": surface, "rider_weight": {"value": rider_kg, "unit": rider_unit}}
+
+
+def _with_tire(bike: dict, width: float, unit: str = "MM") -> dict:
+    bike = json.loads(json.dumps(bike))
+    for position in ("front", "rear"):
+        bike[f"{position}_tire"].update(width=width, unit=unit)
+    return bike
+
+
+def vector_payloads() -> List[dict]:
+    road, gravel, xc = POPULAR_PRESETS[1], POPULAR_PRESETS[7], POPULAR_PRESETS[10]
+    payloads = []
+
+    # Every preset on every surface
+    for preset in POPULAR_PRESETS:
+        for surface in SurfaceEnum:
+            for rider_kg in (55, 85):
+                payloads.append(_payload(preset, surface.value, rider_kg))
+
+    # Both sides of every rim width range edge, the 113-114 gap and outside the table
+    widths = {17.9, 113.5, 140.0}
+    for entry in PressureCalculator.RIM_WIDTH_TABLE:
+        widths.update({entry["min"], entry["max"] - 0.01, entry["max"]})
+    for width in sorted(widths):
+        payloads.append(_payload(_with_tire(gravel, width), "DRY", 72))
+    for width in (1.9, 2.25, 2.6, 3.0, 4.8):
+        payloads.append(_payload(_with_tire(xc, width, "IN"), "MIXED", 72))
+
+    # Every discipline with every rim type (cyclocross has its own rim factors)
+    for discipline in DisciplineEnum:
+        for rim_type in RimTypeEnum:
+            bike = json.loads(json.dumps(road))
+            bike["discipline"] = discipline.value
+            for position in ("front", "rear"):
+                bike[f"{position}_wheel"]["rim_type"] = rim_type.value
+            payloads.append(_payload(bike, "WET", 68.5))
+
+    # Weights are used as given, whatever their unit
+    payloads.append(_payload(road, "DRY", 150, "lbs"))
+    return payloads
+
+
+def generate() -> dict:
+    vectors = []
+    for payload in vector_payloads():
+        request = TirePressureRequest.model_validate(payload)
+        result = build_and_compute(request.bike, request.surface, request.rider_weight)
+        vectors.append({"request": payload, "expected": result.model_dump(mode="json")})
+    return {"version": coefficients_version(), "tolerance_psi": 0.1, "vectors": vectors}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="path of the JSON file to write")
+    args = parser.parse_args(argv)
+
+    document = generate()
+    # One vector per line keeps the file compact and its diffs readable
+    lines = [json.dumps(vector, separators=(",", ":")) for vector in document["vectors"]]
+    with open(args.output, "w", encoding="utf-8") as fh:
+        fh.write(f'{{"version":"{document["version"]}","tolerance_psi":{document["tolerance_psi"]},"vectors":[\n')
+        fh.write(",\n".join(lines))
+        fh.write("\n]}\n")
+    print(f"Wrote {len(document['vectors'])} vectors for version {document['version']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Replay captured /compute traffic against the app.
+
+Reads a capture file written with ``CAPTURE_SAMPLE_RATE`` enabled (plus its
+rotated backups, oldest first) and sends every payload again, either
+in-process through the ASGI app or over HTTP to a running instance.
+
+Examples:
+    python -m tools.replay traffic.jsonl --in-process
+    python -m tools.replay traffic.jsonl --url http://127.0.0.1:8088 --speed 10
+    python -m tools.replay traffic.jsonl --speed 0 --concurrency 32
+
+``--speed 1`` keeps the original gaps between requests, ``--speed 10`` plays
+ten times faster and ``--speed 0`` sends as fast as possible.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+from tools.loadgen import HttpConnection, Recorder, print_report, summarize
+
+
+def load_capture(path: str) -> List[Tuple[float, str, bytes]]:
+    """Return ``(timestamp, endpoint, body)`` for every record, oldest first."""
+    backups = sorted(
+        (p for p in glob.glob(f"{path}.*") if p.rsplit(".", 1)[-1].isdigit()),
+        key=lambda p: int(p.rsplit(".", 1)[-1]),
+        reverse=True,
+    )
+    records = []
+    for file_path in backups + ([path] if os.path.exists(path) else []):
+        with open(file_path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                records.append(
+                    (
+                        record.get("ts", 0.0),
+                        record.get("endpoint", "/compute"),
+                        json.dumps(record["payload"]).encode(),
+                    )
+                )
+    records.sort(key=lambda r: r[0])
+    return records
+
+
+class InProcessClient:
+    """Call the ASGI app directly, without a server or network stack."""
+
+    def __init__(self):
+        from app.main import app
+
+        self.app = app
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers=None):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+            + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+            "client": ("127.0.0.1", 0),
+            "server": ("replay", 80),
+        }
+        sent = False
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    def close(self):
+        pass
+
+
+async def replay(records, make_client, speed: float, concurrency: int, recorder: Recorder):
+    semaphore = asyncio.Semaphore(concurrency)
+    clients = [make_client() for _ in range(concurrency)]
+    free = list(clients)
+
+    async def one(endpoint: str, body: bytes):
+        async with semaphore:
+            client = free.pop()
+            t0 = time.perf_counter()
+            try:
+                status, _ = await client.request("POST", endpoint, body)
+                outcome = str(status)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as exc:
+                client.close()
+                outcome = f"error:{type(exc).__name__}"
+            finally:
+                free.append(client)
+            recorder.record(time.perf_counter() - t0, outcome)
+
+    tasks = []
+    start_wall = time.perf_counter()
+    first_ts = records[0][0] if records else 0.0
+    for ts, endpoint, body in records:
+        if speed > 0:
+            delay = (ts - first_ts) / speed - (time.perf_counter() - start_wall)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(endpoint, body)))
+    await asyncio.gather(*tasks)
+    for client in clients:
+        client.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="capture file (rotated backups are included)")
+    parser.add_argument("--url", default="http://127.0.0.1:8088", help="base URL for HTTP replay")
+    parser.add_argument("--in-process", action="store_true", help="call the ASGI app directly")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale; 0 sends as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=16, help="maximum requests in flight")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    records = load_capture(args.capture)
+    if not records:
+        print(f"No records found in {args.capture}", file=sys.stderr)
+        return 1
+
+    if args.in_process:
+        app_client = InProcessClient()
+        make_client = lambda: app_client
+    else:
+        url = urlsplit(args.url)
+        make_client = lambda: HttpConnection(url.hostname or "127.0.0.1", url.port or 80)
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    asyncio.run(replay(records, make_client, args.speed, args.concurrency, recorder))
+    elapsed = time.perf_counter() - started
+
+    config = {
+        "label": f"replay {os.path.basename(args.capture)}",
+        "target": "in-process" if args.in_process else args.url,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+    }
+    report = summarize(recorder, elapsed, config)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
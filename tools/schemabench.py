@@ -0,0 +1,104 @@
+"""Per-request cost of /compute (nested v1) against /v2/compute (flat).
+
+Times each stage the endpoints run, in process and without HTTP: parsing
+and validating the JSON body, computing, and encoding the response. The
+same configurations are used for both versions.
+
+Examples:
+    python -m tools.schemabench
+    python -m tools.schemabench --requests 50000 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from app import services
+from app.schemas import TirePressureRequest, TirePressureRequestV2
+from tools.loadgen import grid_mix
+
+
+def flat_payload(payload: dict) -> dict:
+    """The ``/v2/compute`` body equivalent to a ``/compute`` body."""
+    bike = payload["bike"]
+    flat = {
+        "discipline": bike["discipline"],
+        "surface": payload["surface"],
+        # /compute uses weight values as given
+        "rider_weight_kg": payload["rider_weight"]["value"],
+        "bike_weight_kg": bike["weight"]["value"],
+    }
+    for position in ("front", "rear"):
+        tire, wheel = bike[f"{position}_tire"], bike[f"{position}_wheel"]
+        width = tire["width"] * 25.4 if tire["unit"] == "IN" else tire["width"]
+        flat.update(
+            {
+                f"{position}_tire_width": width,
+                f"{position}_casing": tire["casing"],
+                f"{position}_rim_width": wheel["rim_width"],
+                f"{position}_rim_type": wheel["rim_type"],
+                f"{position}_diameter": wheel["diameter"],
+            }
+        )
+    return flat
+
+
+def _v1(body: bytes):
+    request = TirePressureRequest.model_validate_json(body)
+    return request, lambda: services.build_and_compute(request.bike, request.surface, request.rider_weight)
+
+
+def _v2(body: bytes):
+    request = TirePressureRequestV2.model_validate_json(body)
+    return request, lambda: services.cached_compute_flat(request, None)
+
+
+def _stages(parse, bodies, repeat: int) -> dict:
+    """Best-of-``repeat`` microseconds per request for each stage."""
+    best = {"parse": float("inf"), "compute": float("inf"), "encode": float("inf")}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = [parse(body) for body in bodies]
+        parsed_at = time.perf_counter()
+        results = [compute() for _, compute in parsed]
+        computed_at = time.perf_counter()
+        for result in results:
+            result.model_dump_json()
+        encoded_at = time.perf_counter()
+        for stage, seconds in (
+            ("parse", parsed_at - started),
+            ("compute", computed_at - parsed_at),
+            ("encode", encoded_at - computed_at),
+        ):
+            best[stage] = min(best[stage], seconds * 1e6 / len(bodies))
+    report = {stage: round(us, 2) for stage, us in best.items()}
+    report["total"] = round(sum(best.values()), 2)
+    report["request_bytes"] = round(sum(len(body) for body in bodies) / len(bodies))
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per version; the best is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    bodies = grid_mix(args.seed, args.requests)
+    flat_bodies = [json.dumps(flat_payload(json.loads(body))).encode() for body in bodies]
+    # The geometry cache is warm for both versions
+    for body in bodies:
+        _v1(body)[1]()
+    report = {
+        "requests": args.requests,
+        "v1": _stages(_v1, bodies, args.repeat),
+        "v2": _stages(_v2, flat_bodies, args.repeat),
+    }
+    report["speedup"] = round(report["v1"]["total"] / report["v2"]["total"], 2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Throughput of the calculation core against thread count.
+
+Runs the work ``/compute`` hands to the threadpool (validation included
+with ``--parse``) on 1..N threads and reports calls per second and the
+speedup over one thread. Under the GIL the speedup stays near 1; on a
+free-threaded build it should grow with the number of cores.
+
+Examples:
+    python -m tools.threadbench --threads 1,2,4,8
+    python3.13t -X gil=0 -m tools.threadbench --threads 1,2,4,8 --cache sharded
+    python3.13t -X gil=1 -m tools.threadbench --threads 1,2,4,8 --cache sharded
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import services
+from app.core.cache import LRUCache, ShardedLRUCache
+from app.core.runtime import default_cache_shards, gil_enabled
+from app.schemas import TirePressureRequest
+from tools.loadgen import grid_mix
+
+
+def _cache(kind: str, size: int):
+    if kind == "memory":
+        return LRUCache(size)
+    if kind == "sharded":
+        return ShardedLRUCache(size, max(default_cache_shards(), os.cpu_count() or 1))
+    return None
+
+
+def run(threads: int, bodies, calls: int, cache, parse: bool) -> float:
+    """Seconds for ``threads`` threads to make ``calls`` calls between them."""
+    requests = [TirePressureRequest.model_validate_json(body) for body in bodies]
+    share = calls // threads
+    start = threading.Barrier(threads + 1)
+
+    def worker(offset: int):
+        start.wait()
+        for i in range(offset, offset + share):
+            index = i % len(bodies)
+            if parse:
+                payload = TirePressureRequest.model_validate_json(bodies[index])
+            else:
+                payload = requests[index]
+            services.cached_compute(payload.bike, payload.surface, payload.rider_weight, cache)
+
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [pool.submit(worker, n * share) for n in range(threads)]
+        start.wait()
+        started = time.perf_counter()
+        for future in futures:
+            future.result()
+        return time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", default="1,2,4,8", help="comma-separated thread counts")
+    parser.add_argument("--calls", type=int, default=50000, help="calls per thread count")
+    parser.add_argument("--mix-size", type=int, default=2000, help="distinct payloads")
+    parser.add_argument("--cache", choices=("none", "memory", "sharded"), default="none")
+    parser.add_argument("--parse", action="store_true", help="validate the JSON body on every call")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    bodies = grid_mix(args.seed, args.mix_size)
+    report = {
+        "python": sys.version.split()[0],
+        "gil_enabled": gil_enabled(),
+        "cpus": os.cpu_count(),
+        "cache": args.cache,
+        "parse": args.parse,
+        "results": [],
+    }
+    baseline = None
+    for threads in (int(value) for value in args.threads.split(",")):
+        # A fresh cache per run, so every thread count starts cold
+        seconds = run(threads, bodies, args.calls, _cache(args.cache, args.mix_size), args.parse)
+        throughput = (args.calls // threads) * threads / seconds
+        baseline = baseline or throughput
+        report["results"].append(
+            {
+                "threads": threads,
+                "seconds": round(seconds, 4),
+                "calls_per_s": round(throughput),
+                "speedup": round(throughput / baseline, 2),
+            }
+        )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())